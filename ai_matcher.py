@@ -1,37 +1,73 @@
-import re
-from nltk.corpus import stopwords
-from stop_words import get_stop_words
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-
-# Настройка стоп-слов для всех поддерживаемых языков
-STOPWORDS = set()
-# 1. Английский (из NLTK)
-STOPWORDS.update(stopwords.words('english'))
-# 2. Польский (из stop-words)
-STOPWORDS.update(get_stop_words('polish'))
-# 3. Украинский (поскольку встроенных нет, можно добавить слова-заглушки или использовать внешний список)
-# Для простоты, пока используем только то, что есть.
-# Если матчинг по UA будет плохой, добавим внешний список вручную.
+import math
+import time
+import heapq
+from collections import Counter, namedtuple
+import numpy as np
+from scipy import sparse
+from idf_model import CorpusIdfModel
+from exclusion_matcher import ExclusionAutomaton
+from dedup import NearDuplicateFilter
+from text_normalizer import STOPWORDS, TOKEN_PATTERN, normalize, normalize_tokens, normalize_many
+
+
+# Режимы пакетного скоринга:
+#   'legacy' - те же баллы, что и calculate_relevance (IDF по паре "профиль + вакансия")
+#   'batch'  - IDF считается по всему пакету (профиль + все вакансии поиска)
+#   'corpus' - IDF из предварительно рассчитанной модели корпуса (см. idf_model.py)
+SCORING_MODES = ('legacy', 'batch', 'corpus')
+DEFAULT_SCORING_MODE = 'legacy'
+
+# Модель IDF корпуса, загружается один раз при старте приложения (load_idf_model)
+IDF_MODEL = None
+
+# Штраф (в процентах) за каждый найденный исключаемый навык
+EXCLUSION_PENALTY = 10
+
+# Вакансии с баллом ниже порога не показываются
+MIN_RELEVANCE_SCORE = 1
+
+# Подготовленный профиль пользователя: очищенный текст навыков и его токены
+ProfileVector = namedtuple('ProfileVector', ['skills_count', 'text', 'tokens'])
+
+# IDF в двухдокументном корпусе (smooth_idf=True): ln((1 + 2) / (1 + df)) + 1
+# df=2 (слово есть в обоих документах) -> 1.0, df=1 -> ln(3/2) + 1
+_PAIR_IDF_SINGLE = math.log(3 / 2) + 1
+
 
 def preprocess_text(text):
-    """Очистка текста: нижний регистр, удаление пунктуации и стоп-слов."""
-    if not text:
-        return ""
-    # Разрешаем все буквенные символы Unicode (\w) и пробелы, приводим к нижнему регистру
-    text = re.sub(r'[^\w\s]', '', text).lower()
-    words = text.split()
-    # Удаление стоп-слов
-    return ' '.join([word for word in words if word not in STOPWORDS])
+    """Очистка текста: нижний регистр, удаление пунктуации и стоп-слов (с кэшем, см. text_normalizer.py)."""
+    return normalize(text)
+
+def load_idf_model(path):
+    """
+    Загружает модель IDF корпуса (только для чтения, через mmap).
+    После загрузки ai_match_jobs по умолчанию работает в режиме 'corpus'.
+    """
+    global IDF_MODEL
+    IDF_MODEL = CorpusIdfModel.load(path)
+    return IDF_MODEL
+
+def tokenize(preprocessed_text):
+    """Разбивает уже очищенный текст на токены так же, как это делает TfidfVectorizer."""
+    return TOKEN_PATTERN.findall(preprocessed_text)
+
+def build_profile_vector(full_user_skills):
+    """Готовит навыки пользователя к скорингу (результат можно кэшировать, см. profile_cache.py)."""
+    user_skills_text, user_tokens = normalize_tokens(" ".join(full_user_skills))
+    return ProfileVector(len(full_user_skills), user_skills_text, user_tokens)
 
 def calculate_relevance(user_skills_text, job_description_text):
     """
     Вычисляет косинусное сходство между навыками пользователя и текстом вакансии.
+    Эталонная (медленная) реализация для одной пары; в ai_match_jobs используется score_jobs.
     """
     if not job_description_text:
         return 0.0
 
+    # sklearn нужен только эталонной реализации, его импорт - самая долгая часть загрузки матчера
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     # 1. Объединение документов для векторизации
     documents = [user_skills_text, job_description_text]
 
@@ -46,45 +82,375 @@ def calculate_relevance(user_skills_text, job_description_text):
     # Возвращаем процент (первый элемент массива, округленный до 2 знаков)
     return round(cosine_scores[0][0] * 100, 2)
 
-def ai_match_jobs(raw_jobs, full_user_skills, excluded_skills, logger):
+def _count_matrix(token_lists, vocabulary, unknown_terms=None):
     """
-    Основная функция матчинга: добавляет 'relevance_score' к каждой вакансии.
+    Строит разреженную матрицу частот (CSR) для списка токенизированных документов.
+    Словарь vocabulary (термин -> индекс столбца) дополняется новыми терминами на месте.
+    Если передан unknown_terms, vocabulary не меняется (словарь модели корпуса),
+    а неизвестные термины получают индексы после него в unknown_terms.
     """
+    indptr = [0]
+    indices = []
+    data = []
+    for tokens in token_lists:
+        for term, count in Counter(tokens).items():
+            if unknown_terms is None:
+                index = vocabulary.setdefault(term, len(vocabulary))
+            else:
+                index = vocabulary.get(term)
+                if index is None:
+                    index = unknown_terms.setdefault(term, len(vocabulary) + len(unknown_terms))
+            indices.append(index)
+            data.append(count)
+        indptr.append(len(indices))
+
+    return indptr, indices, data
+
+def _to_csr(matrix_parts, n_features):
+    indptr, indices, data = matrix_parts
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+        shape=(len(indptr) - 1, n_features)
+    )
+
+def _legacy_scores(user_counts, job_counts):
+    """
+    Воспроизводит calculate_relevance для всех вакансий сразу.
+
+    В паре "профиль + вакансия" общий термин получает idf=1, а термин из одного документа - idf=c.
+    Поэтому скалярное произведение считается только по общим терминам, а нормы векторов
+    выражаются через суммы квадратов частот - всё это несколько разреженных произведений.
+    """
+    c2 = _PAIR_IDF_SINGLE ** 2
+
+    user_present = (user_counts > 0).astype(np.float64)
+    job_present = (job_counts > 0).astype(np.float64)
+    user_sq = user_counts.multiply(user_counts)
+    job_sq = job_counts.multiply(job_counts)
+
+    dot = np.asarray((job_counts @ user_counts.T).todense()).ravel()
+    user_shared_sq = np.asarray((job_present @ user_sq.T).todense()).ravel()
+    job_shared_sq = np.asarray((job_sq @ user_present.T).todense()).ravel()
+    job_total_sq = np.asarray(job_sq.sum(axis=1)).ravel()
+    user_total_sq = user_sq.sum()
+
+    user_norm_sq = c2 * user_total_sq - (c2 - 1) * user_shared_sq
+    job_norm_sq = c2 * job_total_sq - (c2 - 1) * job_shared_sq
+    denominator = np.sqrt(user_norm_sq * job_norm_sq)
+
+    scores = np.zeros(job_counts.shape[0])
+    nonzero = denominator > 0
+    scores[nonzero] = dot[nonzero] / denominator[nonzero]
+    return scores
+
+def _batch_scores(user_counts, job_counts):
+    """Косинусное сходство с IDF, рассчитанным по всему пакету (профиль + все вакансии)."""
+    n_documents = job_counts.shape[0] + 1
+    document_frequency = np.asarray((job_counts > 0).sum(axis=0)).ravel() + (user_counts > 0).toarray().ravel()
+    idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+    return _weighted_scores(user_counts, job_counts, idf)
+
+def _weighted_scores(user_counts, job_counts, idf):
+    """Косинусное сходство TF-IDF векторов с заданным вектором IDF."""
+    idf_diag = sparse.diags(idf)
+
+    user_weights = _l2_normalize(user_counts @ idf_diag)
+    job_weights = _l2_normalize(job_counts @ idf_diag)
+
+    # Одно разреженное произведение "матрица вакансий x вектор профиля"
+    return np.asarray((job_weights @ user_weights.T).todense()).ravel()
+
+def _l2_normalize(matrix):
+    matrix = sparse.csr_matrix(matrix)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+def resolve_scoring_mode(mode=None):
+    """Режим по умолчанию: 'corpus', если модель IDF загружена, иначе DEFAULT_SCORING_MODE."""
+    if mode is None:
+        mode = 'corpus' if IDF_MODEL is not None else DEFAULT_SCORING_MODE
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {mode}")
+    if mode == 'corpus' and IDF_MODEL is None:
+        raise ValueError("Scoring mode 'corpus' requires a loaded IDF model")
+    return mode
+
+def score_jobs(user_tokens, job_token_lists, mode=None):
+    """
+    Пакетный скоринг: один словарь и одна разреженная матрица на профиль и все вакансии.
+
+    Возвращает (scores, timings): массив баллов в процентах (округленных до 2 знаков)
+    и время этапов в миллисекундах.
+    """
+    mode = resolve_scoring_mode(mode)
+
+    timings = {}
+    started = time.perf_counter()
+
+    if mode == 'corpus':
+        # Словарь модели не меняется; незнакомые термины получают максимальный IDF
+        model = IDF_MODEL
+        vocabulary = model.vocabulary
+        unknown_terms = {}
+        user_parts = _count_matrix([user_tokens], vocabulary, unknown_terms)
+        job_parts = _count_matrix(job_token_lists, vocabulary, unknown_terms)
+        n_features = len(vocabulary) + len(unknown_terms)
+    else:
+        vocabulary = {}
+        user_parts = _count_matrix([user_tokens], vocabulary)
+        job_parts = _count_matrix(job_token_lists, vocabulary)
+        n_features = len(vocabulary)
+    user_counts = _to_csr(user_parts, n_features)
+    job_counts = _to_csr(job_parts, n_features)
+    vectorized = time.perf_counter()
+    timings['vectorize_ms'] = round((vectorized - started) * 1000, 3)
+
+    if not job_token_lists or not n_features:
+        scores = np.zeros(len(job_token_lists))
+    elif mode == 'legacy':
+        scores = _legacy_scores(user_counts, job_counts)
+    elif mode == 'batch':
+        scores = _batch_scores(user_counts, job_counts)
+    else:
+        idf = np.concatenate([model.idf, np.full(len(unknown_terms), model.oov_idf)])
+        scores = _weighted_scores(user_counts, job_counts, idf)
+
+    scores = np.round(scores * 100, 2)
+    timings['score_ms'] = round((time.perf_counter() - vectorized) * 1000, 3)
+    return scores, timings
+
+def build_profile_counts(profile_token_lists):
+    """
+    Матрица частот терминов для многих профилей сразу (строка - профиль) и ее словарь.
+    Используется для обратного матчинга новых вакансий по всем профилям (см. percolator.py).
+    """
+    vocabulary = {}
+    return _to_csr(_count_matrix(profile_token_lists, vocabulary), len(vocabulary)), vocabulary
+
+def _legacy_score_matrix(profile_counts, job_counts):
+    """
+    _legacy_scores для всех пар (вакансия, профиль): разреженная матрица вакансии x профили.
+    Балл ненулевой только при общих терминах, поэтому все произведения имеют одну структуру
+    и формула считается поэлементно по их данным.
+    """
+    c2 = _PAIR_IDF_SINGLE ** 2
+    profile_present = (profile_counts > 0).astype(np.float64)
+    job_present = (job_counts > 0).astype(np.float64)
+    profile_sq = profile_counts.multiply(profile_counts).tocsr()
+    job_sq = job_counts.multiply(job_counts).tocsr()
+
+    def product(left, right):
+        matrix = sparse.csr_matrix(left @ right.T)
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        return matrix
+
+    dot = product(job_counts, profile_counts)
+    profile_shared_sq = product(job_present, profile_sq)
+    job_shared_sq = product(job_sq, profile_present)
+    if not (np.array_equal(dot.indptr, profile_shared_sq.indptr) and np.array_equal(dot.indices, profile_shared_sq.indices)
+            and np.array_equal(dot.indptr, job_shared_sq.indptr) and np.array_equal(dot.indices, job_shared_sq.indices)):
+        raise ValueError("Unexpected sparsity structure in legacy score matrix")
+
+    rows = np.repeat(np.arange(dot.shape[0]), np.diff(dot.indptr))
+    job_total_sq = np.asarray(job_sq.sum(axis=1)).ravel()[rows]
+    profile_total_sq = np.asarray(profile_sq.sum(axis=1)).ravel()[dot.indices]
+
+    profile_norm_sq = c2 * profile_total_sq - (c2 - 1) * profile_shared_sq.data
+    job_norm_sq = c2 * job_total_sq - (c2 - 1) * job_shared_sq.data
+    denominator = np.sqrt(profile_norm_sq * job_norm_sq)
+
+    scores = dot.copy()
+    scores.data = np.divide(dot.data, denominator, out=np.zeros_like(dot.data), where=denominator > 0)
+    return scores
+
+def score_profiles(profile_counts, vocabulary, job_token_lists, mode=None):
+    """
+    Баллы всех вакансий пакета для всех профилей одним разреженным произведением:
+    матрица (вакансии x профили) в процентах, округленных до 2 знаков, как в score_jobs.
+    profile_counts и vocabulary - результат build_profile_counts.
+    """
+    mode = resolve_scoring_mode(mode)
+    unknown_terms = {}
+    job_parts = _count_matrix(job_token_lists, vocabulary, unknown_terms)
+    n_features = len(vocabulary) + len(unknown_terms)
+    job_counts = _to_csr(job_parts, n_features)
+    profile_counts = sparse.csr_matrix(
+        (profile_counts.data, profile_counts.indices, profile_counts.indptr), shape=(profile_counts.shape[0], n_features)
+    )
+
+    if not job_token_lists or not n_features or not profile_counts.shape[0]:
+        return sparse.csr_matrix((len(job_token_lists), profile_counts.shape[0]))
+
+    if mode == 'legacy':
+        scores = _legacy_score_matrix(profile_counts, job_counts)
+    else:
+        if mode == 'batch':
+            n_documents = job_counts.shape[0] + 1
+            document_frequency = np.asarray((job_counts > 0).sum(axis=0)).ravel() + 1
+            idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+        else:
+            terms = list(vocabulary) + list(unknown_terms)
+            model = IDF_MODEL
+            idf = np.array([
+                model.idf[model.vocabulary[term]] if term in model.vocabulary else model.oov_idf for term in terms
+            ], dtype=np.float64)
+        idf_diag = sparse.diags(idf)
+        scores = sparse.csr_matrix(_l2_normalize(job_counts @ idf_diag) @ _l2_normalize(profile_counts @ idf_diag).T)
+
+    scores.data = np.round(scores.data * 100, 2)
+    scores.eliminate_zeros()
+    return scores
+
+def _relevance_key(job):
+    return job['relevance_score']
+
+def top_k_page(matched_jobs, limit, offset=0):
+    """
+    Страница [offset, offset + limit) по убыванию релевантности без сортировки всего списка:
+    heapq.nlargest держит кучу размера offset + limit. Порядок при равных баллах - как у sort().
+    """
+    if limit is None:
+        return sorted(matched_jobs, key=_relevance_key, reverse=True)[offset:]
+    return heapq.nlargest(offset + limit, matched_jobs, key=_relevance_key)[offset:]
+
+def ai_match_jobs(raw_jobs, full_user_skills, excluded_skills, logger, mode=None, user_vector=None, exclusions=None):
+    """
+    Основная функция матчинга: добавляет 'relevance_score' и 'excluded_matches' к каждой вакансии.
+    Если передан user_vector (ProfileVector из кэша), full_user_skills не используется;
+    если передан exclusions (скомпилированный ExclusionAutomaton), не используется excluded_skills.
+    Возвращает все подходящие вакансии, отсортированные по убыванию релевантности.
+    """
+    final_results = _match_jobs(raw_jobs, full_user_skills, excluded_skills, logger, mode, user_vector, exclusions)
+
+    # 6. Сортировка по убыванию релевантности
+    final_results.sort(key=_relevance_key, reverse=True)
+    return final_results
+
+def ai_match_jobs_page(raw_jobs, full_user_skills, excluded_skills, logger, limit, offset=0,
+                       mode=None, user_vector=None, exclusions=None):
+    """
+    Как ai_match_jobs, но возвращает только одну страницу результатов (top-K по куче)
+    и общее число подходящих вакансий: (page, total).
+    """
+    matched_jobs = _match_jobs(raw_jobs, full_user_skills, excluded_skills, logger, mode, user_vector, exclusions)
+    return top_k_page(matched_jobs, limit, offset), len(matched_jobs)
+
+class JobMatchSession:
+    """
+    Потоковый матчинг: вакансии добавляются пачками по мере прихода страниц от ресурсов,
+    каждая пачка сразу проходит скоринг. Баллы в режимах 'legacy' и 'corpus' не зависят
+    от состава пачки (в режиме 'batch' IDF считается по каждой пачке отдельно).
+    """
+
+    def __init__(self, user_vector, exclusions, logger, mode=None, strong_score=None, deduplicate=False):
+        self.user_vector = user_vector
+        self.exclusions = exclusions
+        self.logger = logger
+        self.mode = resolve_scoring_mode(mode)
+        # Порог "сильного" совпадения для досрочной остановки поиска
+        self.strong_score = strong_score
+        self.matched_jobs = []
+        self.strong_matches = 0
+        self.jobs_seen = 0
+        # Почти одинаковые вакансии с разных ресурсов и страниц отсеиваются до скоринга
+        self.duplicate_filter = NearDuplicateFilter() if deduplicate else None
+
+    def add(self, raw_jobs):
+        """Скоринг новой пачки вакансий; возвращает вакансии пачки, прошедшие порог."""
+        if not raw_jobs:
+            return []
+        self.jobs_seen += len(raw_jobs)
+        normalized_jobs = normalize_job_texts(raw_jobs)
+        if self.duplicate_filter is not None:
+            # Подписи копий - по тем же токенам, что пойдут в скоринг
+            unique = self.duplicate_filter.unique_indexes(raw_jobs, [tokens for _, tokens in normalized_jobs])
+            if not unique:
+                return []
+            raw_jobs = [raw_jobs[position] for position in unique]
+            normalized_jobs = [normalized_jobs[position] for position in unique]
+        matched = _match_jobs(
+            raw_jobs, None, None, self.logger, self.mode, self.user_vector, self.exclusions, normalized_jobs
+        )
+        self.matched_jobs.extend(matched)
+        if self.strong_score is not None:
+            self.strong_matches += sum(1 for job in matched if job['relevance_score'] >= self.strong_score)
+        return matched
+
+    @property
+    def total(self):
+        return len(self.matched_jobs)
+
+    @property
+    def duplicates(self):
+        return self.duplicate_filter.duplicates if self.duplicate_filter is not None else 0
+
+    def page(self, limit, offset=0):
+        return top_k_page(self.matched_jobs, limit, offset)
+
+def normalize_job_texts(raw_jobs):
+    """(нормализованный текст, токены) для title + description каждой вакансии пакета."""
+    return normalize_many([
+        (job.get('title') or '') + ' ' + (job.get('description') or '')
+        for job in raw_jobs
+    ])
+
+
+def _match_jobs(raw_jobs, full_user_skills, excluded_skills, logger, mode, user_vector, exclusions, normalized_jobs=None):
+    """
+    Скоринг и фильтрация без сортировки: список вакансий с баллом не ниже порога.
+    normalized_jobs - результат normalize_job_texts(raw_jobs), если он уже есть.
+    """
+    started = time.perf_counter()
+    mode = resolve_scoring_mode(mode)
 
     # 1. Подготовка профиля пользователя
     # Преобразуем полный список навыков в строку для векторизации
-    user_skills_text = preprocess_text(" ".join(full_user_skills))
+    if user_vector is None:
+        user_vector = build_profile_vector(full_user_skills)
 
-    final_results = []
+    # 2. Подготовка текстов вакансий (один раз для всего пакета, повторные тексты - из кэша)
+    if normalized_jobs is None:
+        normalized_jobs = normalize_job_texts(raw_jobs)
+    preprocessed_job_texts = [text for text, _ in normalized_jobs]
+    job_token_lists = [tokens for _, tokens in normalized_jobs]
+    preprocessed = time.perf_counter()
+
+    # 3. Расчет релевантности для всех вакансий одним разреженным произведением
+    scores, timings = score_jobs(user_vector.tokens, job_token_lists, mode=mode)
+    scored = time.perf_counter()
 
-    for job in raw_jobs:
-        # 2. Подготовка текста вакансии
-        job_text = job.get('title', '') + ' ' + job.get('description', '')
-        preprocessed_job_text = preprocess_text(job_text)
+    # 4. Поиск исключаемых навыков: один проход автомата по каждому тексту
+    if exclusions is None:
+        exclusions = ExclusionAutomaton(excluded_skills)
+    excluded_matches = exclusions.find_many(preprocessed_job_texts)
+    timings['exclusions_ms'] = round((time.perf_counter() - scored) * 1000, 3)
 
-        # 3. Расчет релевантности
-        score = calculate_relevance(user_skills_text, preprocessed_job_text)
+    final_results = []
 
-        # 4. Фильтрация по исключениям (уменьшение счета, если найдены исключаемые слова)
-        penalty = 0
-        for excluded_skill in excluded_skills:
-            if excluded_skill.lower() in preprocessed_job_text:
-                penalty += 10 # Штраф в 10% за каждое найденное исключение
+    for job, matches, score in zip(raw_jobs, excluded_matches, scores):
+        score = float(score)
 
-        final_score = max(0, score - penalty) # Гарантируем, что счет не отрицательный
+        # Уменьшение счета, если найдены исключаемые навыки
+        penalty = EXCLUSION_PENALTY * len(matches) # Штраф в 10% за каждое найденное исключение
+
+        final_score = round(max(0, score - penalty), 2) # Гарантируем, что счет не отрицательный
 
         # --- ЛОГИРОВАНИЕ СЧЁТА ---
-        logger.info(f"DEBUG SCORE for '{job.get('title')}': Raw Score={score}%, Penalty={penalty}%, Final={final_score}%")
+        logger.info(f"DEBUG SCORE for '{job.get('title')}': Raw Score={score}%, Penalty={penalty}% {matches}, Final={final_score}%")
         # --------------------------
 
-        # 5. Добавление результата
+        # 5. Добавление результата (с объяснением штрафа)
         job['relevance_score'] = final_score
+        job['excluded_matches'] = matches
 
         # Финальный фильтр: не показываем вакансии с очень низким баллом
-        if final_score >= 1:
+        if final_score >= MIN_RELEVANCE_SCORE:
             final_results.append(job)
 
-    # 6. Сортировка по убыванию релевантности
-    final_results.sort(key=lambda x: x['relevance_score'], reverse=True)
+    timings['preprocess_ms'] = round((preprocessed - started) * 1000, 3)
+    timings['total_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    logger.info(f"AI Match timings ({mode}, {len(raw_jobs)} jobs): {timings}")
 
-    return final_results
\ No newline at end of file
+    return final_results
@@ -2,67 +2,107 @@ import logging
 import sys
 from logging.handlers import RotatingFileHandler
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
 from config import Config
-from flask_bcrypt import Bcrypt
-from flask_cors import CORS
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
+from extensions import db, bcrypt, cors, migrate, jwt, swagger
 import os
-from flasgger import Swagger
-import logging.handlers
 
-# --- Инициализация Flask и Swagger (должно быть первым) ---
-app = Flask(__name__)
-swagger = Swagger(app)
 
 # -------------------------------------------------------------
 # 1. КОНФИГУРАЦИЯ ЛОГИРОВАНИЯ (Исправленная версия с UTF-8)
 # -------------------------------------------------------------
+def configure_logging(app):
+    from job_providers import SecretMaskFilter
 
-# Получаем корневой логгер Python
-root = logging.getLogger()
-root.handlers = [] # Очищаем все, что было настроено ранее
-root.setLevel(logging.INFO) # Устанавливаем минимальный уровень
+    # Получаем корневой логгер Python
+    root = logging.getLogger()
+    root.handlers = [] # Очищаем все, что было настроено ранее
+    root.setLevel(logging.INFO) # Устанавливаем минимальный уровень
 
-if not app.debug:
-    # 1.1. Настройка для файлового логирования (для Promtail/Loki)
-    if not os.path.exists('logs'):
-        os.mkdir('logs')
-    # Добавляем encoding='utf8'
-    # Изменение размера лога до 10 МБ в maxBytes (10 * 1024 * 1024 байт)
-    file_handler = RotatingFileHandler('logs/xednix_app.log', maxBytes=102400, backupCount=10, encoding='utf8')
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'))
-    file_handler.setLevel(logging.INFO)
-    root.addHandler(file_handler)
+    if not app.debug:
+        # 1.1. Настройка для файлового логирования (для Promtail/Loki)
+        if not os.path.exists('logs'):
+            os.mkdir('logs')
+        # Добавляем encoding='utf8'
+        # Изменение размера лога до 10 МБ в maxBytes (10 * 1024 * 1024 байт)
+        file_handler = RotatingFileHandler('logs/xednix_app.log', maxBytes=102400, backupCount=10, encoding='utf8')
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'))
+        file_handler.setLevel(logging.INFO)
+        # API-ключи ресурсов (в URL Jooble) маскируются во всех записях
+        file_handler.addFilter(SecretMaskFilter())
+        root.addHandler(file_handler)
 
-    # 1.2. ДОБАВЛЯЕМ StreamHandler для консоли
-    # Нам нужно обеспечить UTF-8 для консоли, используя sys.stdout.reconfigure()
-    # (работает только в Python 3.7+), или установить кодировку в самом обработчике.
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-    console_handler.setLevel(logging.INFO)
-    root.addHandler(console_handler)
+        # 1.2. ДОБАВЛЯЕМ StreamHandler для консоли
+        # Нам нужно обеспечить UTF-8 для консоли, используя sys.stdout.reconfigure()
+        # (работает только в Python 3.7+), или установить кодировку в самом обработчике.
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        console_handler.setLevel(logging.INFO)
+        console_handler.addFilter(SecretMaskFilter())
+        root.addHandler(console_handler)
 
-# -------------------------------------------------------------
-# 2. Инициализация расширений Flask
-# -------------------------------------------------------------
-app.config.from_object(Config)
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
-CORS(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
 
 # -------------------------------------------------------------
-# 3. Импорт маршрутов и моделей (должен быть последним)
+# 2. Общее состояние процесса: HTTP-клиент, кэш ответов ресурсов и пул хеширования паролей; матчер, модель IDF корпуса
+# и индекс вакансий загружаются лениво (matcher_loader.py), чтобы процесс стартовал без numpy/scipy
 # -------------------------------------------------------------
-from routes import *
-from models import *
+def init_shared_state(app):
+    from http_client import init_http_client
+    from provider_cache import init_provider_cache
+    from matcher_loader import init_matcher
+    from password_hasher import init_password_hasher
+
+    # Общий HTTP-клиент с пулами соединений и кэш ответов для внешних ресурсов вакансий
+    init_http_client(app.config)
+    init_provider_cache(app.config)
+    init_password_hasher(app.config)
+    init_matcher(app.config)
+
+
+def create_app(config_class=Config):
+    """
+    Фабрика приложения. Используется flask CLI (FLASK_APP=app), wsgi.py (gunicorn)
+    и cooperative.py; каждый вызов создает отдельное приложение со своими настройками.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    configure_logging(app)
+
+    # -------------------------------------------------------------
+    # 3. Инициализация расширений Flask
+    # -------------------------------------------------------------
+    swagger.init_app(app)
+    db.init_app(app)
+    bcrypt.init_app(app)
+    # Заголовки ответа /api/search, которые должен видеть фронтенд (пагинация, статус ресурсов)
+    cors.init_app(app, expose_headers=['X-Total-Count', 'X-Providers-Timed-Out', 'X-Providers-Failed', 'X-Providers-Local', 'X-Unread-Count'])
+    migrate.init_app(app, db)
+    jwt.init_app(app)
+
+    # -------------------------------------------------------------
+    # 4. Маршруты, модели (для миграций) и команды CLI
+    # -------------------------------------------------------------
+    import models
+    from routes import bp
+    from openapi import init_openapi
+    from commands import matcher, ingest, openapi, startup_report
+    app.register_blueprint(bp)
+    # Спецификация OpenAPI - из собранного файла, разбор докстрингов только в debug
+    init_openapi(app)
+    app.cli.add_command(matcher)
+    app.cli.add_command(ingest)
+    app.cli.add_command(openapi)
+    app.cli.add_command(startup_report)
+
+    init_shared_state(app)
+    return app
+
 
 if __name__ == '__main__':
     # Если запускаем через 'python app.py', включаем debug,
     # иначе используем настройки выше для 'flask run'
+    from matcher_loader import warm_up
+    app = create_app()
+    warm_up(app.config['MATCHER_WARMUP'])
     app.run(debug=True)
@@ -0,0 +1,228 @@
+"""
+Бенчмарк одновременных поисков /api/search на одном процессе сервера.
+
+Сравнивает синхронный воркер (один запрос за раз, как sync-воркер gunicorn)
+с кооперативным режимом cooperative.py (gevent) при одинаковой нагрузке:
+--clients клиентов в течение --duration секунд отправляют поиски с уникальными
+ключевыми словами (кэш ответов выключен). Внешний ресурс - локальный сервер
+в формате Jooble с задержкой --latency секунд, лимиты адаптера сняты.
+
+Запуск из корня проекта: python benchmarks/bench_concurrent_search.py [--clients 200] [--duration 10] [--latency 0.2]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ('sync', 'gevent')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_upstream(port, latency):
+    """Ресурс вакансий в формате Jooble: 20 вакансий на страницу после задержки latency."""
+    jobs = [
+        {'id': i, 'title': f'Python developer {i}', 'company': 'ACME', 'location': 'Berlin',
+         'salary': '', 'link': f'https://example.com/{i}', 'snippet': 'python sql docker flask postgresql'}
+        for i in range(20)
+    ]
+    body = json.dumps({'totalCount': len(jobs), 'jobs': jobs}).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    server.serve_forever()
+
+
+def run_server(mode, port, upstream_port):
+    """Приложение в заданном режиме; при первом запуске создает таблицы и ресурс Jooble."""
+    if mode == 'gevent':
+        import cooperative
+        cooperative.patch()
+
+    from app import create_app
+    from extensions import db
+    from models import JobResource
+    from matcher_loader import warm_up
+
+    app = create_app()
+    warm_up()
+
+    with app.app_context():
+        db.create_all()
+        if not JobResource.query.first():
+            db.session.add(JobResource(
+                name='Jooble', base_url=f'http://127.0.0.1:{upstream_port}/api/', adapter='jooble',
+                settings=json.dumps({'max_concurrency': 100000, 'rate_per_second': 1e9, 'burst': 1e9, 'page_depth': 1})
+            ))
+            db.session.commit()
+
+    if mode == 'gevent':
+        from gevent.pool import Pool
+        from gevent.pywsgi import WSGIServer
+        cooperative.scale_limits(app)
+        WSGIServer(('127.0.0.1', port), app, spawn=Pool(app.config['SERVER_MAX_CONNECTIONS']), log=None).serve_forever()
+    else:
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', port, app, threaded=False)
+        server.socket.listen(1024)
+        server.serve_forever()
+
+
+def wait_for_port(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def prepare_user(base_url):
+    """Пользователь с навыками профиля; возвращает заголовки авторизации."""
+    import requests
+    credentials = {'username': 'bench', 'email': 'bench@example.com', 'password': 'bench'}
+    requests.post(f'{base_url}/register', json=credentials)
+    token = requests.post(f'{base_url}/login', json={'username_or_email': 'bench', 'password': 'bench'}).json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    requests.post(f'{base_url}/api/profile/skills/full', json={'skills': ['Python', 'SQL', 'Flask'], 'level': 'mid'}, headers=headers)
+    return headers
+
+
+def load(base_url, headers, clients, duration):
+    """clients потоков отправляют поиски до истечения duration; возвращает задержки и число ошибок."""
+    import requests
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    counter = iter(range(10 ** 9))
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            search = {'searchTerm': f'python {next(counter)}', 'resourceIds': [1], 'location': 'Berlin', 'level': 'mid', 'limit': 20}
+            started = time.monotonic()
+            try:
+                response = session.post(f'{base_url}/api/search', json=search, headers=headers, timeout=duration + 30)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.monotonic() - started)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.monotonic() - started
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def bench_mode(mode, args, upstream_port, workdir):
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, mode + '.db')}",
+        JOOBLE_API_KEY='bench',
+        PROVIDER_CACHE_TTL_SECONDS='0',
+        PROVIDER_CACHE_PATH='',
+        PROVIDER_MAX_RETRIES='0',
+        SEARCH_LOCAL_FIRST='false',
+        JOOBLE_PAGE_DEPTH='1',
+        MATCHER_IDF_MODEL_PATH=os.path.join(workdir, 'idf_model'),
+        POSTING_INDEX_PATH=os.path.join(workdir, 'posting_index'),
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--role', 'server', '--mode', mode,
+         '--port', str(port), '--upstream-port', str(upstream_port)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+        base_url = f'http://127.0.0.1:{port}'
+        headers = prepare_user(base_url)
+        latencies, errors, elapsed = load(base_url, headers, args.clients, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(
+        f"{mode:>7}: {len(latencies) / elapsed:8.1f} searches/s, ok {len(latencies)}, errors {errors}, "
+        f"p50 {percentile(latencies, 0.5) * 1000:7.0f} ms, p95 {percentile(latencies, 0.95) * 1000:7.0f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--role', choices=('bench', 'upstream', 'server'), default='bench', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--upstream-port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role == 'upstream':
+        return run_upstream(args.port, args.latency)
+    if args.role == 'server':
+        return run_server(args.mode, args.port, args.upstream_port)
+
+    print(f"clients={args.clients}, duration={args.duration}s, upstream latency={args.latency * 1000:.0f} ms")
+    upstream_port = free_port()
+    upstream = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--role', 'upstream', '--port', str(upstream_port), '--latency', str(args.latency)]
+    )
+    try:
+        wait_for_port(upstream_port)
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in args.modes.split(','):
+                bench_mode(mode, args, upstream_port, workdir)
+    finally:
+        upstream.terminate()
+        upstream.wait()
+
+
+if __name__ == '__main__':
+    main()
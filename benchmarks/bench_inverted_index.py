@@ -0,0 +1,104 @@
+"""
+Бенчмарк top-K по инвертированному индексу вакансий.
+
+Сравнивает PostingInvertedIndex.top_k (сумма списков терминов профиля через np.unique + np.bincount
+и argpartition) с полным перебором: скорингом всех вакансий через ai_matcher.score_jobs
+(как в /api/search) и эталонной сортировкой всех сумм (argsort).
+
+Запуск из корня проекта: python benchmarks/bench_inverted_index.py [--jobs 100000] [--k 60] [--queries 50]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_matcher import score_jobs
+from inverted_index import PostingInvertedIndex
+
+
+def make_corpus(n_jobs, n_terms=20000, seed=42):
+    """Синтетические вакансии с распределением терминов по закону Ципфа."""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(n_terms)]
+    weights = [1 / (i + 1) for i in range(n_terms)]
+    return vocabulary, {
+        doc_id: rng.choices(vocabulary, weights, k=rng.randint(20, 80))
+        for doc_id in range(1, n_jobs + 1)
+    }
+
+
+def exhaustive_top_k(index, query_tokens, k):
+    """Эталон: скалярное произведение по всем вакансиям из списков терминов профиля и полная сортировка."""
+    doc_ids, scores = [], []
+    for query_weight, term_index in index._query_terms(query_tokens):
+        start, end = index.offsets[term_index], index.offsets[term_index + 1]
+        doc_ids.append(index.doc_ids[start:end])
+        scores.append(index.weights[start:end] * query_weight)
+    if not doc_ids:
+        return []
+    all_docs = np.concatenate(doc_ids)
+    totals = np.bincount(all_docs, weights=np.concatenate(scores))
+    top = np.argsort(-totals, kind='stable')[:k]
+    return [(int(doc_id), round(float(totals[doc_id]) * 100, 2)) for doc_id in top if totals[doc_id] > 0]
+
+
+def measure(function, queries):
+    started = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--k', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    vocabulary, documents = make_corpus(args.jobs)
+    started = time.perf_counter()
+    index = PostingInvertedIndex.build(documents)
+    build_s = time.perf_counter() - started
+
+    updates = {doc_id: documents[doc_id][::-1][:30] for doc_id in range(1, 1001)}
+    started = time.perf_counter()
+    index.update(updates)
+    update_s = time.perf_counter() - started
+
+    # Профили: 5-25 навыков из "средней" части словаря
+    rng = random.Random(7)
+    queries = [rng.sample(vocabulary[20:2000], rng.randint(5, 25)) for _ in range(args.queries)]
+
+    # Проверка: баллы top-K совпадают с полным перебором (с точностью до округления сумм)
+    for query in queries:
+        expected = [score for _, score in exhaustive_top_k(index, query, args.k)]
+        assert np.allclose([score for _, score in index.top_k(query, args.k)], expected, atol=0.011)
+
+    scored = []
+    postings = []
+    for query in queries:
+        stats = {}
+        index.top_k(query, args.k, stats)
+        scored.append(stats['scored'])
+        postings.append(stats['postings'])
+
+    job_token_lists = list(documents.values())
+    match_ms = measure(lambda query: score_jobs(query, job_token_lists, mode='batch'), queries[:3])
+    exhaustive_ms = measure(lambda query: exhaustive_top_k(index, query, args.k), queries)
+    top_k_ms = measure(lambda query: index.top_k(query, args.k), queries)
+
+    print(f"{args.jobs} jobs, {len(index.terms)} terms, {len(index.doc_ids)} postings, k={args.k}")
+    print(f"  build: {build_s:.2f} s, incremental update of 1000 jobs: {update_s:.2f} s")
+    print(f"  postings summed per query: {np.mean(postings):.0f}, jobs scored: {np.mean(scored):.0f} on average")
+    print(f"  score_jobs over all jobs:          {match_ms:10.3f} ms/query")
+    print(f"  dot product + full argsort:        {exhaustive_ms:10.3f} ms/query")
+    print(f"  PostingInvertedIndex.top_k:        {top_k_ms:10.3f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Микро-бенчмарк нормализации текстов вакансий.
+
+Сравнивает прежнюю реализацию ai_matcher.preprocess_text с пакетным
+text_normalizer.preprocess_many (холодный и теплый кэш).
+
+Запуск из корня проекта: python benchmarks/bench_normalizer.py [--jobs 500] [--repeat 20]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_normalizer
+from text_normalizer import STOPWORDS, TOKEN_PATTERN, preprocess_many
+
+
+def legacy_preprocess_text(text):
+    """Прежняя версия ai_matcher.preprocess_text (эталон для сравнения)."""
+    if not text:
+        return ""
+    text = re.sub(r'[^\w\s]', '', text).lower()
+    words = text.split()
+    return ' '.join([word for word in words if word not in STOPWORDS])
+
+
+def make_snippets(n_jobs, seed=42):
+    """Синтетические сниппеты в стиле Jooble: заголовок + описание на нескольких языках."""
+    vocabulary = (
+        "Python Django Flask SQL PostgreSQL Docker Kubernetes AWS React Node.js Java Spring "
+        "senior junior developer engineer support manager sales Excel analityk programista "
+        "doświadczenie wymagania the and of with for we are looking in our team to "
+        "розробник досвід команда вимоги &nbsp; <b>remote</b> hybrid (m/f/d) B2B €"
+    ).split()
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choices(vocabulary, k=rng.randint(5, 12))) + ' ... ' + ' '.join(rng.choices(vocabulary, k=rng.randint(30, 60)))
+        for _ in range(n_jobs)
+    ]
+
+
+def measure(function, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(texts)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    texts = make_snippets(args.jobs)
+
+    # Проверка эквивалентности результатов
+    assert preprocess_many(texts) == [legacy_preprocess_text(text) for text in texts]
+
+    legacy_ms = measure(lambda batch: [legacy_preprocess_text(text) for text in batch], texts, args.repeat)
+    # ai_matcher раньше токенизировал результат отдельно; preprocess_many делает это сразу
+    legacy_tokenized_ms = measure(
+        lambda batch: [TOKEN_PATTERN.findall(legacy_preprocess_text(text)) for text in batch], texts, args.repeat
+    )
+
+    def cold(batch):
+        text_normalizer.normalizer_cache.clear()
+        preprocess_many(batch)
+
+    cold_ms = measure(cold, texts, args.repeat)
+    preprocess_many(texts)
+    warm_ms = measure(preprocess_many, texts, args.repeat)
+
+    print(f"{args.jobs} snippets, best of {args.repeat} runs")
+    print(f"  legacy preprocess_text:             {legacy_ms:8.3f} ms")
+    print(f"  legacy preprocess_text + tokenize:  {legacy_tokenized_ms:8.3f} ms")
+    print(f"  preprocess_many (cold cache):       {cold_ms:8.3f} ms  x{legacy_tokenized_ms / cold_ms:.2f}")
+    print(f"  preprocess_many (warm cache):       {warm_ms:8.3f} ms  x{legacy_tokenized_ms / warm_ms:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import re
+import sys
+import json
+import time
+import logging
+import statistics
+import subprocess
+from collections import defaultdict
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from extensions import db
+from fulltext_index import get_fulltext_index
+from matcher_loader import LAZY_MODULES, get_matcher
+from text_normalizer import STOPWORDS_MODULE, build_stopwords_module
+
+# Модули матчера и загрузки вакансий (numpy/scipy) импортируются в командах:
+# create_app регистрирует команды при каждом старте, в том числе веб-процесса
+
+
+def _read_job_token_lists(source):
+    """
+    Читает исторические вакансии из JSON Lines файла (по одной вакансии в строке,
+    поля title и description/snippet) и возвращает их токены.
+    """
+    from ai_matcher import preprocess_text, tokenize
+    with open(source, encoding='utf8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            job = json.loads(line)
+            job_text = (job.get('title') or '') + ' ' + (job.get('description') or job.get('snippet') or '')
+            yield tokenize(preprocess_text(job_text))
+
+
+@click.group(cls=AppGroup)
+def matcher():
+    """Обслуживание моделей ИИ-матчинга."""
+
+
+@matcher.command('build-idf')
+@click.argument('source', type=click.Path(exists=True, dir_okay=False))
+def build_idf(source):
+    """Строит модель IDF корпуса с нуля по JSON Lines файлу с вакансиями."""
+    from idf_model import CorpusIdfModel
+    model = CorpusIdfModel.build(_read_job_token_lists(source))
+    path = current_app.config['MATCHER_IDF_MODEL_PATH']
+    version = model.save(path)
+    click.echo(f"IDF model {version} saved to {path}: {len(model.terms)} terms, {model.n_documents} documents")
+
+
+@matcher.command('refresh-idf')
+@click.argument('source', type=click.Path(exists=True, dir_okay=False))
+def refresh_idf(source):
+    """Инкрементально дополняет текущую модель IDF новыми вакансиями."""
+    from idf_model import CorpusIdfModel
+    path = current_app.config['MATCHER_IDF_MODEL_PATH']
+    model = CorpusIdfModel.load(path).refresh(_read_job_token_lists(source))
+    version = model.save(path)
+    click.echo(f"IDF model {version} saved to {path}: {len(model.terms)} terms, {model.n_documents} documents")
+
+
+@matcher.command('build-stopwords')
+def build_stopwords():
+    """Собирает модуль стоп-слов stopwords_data.py из NLTK и stop-words (после обновления этих пакетов)."""
+    count = build_stopwords_module()
+    click.echo(f"Stopwords module saved to {STOPWORDS_MODULE}: {count} words")
+
+
+@click.group(cls=AppGroup)
+def ingest():
+    """Фоновая загрузка вакансий из внешних ресурсов в локальную таблицу JobPosting."""
+
+
+@ingest.command('run')
+@click.option('--once', is_flag=True, help='Выполнить один прогон и завершиться.')
+@click.option('--interval', type=float, default=None, help='Пауза между прогонами, сек. (по умолчанию INGESTION_INTERVAL_SECONDS).')
+def ingest_run(once, interval):
+    """Загружает вакансии для всех комбинаций роль/локация/уровень из RoleFocus в цикле."""
+    from ingestion import run_ingestion
+    interval = interval if interval is not None else current_app.config['INGESTION_INTERVAL_SECONDS']
+    # Модель IDF корпуса нужна для скоринга уведомлений о новых вакансиях
+    get_matcher()
+    while True:
+        started = time.monotonic()
+        try:
+            summary = run_ingestion(current_app.config)
+            click.echo(f"Ingestion: {summary}")
+        except Exception as e:
+            # Ошибка одного прогона не должна останавливать цикл
+            db.session.rollback()
+            logging.getLogger(__name__).exception(f"Ingestion run failed: {e}")
+            if once:
+                raise
+        if once:
+            break
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+@ingest.command('rebuild-index')
+def ingest_rebuild_index():
+    """Создает (если нужно) и пересобирает полнотекстовый индекс вакансий."""
+    index = get_fulltext_index(db.engine)
+    if index is None:
+        raise click.ClickException(f"Full-text index is not supported for {db.engine.dialect.name}")
+    index.rebuild()
+    click.echo(f"Full-text index rebuilt ({index.dialect})")
+
+
+@ingest.command('rebuild-posting-index')
+def ingest_rebuild_posting_index():
+    """Строит инвертированный индекс вакансий для /api/recommendations с нуля."""
+    from ingestion import rebuild_posting_index
+    path = current_app.config['POSTING_INDEX_PATH']
+    index = rebuild_posting_index(path, current_app.config['SEARCH_LOCAL_POSTING_TTL_DAYS'])
+    click.echo(f"Posting index {index.version} saved to {path}: {len(index.terms)} terms, {index.n_documents} documents")
+
+
+@ingest.command('dedup')
+def ingest_dedup():
+    """Пересчитывает подписи SimHash и отметки почти одинаковых вакансий; затем нужен rebuild-posting-index."""
+    from ingestion import rebuild_duplicates
+    total, duplicates = rebuild_duplicates(current_app.config['SEARCH_LOCAL_POSTING_TTL_DAYS'])
+    click.echo(f"Near-duplicates: {duplicates} of {total} postings")
+
+
+@click.group(cls=AppGroup)
+def openapi():
+    """Статическая спецификация OpenAPI (Swagger) для продакшена."""
+
+
+@openapi.command('build')
+@click.option('--output', type=click.Path(dir_okay=False), default=None, help='Файл спецификации (по умолчанию OPENAPI_SPEC_PATH).')
+def openapi_build(output):
+    """Собирает спецификацию из докстрингов маршрутов в статический файл (после изменения маршрутов)."""
+    from openapi import build_openapi_spec
+    path = output or current_app.config['OPENAPI_SPEC_PATH']
+    paths = build_openapi_spec(current_app, path)
+    click.echo(f"OpenAPI spec saved to {path}: {paths} paths")
+
+
+# Холодный старт в отдельном интерпретаторе: импорт приложения и create_app
+_STARTUP_PROBE = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "from app import create_app\n"
+    "create_app()\n"
+    "print(f'startup_ms={(time.perf_counter() - started) * 1000:.1f}')\n"
+)
+# Строка отчета python -X importtime: "import time: <self, мкс> | <cumulative, мкс> | <модуль>"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$')
+
+
+def _run_startup_probe(*options):
+    """Время create_app в новом процессе (мс) и его stderr."""
+    result = subprocess.run(
+        [sys.executable, *options, '-c', _STARTUP_PROBE], cwd=current_app.root_path, capture_output=True, text=True
+    )
+    match = re.search(r'^startup_ms=([\d.]+)$', result.stdout, re.M)
+    if result.returncode != 0 or match is None:
+        raise click.ClickException(f"Startup probe failed:\n{result.stderr[-2000:]}")
+    return float(match.group(1)), result.stderr
+
+
+@click.command('startup-report')
+@click.option('--top', type=int, default=15, show_default=True, help='Сколько самых долгих пакетов показать.')
+@click.option('--runs', type=int, default=3, show_default=True, help='Число замеров времени старта (берется медиана).')
+@click.option('--budget-ms', type=int, default=None, help='Предел времени create_app, мс (по умолчанию STARTUP_BUDGET_MS, 0 - без проверки).')
+def startup_report(top, runs, budget_ms):
+    """
+    Холодный старт веб-процесса: время импорта приложения и create_app в новом интерпретаторе
+    и разбор python -X importtime по пакетам. Завершается с ошибкой, если превышен бюджет
+    или при старте импортируются модули матчера (matcher_loader.LAZY_MODULES).
+    """
+    budget_ms = budget_ms if budget_ms is not None else current_app.config['STARTUP_BUDGET_MS']
+    startup_ms = statistics.median(_run_startup_probe()[0] for _ in range(max(1, runs)))
+
+    _, importtime = _run_startup_probe('-X', 'importtime')
+    self_us = defaultdict(int)
+    for line in importtime.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us[match.group(3).split('.')[0]] += int(match.group(1))
+
+    click.echo(f"create_app: {startup_ms:.0f} ms (median of {max(1, runs)} runs)")
+    click.echo(f"Imports by package, self time (python -X importtime, {sum(self_us.values()) / 1000:.0f} ms total):")
+    for package, us in sorted(self_us.items(), key=lambda item: item[1], reverse=True)[:top]:
+        click.echo(f"  {us / 1000:8.1f} ms  {package}")
+
+    problems = []
+    eager_modules = sorted(package for package in self_us if package in LAZY_MODULES)
+    if eager_modules:
+        problems.append(f"lazy modules imported at startup: {', '.join(eager_modules)}")
+    if budget_ms and startup_ms > budget_ms:
+        problems.append(f"create_app took {startup_ms:.0f} ms, budget {budget_ms} ms")
+    if problems:
+        raise click.ClickException('; '.join(problems))
+    click.echo("Startup OK")
@@ -9,4 +9,82 @@ class Config:
     # Настройки для JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'your-very-secret-jwt-key' # <--- ДОБАВИТЬ
     # Установите, что токен действует 1 день
-    JWT_ACCESS_TOKEN_EXPIRES = 86400
\ No newline at end of file
+    JWT_ACCESS_TOKEN_EXPIRES = 86400
+    # Стоимость хеша bcrypt (2^rounds итераций); хеши со старой стоимостью пересчитываются при входе
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Пул хеширования паролей (password_hasher.py): потоки, очередь сверх них (дальше - 503)
+    # и предельное ожидание результата, сек.
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 32))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', 5))
+    # Retry-After для клиентов, отклоненных из-за переполненного пула хеширования, сек.
+    PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv('PASSWORD_HASH_RETRY_AFTER_SECONDS', 1))
+    # Каталог с предварительно рассчитанной моделью IDF корпуса (см. idf_model.py)
+    MATCHER_IDF_MODEL_PATH = os.getenv('MATCHER_IDF_MODEL_PATH', 'data/idf_model')
+    # Загрузка матчера (matcher_loader.py) в серверах: eager - до приема запросов,
+    # background - в фоновом потоке после старта, lazy - при первом поиске
+    MATCHER_WARMUP = os.getenv('MATCHER_WARMUP', 'eager')
+    # Бюджет холодного старта create_app для 'flask startup-report' (мс, 0 - без проверки)
+    STARTUP_BUDGET_MS = int(os.getenv('STARTUP_BUDGET_MS', 0))
+    # Собранная спецификация OpenAPI (flask openapi build, openapi.py) и ее время жизни в кэше клиентов, сек.
+    OPENAPI_SPEC_PATH = os.getenv('OPENAPI_SPEC_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'openapi.json'))
+    OPENAPI_SPEC_MAX_AGE = int(os.getenv('OPENAPI_SPEC_MAX_AGE', 3600))
+    # Максимальное число профилей в кэше подготовленных навыков (LRU)
+    PROFILE_VECTOR_CACHE_SIZE = int(os.getenv('PROFILE_VECTOR_CACHE_SIZE', 1024))
+    # Кэш снимков пользователей и профилей в воркере (user_cache.py): размер и время жизни записи, сек.
+    # Изменения профиля в другом воркере становятся видны не позже чем через TTL (0 - кэш выключен)
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 4096))
+    USER_CACHE_TTL_SECONDS = float(os.getenv('USER_CACHE_TTL_SECONDS', 30))
+    # Пагинация /api/search: размер страницы по умолчанию и максимальный
+    SEARCH_DEFAULT_LIMIT = int(os.getenv('SEARCH_DEFAULT_LIMIT', 50))
+    SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', 200))
+    # Кооперативный сервер (cooperative.py, gevent): адрес и максимум одновременных соединений процесса
+    SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', 5000))
+    SERVER_MAX_CONNECTIONS = int(os.getenv('SERVER_MAX_CONNECTIONS', 1000))
+    # Параллельный опрос ресурсов вакансий: число потоков, таймаут (чтения) одного ресурса и общий дедлайн (сек.)
+    SEARCH_FANOUT_WORKERS = int(os.getenv('SEARCH_FANOUT_WORKERS', 16))
+    PROVIDER_TIMEOUT_SECONDS = float(os.getenv('PROVIDER_TIMEOUT_SECONDS', 8))
+    SEARCH_DEADLINE_SECONDS = float(os.getenv('SEARCH_DEADLINE_SECONDS', 12))
+    # HTTP-клиент ресурсов: хосты с собственным пулом, соединений на хост, таймаут соединения, повторы
+    PROVIDER_POOL_HOSTS = int(os.getenv('PROVIDER_POOL_HOSTS', 10))
+    PROVIDER_POOL_MAXSIZE = int(os.getenv('PROVIDER_POOL_MAXSIZE', 20))
+    PROVIDER_CONNECT_TIMEOUT_SECONDS = float(os.getenv('PROVIDER_CONNECT_TIMEOUT_SECONDS', 3.05))
+    PROVIDER_MAX_RETRIES = int(os.getenv('PROVIDER_MAX_RETRIES', 2))
+    PROVIDER_BACKOFF_BASE_SECONDS = float(os.getenv('PROVIDER_BACKOFF_BASE_SECONDS', 0.2))
+    # Глубина выборки Jooble (страниц на поиск) и число одновременных запросов страниц в одном поиске
+    JOOBLE_PAGE_DEPTH = int(os.getenv('JOOBLE_PAGE_DEPTH', 3))
+    SEARCH_PAGE_CONCURRENCY = int(os.getenv('SEARCH_PAGE_CONCURRENCY', 4))
+    # Досрочная остановка: поиск прекращается, когда набрано limit + offset вакансий с баллом не ниже порога
+    SEARCH_EARLY_STOP_SCORE = float(os.getenv('SEARCH_EARLY_STOP_SCORE', 30))
+    # Кэш ответов ресурсов: TTL (сек., 0 - выключен), записей в памяти процесса, общий файл SQLite на узле
+    PROVIDER_CACHE_TTL_SECONDS = float(os.getenv('PROVIDER_CACHE_TTL_SECONDS', 600))
+    PROVIDER_CACHE_MEMORY_SIZE = int(os.getenv('PROVIDER_CACHE_MEMORY_SIZE', 2048))
+    PROVIDER_CACHE_PATH = os.getenv('PROVIDER_CACHE_PATH', 'instance/provider_cache.sqlite3')
+    PROVIDER_CACHE_DISK_MAX_ENTRIES = int(os.getenv('PROVIDER_CACHE_DISK_MAX_ENTRIES', 50000))
+    # Фоновая загрузка вакансий (flask ingest run): интервал между прогонами, локации (через запятую)
+    # для ролей без сохраненной локации, страниц на запрос, одновременных запросов и дедлайн прогона (сек.)
+    INGESTION_INTERVAL_SECONDS = float(os.getenv('INGESTION_INTERVAL_SECONDS', 900))
+    INGESTION_LOCATIONS = [part.strip() for part in os.getenv('INGESTION_LOCATIONS', '').split(',') if part.strip()]
+    INGESTION_PAGE_DEPTH = int(os.getenv('INGESTION_PAGE_DEPTH', 5))
+    INGESTION_CONCURRENCY = int(os.getenv('INGESTION_CONCURRENCY', 8))
+    INGESTION_DEADLINE_SECONDS = float(os.getenv('INGESTION_DEADLINE_SECONDS', 600))
+    # Период полной (не инкрементальной) загрузки курсора, сек.; должен быть заметно меньше
+    # SEARCH_LOCAL_POSTING_TTL_DAYS, иначе еще открытые вакансии успеют устареть
+    INGESTION_FULL_REFRESH_SECONDS = float(os.getenv('INGESTION_FULL_REFRESH_SECONDS', 86400))
+    # Локальный поиск: данные курсора считаются свежими max_age секунд, вакансии хранятся posting_ttl дней
+    SEARCH_LOCAL_FIRST = os.getenv('SEARCH_LOCAL_FIRST', 'true').lower() in ('1', 'true', 'yes')
+    SEARCH_LOCAL_MAX_AGE_SECONDS = float(os.getenv('SEARCH_LOCAL_MAX_AGE_SECONDS', 3600))
+    SEARCH_LOCAL_POSTING_TTL_DAYS = int(os.getenv('SEARCH_LOCAL_POSTING_TTL_DAYS', 30))
+    SEARCH_LOCAL_MAX_CANDIDATES = int(os.getenv('SEARCH_LOCAL_MAX_CANDIDATES', 2000))
+    # Минимум кандидатов полнотекстового индекса, чтобы запрос без своего курсора обслуживался локально
+    SEARCH_LOCAL_MIN_CANDIDATES = int(os.getenv('SEARCH_LOCAL_MIN_CANDIDATES', 20))
+    # Отсев почти одинаковых вакансий (dedup.py) в поиске: копии между ресурсами и страницами не скорятся
+    SEARCH_DEDUP = os.getenv('SEARCH_DEDUP', 'true').lower() in ('1', 'true', 'yes')
+    # Инвертированный индекс вакансий (inverted_index.py) и число кандидатов на позицию страницы /api/recommendations
+    POSTING_INDEX_PATH = os.getenv('POSTING_INDEX_PATH', 'data/posting_index')
+    RECOMMENDATIONS_CANDIDATE_FACTOR = int(os.getenv('RECOMMENDATIONS_CANDIDATE_FACTOR', 3))
+    # Доля вакансий, измененных после расчета IDF индекса, при которой индекс перестраивается целиком
+    POSTING_INDEX_MAX_IDF_DRIFT = float(os.getenv('POSTING_INDEX_MAX_IDF_DRIFT', 0.3))
+    # Минимальный балл новой вакансии для уведомления пользователя (обратный матчинг, percolator.py)
+    NOTIFICATION_MIN_SCORE = float(os.getenv('NOTIFICATION_MIN_SCORE', 50))
@@ -0,0 +1,83 @@
+"""
+Кооперативный режим сервера (gevent): один процесс обслуживает сотни одновременных поисков.
+
+Время /api/search почти целиком уходит на ожидание внешних ресурсов и БД. Синхронный воркер
+держит поток на весь поиск, так что одновременных поисков не больше, чем воркеров.
+Здесь до импорта приложения сокеты, потоки и блокировки стандартной библиотеки
+подменяются на gevent (monkey.patch_all), а psycopg2 получает ожидающий callback:
+requests, пул потоков опроса ресурсов (search_fanout) и запросы к Postgres уступают
+управление на каждом ожидании ввода-вывода, а код маршрутов остается синхронным.
+
+Запуск: python cooperative.py (адрес и число соединений - SERVER_HOST, SERVER_PORT, SERVER_MAX_CONNECTIONS)
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _gevent_wait_callback(connection, timeout=None):
+    """Ожидание ответа Postgres без блокировки процесса (аналог psycogreen)."""
+    from psycopg2 import OperationalError, extensions
+    from gevent.socket import wait_read, wait_write
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(connection.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(connection.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f"Bad result from poll: {state}")
+
+
+def patch_psycopg():
+    """Запросы psycopg2 становятся кооперативными (нужно до открытия первого соединения)."""
+    try:
+        from psycopg2 import extensions
+    except ImportError:
+        return False
+    extensions.set_wait_callback(_gevent_wait_callback)
+    return True
+
+
+def patch():
+    """Подмена блокирующего ввода-вывода на gevent; вызывается до импорта приложения."""
+    from gevent import monkey
+    monkey.patch_all()
+    patch_psycopg()
+
+
+def scale_limits(app):
+    """
+    Лимиты, рассчитанные на потоки ОС, в кооперативном режиме поднимаются до числа соединений:
+    иначе общий пул опроса ресурсов и пул HTTP-соединений на хост стали бы очередью для всех поисков.
+    Лимиты адаптеров ресурсов (max_concurrency, token bucket) не меняются.
+    """
+    from http_client import init_http_client
+    connections = app.config['SERVER_MAX_CONNECTIONS']
+    app.config['SEARCH_FANOUT_WORKERS'] = max(
+        app.config['SEARCH_FANOUT_WORKERS'], connections * app.config['SEARCH_PAGE_CONCURRENCY']
+    )
+    app.config['PROVIDER_POOL_MAXSIZE'] = max(app.config['PROVIDER_POOL_MAXSIZE'], connections)
+    init_http_client(app.config)
+
+
+def serve():
+    patch()
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+    from app import create_app
+    from matcher_loader import warm_up
+
+    app = create_app()
+    scale_limits(app)
+    warm_up(app.config['MATCHER_WARMUP'])
+    address = (app.config['SERVER_HOST'], app.config['SERVER_PORT'])
+    server = WSGIServer(address, app, spawn=Pool(app.config['SERVER_MAX_CONNECTIONS']), log=None)
+    logger.info(f"Cooperative server on {address[0]}:{address[1]}, max connections {app.config['SERVER_MAX_CONNECTIONS']}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,123 @@
+import hashlib
+import numpy as np
+from text_normalizer import normalize_tokens
+
+
+# Подпись SimHash - 64 бита; вакансии с расстоянием Хэмминга не больше MAX_DISTANCE считаются дубликатами
+# (на сниппетах Jooble копия с другим ID или обрезанным текстом обычно отличается на 0-6 бит,
+# разные вакансии - на 13 и больше). Локация в подпись не входит: она - точная часть ключа,
+# иначе одна и та же вакансия в другом городе отличалась бы как раз на ~6 бит и склеивалась
+SIMHASH_BITS = 64
+MAX_DISTANCE = 6
+# LSH: подпись делится на MAX_DISTANCE + 1 полос. Если подписи отличаются не больше
+# чем в MAX_DISTANCE битах, хотя бы одна полоса у них совпадает целиком (принцип Дирихле)
+BANDS = MAX_DISTANCE + 1
+_BAND_BOUNDS = [SIMHASH_BITS * band // BANDS for band in range(BANDS + 1)]
+
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+def simhash(tokens):
+    """
+    SimHash по словам и парам соседних слов: у почти одинаковых текстов (другой ID,
+    обрезанный сниппет, лишнее слово) подписи отличаются лишь в нескольких битах.
+    """
+    features = list(tokens) + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    hashes = np.fromiter((_feature_hash(feature) for feature in features), dtype=np.uint64, count=len(features))
+    bits = ((hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)).astype(np.int64)
+    votes = bits.sum(axis=0) * 2 - len(features)
+    return int(np.sum(np.left_shift(np.uint64(1), _BIT_POSITIONS[votes > 0]), dtype=np.uint64))
+
+
+def job_signature(job, tokens=None):
+    """
+    Подпись вакансии по нормализованному тексту title + description - тому же, что скорит ai_matcher;
+    tokens - уже готовые токены этого текста (чтобы не нормализовать его второй раз).
+    """
+    if tokens is None:
+        tokens = normalize_tokens((job.get('title') or '') + ' ' + (job.get('description') or ''))[1]
+    return simhash(tokens)
+
+
+def location_key(location):
+    """Локация для точного сравнения: регистр и лишние пробелы не учитываются."""
+    return ' '.join((location or '').lower().split())
+
+
+def signature_bands(signature):
+    return [
+        (signature >> start) & ((1 << (end - start)) - 1)
+        for start, end in zip(_BAND_BOUNDS, _BAND_BOUNDS[1:])
+    ]
+
+
+def hamming_distance(left, right):
+    return bin(left ^ right).count('1')
+
+
+def to_signed64(signature):
+    """Подпись для колонки BigInteger (знаковое 64-битное целое)."""
+    return signature - (1 << 64) if signature >= (1 << 63) else signature
+
+
+def from_signed64(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateFilter:
+    """
+    Индекс LSH почти одинаковых вакансий: (локация, номер полосы, значение полосы) -> принятые подписи,
+    так что каждая новая вакансия сравнивается лишь с несколькими кандидатами из той же локации.
+
+    В поиске отсевает копии между ресурсами и страницами до скоринга; при фоновой загрузке
+    строится по подписям, сохраненным в JobPosting, и находит копии из прошлых прогонов.
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._buckets = {}
+        self.accepted = 0
+        self.duplicates = 0
+
+    def find(self, signature, location=None):
+        """Ключ уже принятой вакансии той же локации, почти совпадающей с данной, или None."""
+        place = location_key(location)
+        for band, value in enumerate(signature_bands(signature)):
+            for candidate, key in self._buckets.get((place, band, value), ()):
+                if hamming_distance(signature, candidate) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, signature, key=None, location=None):
+        place = location_key(location)
+        for band, value in enumerate(signature_bands(signature)):
+            self._buckets.setdefault((place, band, value), []).append((signature, key))
+
+    def unique_indexes(self, jobs, token_lists=None):
+        """
+        Номера вакансий пакета, не являющихся копиями уже принятых (первая встреченная копия остается).
+        token_lists - токены title + description каждой вакансии, если они уже посчитаны.
+        """
+        unique = []
+        for position, job in enumerate(jobs):
+            signature = job_signature(job, token_lists[position] if token_lists is not None else None)
+            location = job.get('location')
+            # Вакансии без текста (нулевая подпись) не сравниваются
+            if signature and self.find(signature, location) is not None:
+                self.duplicates += 1
+                continue
+            if signature:
+                self.add(signature, job.get('id') or signature, location)
+            self.accepted += 1
+            unique.append(position)
+        return unique
+
+    def filter(self, jobs):
+        """Вакансии пакета без дубликатов уже принятых."""
+        return [jobs[position] for position in self.unique_indexes(jobs)]
@@ -0,0 +1,136 @@
+import json
+import threading
+from collections import OrderedDict, deque
+from text_normalizer import normalize
+
+
+class ExclusionAutomaton:
+    """
+    Автомат Ахо-Корасик по словам для исключаемых навыков.
+
+    Исключения нормализуются так же, как текст вакансии, и хранятся как последовательности слов,
+    поэтому совпадение всегда идет по границам слов ('java' не находится внутри 'javascript'),
+    а каждый текст просматривается за один проход независимо от числа исключений.
+    Навыки, одинаковые после нормализации ('Python', 'python'), - один шаблон и один штраф.
+    """
+
+    def __init__(self, excluded_skills):
+        self.patterns = []      # id шаблона -> исходное название исключаемого навыка
+        self._goto = [{}]       # состояние -> {слово: следующее состояние}
+        self._fail = [0]
+        self._output = [()]     # состояние -> id шаблонов, которые заканчиваются в нем
+
+        for skill in excluded_skills:
+            words = normalize(skill).split()
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            if self._output[state]:
+                continue # Повтор уже добавленного навыка
+            self._output[state] += (len(self.patterns),)
+            self.patterns.append(skill)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(word, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find(self, preprocessed_text):
+        """Возвращает список исключаемых навыков, найденных в нормализованном тексте."""
+        if not self.patterns or not preprocessed_text:
+            return []
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        hits = set()
+        for word in preprocessed_text.split():
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                hits.update(output[state])
+
+        return [self.patterns[pattern_id] for pattern_id in sorted(hits)]
+
+    def find_many(self, preprocessed_texts):
+        return [self.find(text) for text in preprocessed_texts]
+
+
+class ExclusionAutomatonCache:
+    """
+    LRU-кэш скомпилированных автоматов исключений, ключ - запись RoleFocus (id и дата).
+    При изменении исключений RoleFocus пересоздается, поэтому старый ключ просто вытесняется.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            automaton = self._entries.get(key)
+            if automaton is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return automaton
+            self.misses += 1
+
+        automaton = build()
+        with self._lock:
+            self._entries[key] = automaton
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return automaton
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+exclusion_automaton_cache = ExclusionAutomatonCache()
+
+
+def excluded_skills_of(role_focus):
+    """Список исключаемых навыков из JSON-поля focused_skills_data записи RoleFocus."""
+    if role_focus is None or not role_focus.focused_skills_data:
+        return []
+    return json.loads(role_focus.focused_skills_data).get('excluded_skills', [])
+
+def get_focus_automaton(role_focus):
+    """Автомат исключений для записи RoleFocus (JSON разбирается и компилируется один раз на запись)."""
+    if role_focus is None:
+        return ExclusionAutomaton([])
+    return exclusion_automaton_cache.get_or_build(
+        (role_focus.id, role_focus.date),
+        lambda: ExclusionAutomaton(excluded_skills_of(role_focus))
+    )
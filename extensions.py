@@ -0,0 +1,14 @@
+from flask_sqlalchemy import SQLAlchemy
+from flask_bcrypt import Bcrypt
+from flask_cors import CORS
+from flask_migrate import Migrate
+from flask_jwt_extended import JWTManager
+from flasgger import Swagger
+
+# Расширения Flask без привязки к приложению: подключаются в create_app() (app.py) через init_app
+db = SQLAlchemy()
+bcrypt = Bcrypt()
+cors = CORS()
+migrate = Migrate()
+jwt = JWTManager()
+swagger = Swagger()
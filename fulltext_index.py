@@ -0,0 +1,201 @@
+import logging
+from abc import ABC, abstractmethod
+from sqlalchemy import text, bindparam, DateTime
+from text_normalizer import normalize_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def like_contains(value):
+    """Шаблон LIKE 'содержит value' (с ESCAPE '\\'): % и _ в value ищутся как обычные символы."""
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class FullTextIndex(ABC):
+    """
+    Полнотекстовый индекс по title, company и description таблицы job_posting.
+
+    Индекс поддерживается самой БД (генерируемая колонка в Postgres, триггеры FTS5 в SQLite),
+    поэтому каждое добавление или обновление вакансии в ingestion.upsert_postings
+    сразу попадает в индекс без отдельных перестроений.
+    DDL здесь выполняет ensure() (для баз, созданных через db.create_all); миграция 5e9a0b7c3d12
+    хранит собственную замороженную копию, и при изменении DDL нужна новая миграция.
+    """
+
+    dialect = None
+    DDL = ()
+    # Выражение для сравнения локации без учета регистра (в т.ч. не-ASCII: Kraków, Львів)
+    lower_function = 'lower'
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @staticmethod
+    def query_terms(query_text):
+        """Токены запроса после той же нормализации, что и у текстов вакансий (без стоп-слов)."""
+        return list(dict.fromkeys(normalize_tokens(query_text or '')[1]))
+
+    def candidate_ids(self, query_text, limit, resource_id=None, location=None, seen_since=None):
+        """
+        ID вакансий, содержащих хотя бы одно слово запроса, по убыванию текстового ранга.
+        Возвращает список пар (id, rank); пустой список, если в запросе нет значимых слов.
+        """
+        terms = self.query_terms(query_text)
+        if not terms:
+            return []
+        filters = []
+        params = {'limit': limit}
+        if resource_id is not None:
+            filters.append('p.resource_id = :resource_id')
+            params['resource_id'] = resource_id
+        if location:
+            filters.append(f"{self.lower_function}(p.location) LIKE :location ESCAPE '\\'")
+            params['location'] = like_contains(location.lower())
+        if seen_since is not None:
+            filters.append('p.last_seen >= :seen_since')
+            params['seen_since'] = seen_since
+        params['query'] = self._match_query(terms)
+
+        statement = text(self._candidates_sql(' AND '.join(filters)))
+        if seen_since is not None:
+            # Дата должна передаваться в том же формате, в каком SQLAlchemy хранит DateTime
+            statement = statement.bindparams(bindparam('seen_since', type_=DateTime))
+        with self.engine.connect() as connection:
+            self._prepare(connection)
+            return [(row[0], float(row[1])) for row in connection.execute(statement, params)]
+
+    def _prepare(self, connection):
+        """Подготовка соединения перед запросом (функции, которых нет в БД)."""
+
+    @abstractmethod
+    def _match_query(self, terms):
+        """Строка полнотекстового запроса диалекта для токенов terms (совпадение с любым)."""
+
+    @abstractmethod
+    def _candidates_sql(self, filters):
+        """SQL выборки (id, rank) с дополнительными условиями filters."""
+
+    def ensure(self):
+        """Создает структуры индекса, если их еще нет (для баз, созданных через db.create_all)."""
+        with self.engine.begin() as connection:
+            for statement in self.DDL:
+                connection.execute(text(statement))
+
+    @abstractmethod
+    def rebuild(self):
+        """Полностью пересобирает индекс по текущему содержимому job_posting."""
+
+
+class PostgresFullTextIndex(FullTextIndex):
+    """
+    Postgres: генерируемая колонка search_vector (tsvector, веса A/B/C для title/company/description)
+    и GIN-индекс по ней. Конфигурация 'simple' - тексты вакансий на разных языках.
+    """
+
+    dialect = 'postgresql'
+
+    DDL = (
+        "ALTER TABLE job_posting ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(company, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_job_posting_search_vector ON job_posting USING GIN (search_vector)",
+    )
+
+    def _match_query(self, terms):
+        # Токены состоят только из символов \w, поэтому безопасны для синтаксиса to_tsquery
+        return ' | '.join(terms)
+
+    def _candidates_sql(self, filters):
+        where = f" AND {filters}" if filters else ''
+        return (
+            "SELECT p.id, ts_rank_cd(p.search_vector, q.query) AS rank "
+            "FROM job_posting p, to_tsquery('simple', :query) AS q(query) "
+            f"WHERE p.search_vector @@ q.query{where} "
+            "ORDER BY rank DESC, p.id LIMIT :limit"
+        )
+
+    def rebuild(self):
+        # Генерируемая колонка всегда актуальна, достаточно перестроить GIN-индекс
+        self.ensure()
+        with self.engine.begin() as connection:
+            connection.execute(text("REINDEX INDEX ix_job_posting_search_vector"))
+
+
+class SqliteFullTextIndex(FullTextIndex):
+    """
+    SQLite (локальная разработка): внешняя таблица FTS5 поверх job_posting, которую
+    поддерживают триггеры на INSERT/DELETE и на UPDATE текстовых колонок
+    (обновление только last_seen индекс не трогает). Ранг - bm25 с весами 10/5/1.
+    lower() в SQLite меняет регистр только ASCII, поэтому локация сравнивается через
+    функцию unicode_lower (str.lower), которая регистрируется на соединении.
+    """
+
+    dialect = 'sqlite'
+    lower_function = 'unicode_lower'
+
+    DDL = (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS job_posting_fts USING fts5("
+        "title, company, description, content='job_posting', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS job_posting_fts_insert AFTER INSERT ON job_posting BEGIN "
+        "INSERT INTO job_posting_fts (rowid, title, company, description) "
+        "VALUES (new.id, new.title, new.company, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS job_posting_fts_delete AFTER DELETE ON job_posting BEGIN "
+        "INSERT INTO job_posting_fts (job_posting_fts, rowid, title, company, description) "
+        "VALUES ('delete', old.id, old.title, old.company, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS job_posting_fts_update AFTER UPDATE OF title, company, description "
+        "ON job_posting BEGIN "
+        "INSERT INTO job_posting_fts (job_posting_fts, rowid, title, company, description) "
+        "VALUES ('delete', old.id, old.title, old.company, old.description); "
+        "INSERT INTO job_posting_fts (rowid, title, company, description) "
+        "VALUES (new.id, new.title, new.company, new.description); END",
+    )
+
+    def _prepare(self, connection):
+        connection.connection.driver_connection.create_function(
+            self.lower_function, 1, _unicode_lower, deterministic=True
+        )
+
+    def _match_query(self, terms):
+        return ' OR '.join(f'"{term}"' for term in terms)
+
+    def _candidates_sql(self, filters):
+        where = f" AND {filters}" if filters else ''
+        # bm25() тем меньше, чем релевантнее документ - возвращаем ранг с обратным знаком
+        return (
+            "SELECT p.id, -bm25(job_posting_fts, 10.0, 5.0, 1.0) AS rank "
+            "FROM job_posting_fts JOIN job_posting p ON p.id = job_posting_fts.rowid "
+            f"WHERE job_posting_fts MATCH :query{where} "
+            "ORDER BY rank DESC, p.id LIMIT :limit"
+        )
+
+    def rebuild(self):
+        self.ensure()
+        with self.engine.begin() as connection:
+            connection.execute(text("INSERT INTO job_posting_fts (job_posting_fts) VALUES ('rebuild')"))
+
+
+def _unicode_lower(value):
+    return value.lower() if value is not None else None
+
+
+FULLTEXT_INDEXES = {
+    PostgresFullTextIndex.dialect: PostgresFullTextIndex,
+    SqliteFullTextIndex.dialect: SqliteFullTextIndex,
+}
+
+_indexes = {}
+
+
+def get_fulltext_index(engine):
+    """Полнотекстовый индекс для диалекта БД или None, если диалект не поддерживается."""
+    index = _indexes.get(engine)
+    if index is None:
+        index_class = FULLTEXT_INDEXES.get(engine.dialect.name)
+        if index_class is None:
+            logger.warning(f"Full-text index is not supported for {engine.dialect.name}")
+            return None
+        index = _indexes[engine] = index_class(engine)
+    return index
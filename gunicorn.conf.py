@@ -0,0 +1,60 @@
+"""
+Настройки gunicorn для продакшена: gunicorn -c gunicorn.conf.py
+Все значения задаются переменными окружения GUNICORN_* (SERVER_MAX_CONNECTIONS - для gevent).
+
+Приложение загружается в мастере (preload_app): матчер (numpy/scipy), модель IDF и индекс
+вакансий загружаются один раз (wsgi.py), а воркеры после fork делят эти страницы памяти
+с мастером (copy-on-write). gc.freeze() перед запуском воркеров переносит загруженные объекты в постоянное
+поколение сборщика мусора, чтобы его проходы в воркерах не записывали в общие страницы.
+Память каждого воркера (rss/pss/uss, process_stats.py) пишется в лог после запуска
+и отдается в /api/metrics.
+"""
+import gc
+import os
+import multiprocessing
+
+wsgi_app = 'wsgi:app'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+# sync, gthread или gevent (кооперативный режим, см. cooperative.py)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_connections = int(os.getenv('SERVER_MAX_CONNECTIONS', 1000))
+# Поиск укладывается в SEARCH_DEADLINE_SECONDS; timeout - предел, после которого мастер перезапускает воркер
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Перезапуск воркера после max_requests запросов (0 - без перезапуска), если память растет
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+preload_app = True
+
+if worker_class == 'gevent':
+    # Подмена ввода-вывода должна произойти в мастере до загрузки приложения
+    import cooperative
+    cooperative.patch()
+
+
+def when_ready(server):
+    from process_stats import process_memory
+    # Загруженное в мастере дальше только читается: сборщик мусора воркеров его не обходит
+    gc.freeze()
+    server.log.info(f"Application preloaded, master memory: {process_memory()}")
+
+
+def post_fork(server, worker):
+    from extensions import db
+    from http_client import init_http_client
+    app = worker.app.wsgi()
+    # Соединения с БД и HTTP-пулы не должны делиться между процессами
+    with app.app_context():
+        db.engine.dispose(close=False)
+    if worker_class == 'gevent':
+        cooperative.scale_limits(app)
+    else:
+        init_http_client(app.config)
+
+
+def post_worker_init(worker):
+    from process_stats import process_memory
+    worker.log.info(f"Worker {worker.pid} started, memory: {process_memory()}")
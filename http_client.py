@@ -0,0 +1,181 @@
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# HTTP-статусы, при которых имеет смысл повторить запрос к внешнему ресурсу
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+# Методы, которые можно повторить после таймаута чтения: запрос мог уже быть обработан ресурсом
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+class ProviderHttpClient:
+    """
+    Общий HTTP-клиент для внешних ресурсов вакансий.
+
+    Один requests.Session на процесс: HTTPAdapter держит отдельный пул keep-alive соединений
+    на каждый хост, так что TCP/TLS рукопожатие выполняется один раз, а не на каждый поиск.
+    Все запросы идут с таймаутами (connect, read) и ограниченным числом повторов
+    с экспоненциальной задержкой и случайным разбросом (full jitter). Повторы не выходят
+    за дедлайн вызывающего кода (deadline), а таймауты попыток урезаются до оставшегося времени.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, connect_timeout=3.05, read_timeout=8,
+                 max_retries=2, backoff_base=0.2, backoff_max=2.0):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_maxsize = pool_maxsize
+
+        # pool_connections - число хостов с собственным пулом, pool_maxsize - соединений на хост
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            pool_connections=config['PROVIDER_POOL_HOSTS'],
+            pool_maxsize=config['PROVIDER_POOL_MAXSIZE'],
+            connect_timeout=config['PROVIDER_CONNECT_TIMEOUT_SECONDS'],
+            read_timeout=config['PROVIDER_TIMEOUT_SECONDS'],
+            max_retries=config['PROVIDER_MAX_RETRIES'],
+            backoff_base=config['PROVIDER_BACKOFF_BASE_SECONDS'],
+        )
+
+    def _host_metrics(self, host):
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            metrics = self._hosts[host] = {
+                'requests': 0, 'errors': 0, 'retries': 0, 'deadline_exceeded': 0, 'in_flight': 0, 'max_in_flight': 0
+            }
+        return metrics
+
+    def _count(self, host, field, delta=1):
+        with self._lock:
+            metrics = self._host_metrics(host)
+            metrics[field] += delta
+            if field == 'in_flight':
+                metrics['max_in_flight'] = max(metrics['max_in_flight'], metrics['in_flight'])
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _can_retry(self, host, attempt, delay, deadline):
+        if attempt >= self.max_retries:
+            return False
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            # Повтор после паузы уже не уложится в дедлайн поиска или загрузки
+            self._count(host, 'deadline_exceeded')
+            return False
+        return True
+
+    def request(self, method, url, timeout=None, deadline=None, **kwargs):
+        """
+        Выполняет запрос через общий пул. timeout - таймаут чтения (сек.) или кортеж (connect, read);
+        deadline - момент time.monotonic(), после которого новые попытки не начинаются.
+        Неидемпотентные запросы (POST) после таймаута чтения не повторяются.
+        После исчерпания повторов пробрасывает последнее исключение requests
+        или возвращает последний ответ с ошибочным статусом.
+        """
+        if timeout is None:
+            timeout = self.read_timeout
+        if not isinstance(timeout, tuple):
+            timeout = (self.connect_timeout, timeout)
+
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            attempt_timeout = timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count(host, 'deadline_exceeded')
+                    raise requests.exceptions.Timeout(f"{method} {host}: deadline exceeded before the request")
+                attempt_timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+
+            self._count(host, 'requests')
+            self._count(host, 'in_flight')
+            try:
+                response = self._session.request(method, url, timeout=attempt_timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._count(host, 'errors')
+                if isinstance(e, requests.exceptions.ReadTimeout) and method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                delay = self._backoff(attempt)
+                if not self._can_retry(host, attempt, delay, deadline):
+                    raise
+                logger.warning(f"{method} {host} failed ({e.__class__.__name__}), retry {attempt + 1}/{self.max_retries}")
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return response
+                delay = self._backoff(attempt)
+                if not self._can_retry(host, attempt, delay, deadline):
+                    return response
+                self._count(host, 'errors')
+                response.close()
+                logger.warning(f"{method} {host} returned {response.status_code}, retry {attempt + 1}/{self.max_retries}")
+            finally:
+                self._count(host, 'in_flight', -1)
+
+            self._count(host, 'retries')
+            time.sleep(delay)
+            attempt += 1
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """
+        Счетчики по хостам и пулы соединений urllib3 (только публичные счетчики пулов;
+        занятость соединений - in_flight и utilization по хостам).
+        """
+        with self._lock:
+            hosts = {host: dict(metrics) for host, metrics in self._hosts.items()}
+
+        pools = {}
+        for key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                'connections_created': pool.num_connections,
+                'requests': pool.num_requests,
+                'maxsize': self.pool_maxsize,
+            }
+
+        for metrics in hosts.values():
+            metrics['utilization'] = round(metrics['in_flight'] / self.pool_maxsize, 4)
+        return {'hosts': hosts, 'pools': pools}
+
+
+# Клиент процесса; создается в app.py по настройкам приложения (init_http_client)
+provider_http_client = None
+
+
+def init_http_client(config):
+    global provider_http_client
+    provider_http_client = ProviderHttpClient.from_config(config)
+    return provider_http_client
+
+
+def get_http_client():
+    """Клиент процесса (с настройками по умолчанию, если init_http_client еще не вызывался)."""
+    global provider_http_client
+    if provider_http_client is None:
+        provider_http_client = ProviderHttpClient()
+    return provider_http_client
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+
+
+# Файл-указатель на актуальную версию модели внутри каталога модели
+CURRENT_POINTER = 'CURRENT'
+# Сколько старых версий оставлять на диске (воркеры могут еще держать их в mmap)
+KEEP_VERSIONS = 2
+
+
+class CorpusIdfModel:
+    """
+    Словарь и IDF-веса, рассчитанные по историческому корпусу текстов вакансий.
+
+    Модель неизменяемая: refresh() возвращает новую модель, а save() пишет новую версию
+    на диск, поэтому все воркеры могут безопасно читать одни и те же файлы через mmap.
+    Формула IDF совпадает с TfidfVectorizer(smooth_idf=True): ln((1 + n) / (1 + df)) + 1.
+    """
+
+    def __init__(self, terms, document_frequency, n_documents, idf=None, version=None):
+        self.terms = terms
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        self.document_frequency = document_frequency
+        self.n_documents = n_documents
+        self.idf = idf if idf is not None else self._compute_idf(document_frequency, n_documents)
+        self.version = version
+
+    @staticmethod
+    def _compute_idf(document_frequency, n_documents):
+        return np.log((1 + n_documents) / (1 + np.asarray(document_frequency, dtype=np.float64))) + 1
+
+    @property
+    def oov_idf(self):
+        """IDF для термина, которого нет в корпусе (df = 0) - максимально возможный вес."""
+        return float(np.log(1 + self.n_documents) + 1)
+
+    @classmethod
+    def build(cls, token_lists):
+        """Строит модель с нуля по токенизированным текстам вакансий."""
+        return cls([], np.zeros(0, dtype=np.int64), 0).refresh(token_lists)
+
+    def refresh(self, token_lists):
+        """
+        Инкрементальное обновление новыми вакансиями: увеличивает df и n,
+        новые термины добавляются в конец словаря (индексы старых не меняются).
+        """
+        terms = list(self.terms)
+        vocabulary = dict(self.vocabulary)
+        increments = {}
+        n_new = 0
+        for tokens in token_lists:
+            n_new += 1
+            for term in set(tokens):
+                index = vocabulary.get(term)
+                if index is None:
+                    index = vocabulary[term] = len(terms)
+                    terms.append(term)
+                increments[index] = increments.get(index, 0) + 1
+
+        document_frequency = np.zeros(len(terms), dtype=np.int64)
+        document_frequency[:len(self.document_frequency)] = self.document_frequency
+        if increments:
+            indices = np.fromiter(increments.keys(), dtype=np.int64, count=len(increments))
+            counts = np.fromiter(increments.values(), dtype=np.int64, count=len(increments))
+            document_frequency[indices] += counts
+
+        return CorpusIdfModel(terms, document_frequency, self.n_documents + n_new)
+
+    def save(self, path):
+        """
+        Сохраняет модель новой версией в каталоге path и атомарно переключает указатель CURRENT.
+        Возвращает имя сохраненной версии.
+        """
+        os.makedirs(path, exist_ok=True)
+        version = f"v{time.time_ns()}"
+        version_dir = os.path.join(path, version)
+        os.makedirs(version_dir)
+
+        np.save(os.path.join(version_dir, 'idf.npy'), np.asarray(self.idf, dtype=np.float64))
+        np.save(os.path.join(version_dir, 'document_frequency.npy'), np.asarray(self.document_frequency, dtype=np.int64))
+        with open(os.path.join(version_dir, 'terms.json'), 'w', encoding='utf8') as f:
+            json.dump(self.terms, f, ensure_ascii=False)
+        with open(os.path.join(version_dir, 'meta.json'), 'w', encoding='utf8') as f:
+            json.dump({'n_documents': int(self.n_documents), 'n_terms': len(self.terms)}, f)
+
+        pointer_tmp = os.path.join(path, f"{CURRENT_POINTER}.{os.getpid()}.tmp")
+        with open(pointer_tmp, 'w', encoding='utf8') as f:
+            f.write(version)
+        os.replace(pointer_tmp, os.path.join(path, CURRENT_POINTER))
+
+        self._prune_versions(path, version)
+        self.version = version
+        return version
+
+    @staticmethod
+    def _prune_versions(path, current_version):
+        versions = sorted(
+            name for name in os.listdir(path)
+            if name.startswith('v') and os.path.isdir(os.path.join(path, name))
+        )
+        for name in versions[:-KEEP_VERSIONS]:
+            if name != current_version:
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загружает текущую версию модели. Массивы открываются через mmap только для чтения,
+        так что страницы с весами разделяются между всеми процессами на узле.
+        """
+        with open(os.path.join(path, CURRENT_POINTER), encoding='utf8') as f:
+            version = f.read().strip()
+        version_dir = os.path.join(path, version)
+
+        with open(os.path.join(version_dir, 'terms.json'), encoding='utf8') as f:
+            terms = json.load(f)
+        with open(os.path.join(version_dir, 'meta.json'), encoding='utf8') as f:
+            meta = json.load(f)
+
+        idf = np.load(os.path.join(version_dir, 'idf.npy'), mmap_mode='r')
+        document_frequency = np.load(os.path.join(version_dir, 'document_frequency.npy'), mmap_mode='r')
+        if len(terms) != len(idf) or len(idf) != meta['n_terms']:
+            raise ValueError(f"Corrupted IDF model version {version} in {path}")
+
+        return cls(terms, document_frequency, meta['n_documents'], idf=idf, version=version)
+
+    def __repr__(self):
+        return f'<CorpusIdfModel {self.version} terms={len(self.terms)} docs={self.n_documents}>'
@@ -0,0 +1,421 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import functools
+from datetime import datetime, timedelta
+from extensions import db
+from models import JobResource, RoleFocus, JobPosting, JobNotification, IngestionCursor, ingestion_cursor_postings
+from job_providers import get_adapter
+from fulltext_index import get_fulltext_index
+from inverted_index import PostingInvertedIndex
+from dedup import NearDuplicateFilter, job_signature, to_signed64, from_signed64
+from percolator import get_profile_matrix
+from idf_model import CURRENT_POINTER
+from text_normalizer import normalize_tokens
+from search_fanout import FanOutReport, STATUS_OK, STATUS_FAILED, get_executor, iter_fan_out
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query_part(value):
+    """Параметры запроса хранятся и сравниваются без учета регистра и лишних пробелов."""
+    return ' '.join(str(value or '').casefold().split())
+
+
+def posting_content_hash(job):
+    content = [job.get(field) for field in ('title', 'company', 'location', 'salary', 'link', 'description')]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+# Служебная роль RoleFocus для ручного набора навыков - по ней нечего искать во внешних ресурсах
+MANUAL_SKILL_SET_ROLE = 'Manual Skill Set'
+
+
+def ingestion_targets(default_locations):
+    """
+    Уникальные комбинации (роль, локация, уровень) из RoleFocus для фоновой загрузки.
+    Локация берется из focused_skills_data (Слепой поиск), иначе - из default_locations.
+    """
+    rows = db.session.query(RoleFocus.target_role, RoleFocus.target_level, RoleFocus.focused_skills_data).filter(
+        RoleFocus.target_role != MANUAL_SKILL_SET_ROLE
+    ).all()
+    targets = set()
+    for role, level, focused_skills_data in rows:
+        location = json.loads(focused_skills_data).get('location') if focused_skills_data else None
+        for target_location in ([location] if location else default_locations or ['']):
+            targets.add((normalize_query_part(role), normalize_query_part(target_location), normalize_query_part(level)))
+    return sorted(targets)
+
+
+def get_cursor(resource_id, term, location, level):
+    """Курсор загрузки для ресурса и нормализованных параметров (создается при первом прогоне)."""
+    cursor = IngestionCursor.query.filter_by(
+        resource_id=resource_id, search_term=term, location=location, level=level
+    ).first()
+    if cursor is None:
+        cursor = IngestionCursor(resource_id=resource_id, search_term=term, location=location, level=level)
+        db.session.add(cursor)
+        db.session.flush()
+    return cursor
+
+
+def find_fresh_cursor(resource_id, term, location, level, max_age_seconds):
+    """Курсор, успешно загруженный не раньше max_age_seconds назад, или None."""
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    return IngestionCursor.query.filter(
+        IngestionCursor.resource_id == resource_id,
+        IngestionCursor.search_term == normalize_query_part(term)[:100],
+        IngestionCursor.location == normalize_query_part(location)[:100],
+        IngestionCursor.level == normalize_query_part(level)[:50],
+        IngestionCursor.last_run_at >= cutoff
+    ).first()
+
+
+def local_postings(cursor, source, posting_ttl_days, max_candidates):
+    """Свежие вакансии, загруженные по запросу курсора, в формате адаптеров ресурсов."""
+    cutoff = datetime.utcnow() - timedelta(days=posting_ttl_days)
+    postings = (
+        JobPosting.query
+        .join(ingestion_cursor_postings, ingestion_cursor_postings.c.posting_id == JobPosting.id)
+        .filter(ingestion_cursor_postings.c.cursor_id == cursor.id, JobPosting.last_seen >= cutoff)
+        .order_by(JobPosting.last_seen.desc())
+        .limit(max_candidates)
+        .all()
+    )
+    return [posting.to_job_dict(source) for posting in postings]
+
+
+def resource_ingested_since(resource_id, max_age_seconds):
+    """Была ли по ресурсу хотя бы одна успешная фоновая загрузка за последние max_age_seconds."""
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    return db.session.query(
+        IngestionCursor.query.filter(
+            IngestionCursor.resource_id == resource_id, IngestionCursor.last_run_at >= cutoff
+        ).exists()
+    ).scalar()
+
+
+def fulltext_postings(resource, term, location, posting_ttl_days, max_candidates):
+    """
+    Вакансии ресурса по полнотекстовому индексу (для запросов без собственного курсора загрузки),
+    в порядке убывания текстового ранга. None, если индекс для этой БД не поддерживается.
+    """
+    index = get_fulltext_index(db.engine)
+    if index is None:
+        return None
+    ranked_ids = index.candidate_ids(
+        term, max_candidates, resource_id=resource.id, location=location,
+        seen_since=datetime.utcnow() - timedelta(days=posting_ttl_days)
+    )
+    postings = {posting.id: posting for posting in JobPosting.query.filter(JobPosting.id.in_([i for i, _ in ranked_ids]))}
+    return [postings[posting_id].to_job_dict(resource.name) for posting_id, _ in ranked_ids if posting_id in postings]
+
+
+def _truncate(value, size):
+    return value[:size] if isinstance(value, str) else value
+
+
+def load_duplicate_filter(posting_ttl_days):
+    """LSH-индекс подписей свежих вакансий, которые сами не являются копиями (dedup.NearDuplicateFilter)."""
+    cutoff = datetime.utcnow() - timedelta(days=posting_ttl_days)
+    duplicates = NearDuplicateFilter()
+    rows = db.session.query(JobPosting.id, JobPosting.simhash, JobPosting.location).filter(
+        JobPosting.last_seen >= cutoff, JobPosting.duplicate_of_id.is_(None), JobPosting.simhash.isnot(None)
+    ).order_by(JobPosting.id)
+    for posting_id, signature, location in rows.yield_per(5000):
+        if signature:
+            duplicates.add(from_signed64(signature), posting_id, location)
+    return duplicates
+
+
+def mark_duplicates(postings, duplicates):
+    """
+    Считает подписи добавленных и измененных вакансий и отмечает почти одинаковые копии
+    уже известных в той же локации (duplicate_of_id). Оригиналом остается вакансия с меньшим id.
+    """
+    for posting in sorted(postings, key=lambda posting: posting.id):
+        signature = job_signature({'title': posting.title, 'description': posting.description})
+        posting.simhash = to_signed64(signature)
+        original_id = duplicates.find(signature, posting.location) if signature else None
+        if original_id is not None and original_id != posting.id:
+            posting.duplicate_of_id = original_id
+            duplicates.duplicates += 1
+            continue
+        posting.duplicate_of_id = None
+        if signature and original_id is None:
+            duplicates.add(signature, posting.id, posting.location)
+            duplicates.accepted += 1
+
+
+def rebuild_duplicates(posting_ttl_days, batch_size=1000):
+    """
+    Заново считает подписи всех свежих вакансий и отметки копий (после миграции,
+    изменения порога dedup.MAX_DISTANCE или состава подписи). Возвращает (вакансий, копий).
+    """
+    cutoff = datetime.utcnow() - timedelta(days=posting_ttl_days)
+    duplicates = NearDuplicateFilter()
+    posting_ids = [
+        posting_id for posting_id, in
+        db.session.query(JobPosting.id).filter(JobPosting.last_seen >= cutoff).order_by(JobPosting.id)
+    ]
+    for start in range(0, len(posting_ids), batch_size):
+        mark_duplicates(
+            JobPosting.query.filter(JobPosting.id.in_(posting_ids[start:start + batch_size])).all(), duplicates
+        )
+        db.session.commit()
+    return len(posting_ids), duplicates.duplicates
+
+
+def upsert_postings(resource_id, cursor_id, jobs, seen_at, changed_ids=None, new_ids=None, duplicates=None):
+    """
+    Добавляет новые вакансии, обновляет изменившиеся (по хэшу содержимого) и отмечает
+    время последней встречи у остальных. Возвращает (добавлено, обновлено, без изменений);
+    id добавленных и обновленных вакансий дописываются в changed_ids, только добавленных - в new_ids.
+    Если передан duplicates (load_duplicate_filter), у измененных вакансий ищутся копии.
+    """
+    # Одна и та же вакансия может прийти на нескольких страницах - берем последнюю версию
+    by_external_id = {job['id']: job for job in jobs if job.get('id')}
+    if not by_external_id:
+        return 0, 0, 0
+
+    existing = {
+        posting.external_id: posting
+        for posting in JobPosting.query.filter(
+            JobPosting.resource_id == resource_id,
+            JobPosting.external_id.in_(list(by_external_id))
+        )
+    }
+
+    inserted = updated = unchanged = 0
+    postings = []
+    changed = []
+    created = []
+    for external_id, job in by_external_id.items():
+        content_hash = posting_content_hash(job)
+        posting = existing.get(external_id)
+        if posting is None:
+            posting = JobPosting(resource_id=resource_id, external_id=external_id[:255])
+            db.session.add(posting)
+            created.append(posting)
+            inserted += 1
+        elif posting.content_hash == content_hash:
+            posting.last_seen = seen_at
+            unchanged += 1
+            postings.append(posting)
+            continue
+        else:
+            updated += 1
+
+        posting.title = _truncate(job.get('title'), 255)
+        posting.company = _truncate(job.get('company'), 255)
+        posting.location = _truncate(job.get('location'), 255)
+        posting.salary = _truncate(job.get('salary'), 100)
+        posting.link = job.get('link')
+        posting.description = job.get('description')
+        posting.content_hash = content_hash
+        posting.last_seen = seen_at
+        postings.append(posting)
+        changed.append(posting)
+
+    db.session.flush()
+    if duplicates is not None:
+        mark_duplicates(changed, duplicates)
+    if changed_ids is not None:
+        changed_ids.update(posting.id for posting in changed)
+    if new_ids is not None:
+        new_ids.update(posting.id for posting in created)
+
+    # Связь вакансий с запросом курсора (только недостающие пары)
+    posting_ids = [posting.id for posting in postings]
+    linked = {
+        row.posting_id for row in db.session.execute(
+            db.select(ingestion_cursor_postings.c.posting_id).where(
+                ingestion_cursor_postings.c.cursor_id == cursor_id,
+                ingestion_cursor_postings.c.posting_id.in_(posting_ids)
+            )
+        )
+    }
+    new_links = [{'cursor_id': cursor_id, 'posting_id': posting_id} for posting_id in posting_ids if posting_id not in linked]
+    if new_links:
+        db.session.execute(ingestion_cursor_postings.insert(), new_links)
+
+    return inserted, updated, unchanged
+
+
+def posting_tokens(posting):
+    """Токены вакансии - тот же текст (title + description), что скорит ai_matcher."""
+    return normalize_tokens((posting.title or '') + ' ' + (posting.description or ''))[1]
+
+
+def rebuild_posting_index(path, posting_ttl_days):
+    """Строит инвертированный индекс с нуля по всем свежим вакансиям (кроме копий) и сохраняет новую версию."""
+    cutoff = datetime.utcnow() - timedelta(days=posting_ttl_days)
+    documents = {
+        posting.id: posting_tokens(posting)
+        for posting in JobPosting.query.filter(
+            JobPosting.last_seen >= cutoff, JobPosting.duplicate_of_id.is_(None)
+        ).yield_per(1000)
+    }
+    index = PostingInvertedIndex.build(documents)
+    index.save(path)
+    return index
+
+
+def update_posting_index(path, changed_ids, posting_ttl_days, max_idf_drift):
+    """
+    Инкрементальное обновление инвертированного индекса: пересчитываются только добавленные
+    и измененные вакансии, ставшие копиями - удаляются. Если индекса еще нет или с расчета IDF
+    изменилось больше max_idf_drift вакансий корпуса, индекс строится с нуля (с новым IDF).
+    """
+    if not os.path.exists(os.path.join(path, CURRENT_POINTER)):
+        return rebuild_posting_index(path, posting_ttl_days)
+    if not changed_ids:
+        return None
+    documents = {
+        posting.id: posting_tokens(posting) if posting.duplicate_of_id is None else None
+        for posting in JobPosting.query.filter(JobPosting.id.in_(list(changed_ids)))
+    }
+    index = PostingInvertedIndex.load(path).update(documents)
+    if index.idf_drift > max_idf_drift:
+        logger.info(f"Posting index IDF drift {index.idf_drift:.2f} exceeds {max_idf_drift}, rebuilding")
+        return rebuild_posting_index(path, posting_ttl_days)
+    index.save(path)
+    return index
+
+
+def notify_new_postings(posting_ids, min_score, batch_size=1000):
+    """
+    Обратный матчинг: каждый пакет новых вакансий скорится по всем профилям одним
+    разреженным произведением (percolator.ProfileMatrix), совпадения с баллом не ниже
+    min_score записываются в JobNotification. Возвращает число созданных уведомлений.
+    """
+    if not posting_ids:
+        return 0
+    matrix = get_profile_matrix()
+    if not len(matrix):
+        return 0
+
+    created = 0
+    posting_ids = sorted(posting_ids)
+    for start in range(0, len(posting_ids), batch_size):
+        postings = JobPosting.query.filter(
+            JobPosting.id.in_(posting_ids[start:start + batch_size]), JobPosting.duplicate_of_id.is_(None)
+        ).all()
+        if not postings:
+            continue
+        jobs = [{'title': posting.title, 'description': posting.description} for posting in postings]
+        now = datetime.utcnow()
+        rows = [
+            {'user_id': user_id, 'posting_id': postings[row].id, 'relevance_score': score, 'is_read': False, 'date_created': now}
+            for row, _, user_id, score in matrix.match(jobs, min_score)
+        ]
+        if rows:
+            db.session.execute(JobNotification.__table__.insert(), rows)
+            db.session.commit()
+            created += len(rows)
+    return created
+
+
+def run_ingestion(config):
+    """
+    Один прогон фоновой загрузки: все активные ресурсы x все комбинации роль/локация/уровень.
+    Страницы запрашиваются параллельно (с лимитами адаптеров), запись в БД - в текущем потоке.
+    Курсор продвигается, только если ресурс ответил на все его страницы: иначе вакансии
+    непрочитанных страниц не попали бы и в следующий инкрементальный прогон.
+    Не реже INGESTION_FULL_REFRESH_SECONDS курсор загружается целиком (без since):
+    инкрементальная загрузка не обновляет last_seen еще живых вакансий, и они устарели бы.
+    Возвращает сводку прогона.
+    """
+    started_at = datetime.utcnow()
+    resources = JobResource.query.filter_by(is_active=True).all()
+    targets = ingestion_targets(config['INGESTION_LOCATIONS'])
+
+    full_refresh_before = started_at - timedelta(seconds=config['INGESTION_FULL_REFRESH_SECONDS'])
+    deadline = time.monotonic() + config['INGESTION_DEADLINE_SECONDS']
+    cursors = {}
+    full_refresh = set()
+    tasks = []
+    for resource in resources:
+        adapter = get_adapter(resource)
+        if adapter is None:
+            logger.warning(f"Ingestion: no adapter for resource {resource.name}, skipped")
+            continue
+        for term, location, level in targets:
+            cursor = get_cursor(resource.id, term[:100], location[:100], level[:50])
+            cursor_name = (resource.id, cursor.id)
+            cursors[cursor_name] = cursor
+            since = cursor.last_run_at
+            if cursor.last_full_run_at is None or cursor.last_full_run_at < full_refresh_before:
+                full_refresh.add(cursor_name)
+                since = None
+            # Отдельное имя задачи на страницу: итог курсора складывается из итогов всех его страниц
+            for page in range(1, adapter.page_depth(config['INGESTION_PAGE_DEPTH']) + 1):
+                tasks.append(((resource.id, cursor.id, page), functools.partial(
+                    adapter.search_page, term, location, level, config['PROVIDER_TIMEOUT_SECONDS'],
+                    page=page, since=since, cached=False, deadline=deadline
+                )))
+    db.session.commit()
+
+    summary = {
+        'targets': len(cursors), 'full_refresh': len(full_refresh), 'pages': len(tasks),
+        'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': 0
+    }
+    changed_ids = set()
+    new_ids = set()
+    # Копии ищутся и среди вакансий прошлых прогонов (подписи хранятся в JobPosting.simhash)
+    duplicates = load_duplicate_filter(config['SEARCH_LOCAL_POSTING_TTL_DAYS'])
+    received = {name: 0 for name in cursors}
+    report = FanOutReport([name for name, _ in tasks])
+    fan_out = iter_fan_out(
+        tasks, get_executor(config['SEARCH_FANOUT_WORKERS']), config['INGESTION_DEADLINE_SECONDS'], report,
+        max_in_flight=config['INGESTION_CONCURRENCY']
+    )
+    for (resource_id, cursor_id, _), jobs in fan_out:
+        inserted, updated, unchanged = upsert_postings(
+            resource_id, cursor_id, jobs, started_at, changed_ids, new_ids, duplicates
+        )
+        db.session.commit()
+        received[(resource_id, cursor_id)] += len(jobs)
+        summary['inserted'] += inserted
+        summary['updated'] += updated
+        summary['unchanged'] += unchanged
+
+    page_results = {name: [] for name in cursors}
+    for (resource_id, cursor_id, page), status in report.statuses.items():
+        page_results[(resource_id, cursor_id)].append((page, status, report.errors.get((resource_id, cursor_id, page))))
+
+    for name, cursor in cursors.items():
+        cursor.postings_seen = (cursor.postings_seen or 0) + received[name]
+        failed_pages = sorted((page, status, error) for page, status, error in page_results[name] if status != STATUS_OK)
+        if not failed_pages:
+            cursor.last_status = STATUS_OK
+            cursor.last_error = None
+            # Следующий прогон запросит только вакансии, появившиеся после начала этого
+            cursor.last_run_at = started_at
+            if name in full_refresh:
+                cursor.last_full_run_at = started_at
+            continue
+        # since не меняется: непрочитанные страницы будут запрошены заново
+        statuses = {status for _, status, _ in failed_pages}
+        cursor.last_status = STATUS_FAILED if STATUS_FAILED in statuses else failed_pages[0][1]
+        page, _, error = failed_pages[0]
+        cursor.last_error = f"page {page}: {error}" if error else f"page {page}"
+        summary['failed'] += 1
+    summary['duplicates'] = duplicates.duplicates
+    db.session.commit()
+
+    # Инвертированный индекс для /api/recommendations: только измененные вакансии
+    index = update_posting_index(
+        config['POSTING_INDEX_PATH'], changed_ids, config['SEARCH_LOCAL_POSTING_TTL_DAYS'],
+        config['POSTING_INDEX_MAX_IDF_DRIFT']
+    )
+    summary['index_version'] = index.version if index is not None else None
+    summary['index_idf_drift'] = round(index.idf_drift, 4) if index is not None else None
+    # Уведомления пользователям о новых подходящих вакансиях
+    summary['notifications'] = notify_new_postings(new_ids, config['NOTIFICATION_MIN_SCORE'])
+
+    summary['duration_seconds'] = round((datetime.utcnow() - started_at).total_seconds(), 3)
+    logger.info(f"Ingestion run finished: {summary}")
+    return summary
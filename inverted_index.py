@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter
+import numpy as np
+from idf_model import CorpusIdfModel, CURRENT_POINTER
+
+logger = logging.getLogger(__name__)
+
+
+class PostingInvertedIndex:
+    """
+    Инвертированный индекс "термин -> вакансии" с предрасчитанными весами TF-IDF.
+
+    Вес термина в вакансии - tf * idf, нормированный по длине вектора вакансии (L2),
+    поэтому скалярное произведение с нормированным вектором профиля - это косинусное сходство.
+    top_k читает только списки терминов профиля и суммирует их одним векторизованным проходом.
+
+    Индекс неизменяемый, как и CorpusIdfModel: update() возвращает новый индекс,
+    где пересчитаны только измененные вакансии, а save() пишет новую версию на диск.
+    IDF фиксируется при build(); новые термины получают IDF неизвестного слова. Насколько
+    корпус ушел от того, по которому считался IDF, показывает idf_drift (доля вакансий,
+    добавленных, измененных или удаленных после build) - по нему индекс перестраивается целиком.
+    """
+
+    def __init__(self, terms, idf, offsets, doc_ids, weights, n_documents, version=None,
+                 idf_documents=None, changed_documents=0):
+        self.terms = terms
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        self.idf = idf
+        # Списки вакансий термина i: doc_ids[offsets[i]:offsets[i + 1]] (по возрастанию id)
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.n_documents = n_documents
+        self.version = version
+        # Число вакансий, по которым считался IDF, и сколько вакансий изменилось с тех пор
+        self.idf_documents = n_documents if idf_documents is None else idf_documents
+        self.changed_documents = changed_documents
+
+    @classmethod
+    def build(cls, documents):
+        """Строит индекс с нуля по словарю {id вакансии: токены}; IDF считается по этим же вакансиям."""
+        idf_model = CorpusIdfModel.build(documents.values())
+        empty = cls(
+            list(idf_model.terms), np.asarray(idf_model.idf, dtype=np.float32),
+            np.zeros(len(idf_model.terms) + 1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.float32), 0
+        )
+        index = empty.update(documents)
+        index.idf_documents = index.n_documents
+        index.changed_documents = 0
+        return index
+
+    @property
+    def oov_idf(self):
+        return float(np.log(1 + self.n_documents) + 1)
+
+    @property
+    def idf_drift(self):
+        """Доля вакансий, измененных после расчета IDF, относительно корпуса расчета."""
+        return self.changed_documents / max(self.idf_documents, 1)
+
+    def update(self, documents):
+        """
+        Новый индекс, в котором вакансии из documents ({id: токены}) добавлены или заменены.
+        Пустой список токенов (или None) удаляет вакансию из индекса.
+        """
+        terms = list(self.terms)
+        vocabulary = dict(self.vocabulary)
+        idf = self.idf.tolist()
+        oov_idf = self.oov_idf
+
+        new_terms, new_docs, new_weights = [], [], []
+        for doc_id, tokens in documents.items():
+            counts = Counter(tokens or ())
+            if not counts:
+                continue
+            row = []
+            for term, count in counts.items():
+                index = vocabulary.get(term)
+                if index is None:
+                    index = vocabulary[term] = len(terms)
+                    terms.append(term)
+                    idf.append(oov_idf)
+                row.append((index, count * idf[index]))
+            norm = sum(weight * weight for _, weight in row) ** 0.5
+            for index, weight in row:
+                new_terms.append(index)
+                new_docs.append(doc_id)
+                new_weights.append(weight / norm)
+
+        idf = np.asarray(idf, dtype=np.float32)
+
+        # Старые записи измененных и удаленных вакансий отбрасываются, новые - добавляются
+        old_terms = np.repeat(np.arange(len(self.terms), dtype=np.int64), np.diff(self.offsets))
+        old_docs = np.asarray(self.doc_ids, dtype=np.int32)
+        keep = ~np.isin(old_docs, np.fromiter(documents.keys(), dtype=np.int32, count=len(documents)))
+        all_terms = np.concatenate([old_terms[keep], np.asarray(new_terms, dtype=np.int64)])
+        all_docs = np.concatenate([old_docs[keep], np.asarray(new_docs, dtype=np.int32)])
+        all_weights = np.concatenate([np.asarray(self.weights, dtype=np.float32)[keep], np.asarray(new_weights, dtype=np.float32)])
+
+        order = np.lexsort((all_docs, all_terms))
+        all_terms, all_docs, all_weights = all_terms[order], all_docs[order], all_weights[order]
+
+        counts = np.bincount(all_terms, minlength=len(terms))
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return PostingInvertedIndex(
+            terms, idf, offsets, all_docs, all_weights, int(len(np.unique(all_docs))),
+            idf_documents=self.idf_documents, changed_documents=self.changed_documents + len(documents)
+        )
+
+    def _query_terms(self, query_tokens):
+        """Термины профиля из словаря индекса: (вес в нормированном векторе профиля, номер термина)."""
+        counts = Counter(query_tokens)
+        if not counts:
+            return []
+        oov_idf = self.oov_idf
+        weights = {}
+        norm = 0.0
+        for term, count in counts.items():
+            index = self.vocabulary.get(term)
+            weight = count * (float(self.idf[index]) if index is not None else oov_idf)
+            norm += weight * weight
+            if index is not None:
+                weights[index] = weight
+        norm = norm ** 0.5
+        return [(weight / norm, index) for index, weight in weights.items()]
+
+    def top_k(self, query_tokens, k, stats=None):
+        """
+        K вакансий с наибольшим косинусным сходством с профилем: список (id, балл 0..100).
+
+        Списки терминов профиля склеиваются, id вакансий сжимаются через np.unique
+        (return_inverse) и баллы суммируются np.bincount по сжатым индексам, поэтому
+        память и время зависят от числа постингов запроса, а не от наибольшего id вакансии.
+        K лучших выбираются через argpartition. На корпусах 20-100 тыс. вакансий
+        (benchmarks/bench_inverted_index.py) это быстрее отсечения MaxScore:
+        профиль содержит мало терминов, и поштучные проверки стоят дороже полного прохода.
+        """
+        doc_ids, scores = [], []
+        for query_weight, index in self._query_terms(query_tokens):
+            start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+            if start < end:
+                doc_ids.append(self.doc_ids[start:end])
+                scores.append(self.weights[start:end] * np.float32(query_weight))
+        if not doc_ids or k <= 0:
+            return []
+
+        all_docs = np.concatenate(doc_ids)
+        unique_ids, inverse = np.unique(all_docs, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores), minlength=len(unique_ids))
+        candidates = np.flatnonzero(totals)
+        if stats is not None:
+            stats['scored'] = int(len(candidates))
+            stats['postings'] = int(len(all_docs))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-totals[candidates], k - 1)[:k]]
+
+        # По убыванию балла, при равенстве - по возрастанию id
+        candidate_ids = unique_ids[candidates]
+        candidate_scores = totals[candidates]
+        order = np.lexsort((candidate_ids, -candidate_scores))
+        return [(int(candidate_ids[i]), round(float(candidate_scores[i]) * 100, 2)) for i in order]
+
+    def save(self, path):
+        """Сохраняет индекс новой версией в каталоге path (как CorpusIdfModel.save)."""
+        os.makedirs(path, exist_ok=True)
+        version = f"v{time.time_ns()}"
+        version_dir = os.path.join(path, version)
+        os.makedirs(version_dir)
+
+        for name in ('idf', 'offsets', 'doc_ids', 'weights'):
+            np.save(os.path.join(version_dir, f'{name}.npy'), np.asarray(getattr(self, name)))
+        with open(os.path.join(version_dir, 'terms.json'), 'w', encoding='utf8') as f:
+            json.dump(self.terms, f, ensure_ascii=False)
+        with open(os.path.join(version_dir, 'meta.json'), 'w', encoding='utf8') as f:
+            json.dump({
+                'n_documents': self.n_documents, 'n_terms': len(self.terms), 'n_postings': len(self.doc_ids),
+                'idf_documents': self.idf_documents, 'changed_documents': self.changed_documents,
+            }, f)
+
+        pointer_tmp = os.path.join(path, f"{CURRENT_POINTER}.{os.getpid()}.tmp")
+        with open(pointer_tmp, 'w', encoding='utf8') as f:
+            f.write(version)
+        os.replace(pointer_tmp, os.path.join(path, CURRENT_POINTER))
+
+        CorpusIdfModel._prune_versions(path, version)
+        self.version = version
+        return version
+
+    @classmethod
+    def load(cls, path):
+        """Загружает текущую версию индекса; массивы открываются через mmap только для чтения."""
+        with open(os.path.join(path, CURRENT_POINTER), encoding='utf8') as f:
+            version = f.read().strip()
+        version_dir = os.path.join(path, version)
+
+        with open(os.path.join(version_dir, 'terms.json'), encoding='utf8') as f:
+            terms = json.load(f)
+        with open(os.path.join(version_dir, 'meta.json'), encoding='utf8') as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(version_dir, f'{name}.npy'), mmap_mode='r')
+            for name in ('idf', 'offsets', 'doc_ids', 'weights')
+        }
+        if len(terms) != meta['n_terms'] or len(arrays['offsets']) != len(terms) + 1 \
+                or len(arrays['doc_ids']) != meta['n_postings']:
+            raise ValueError(f"Corrupted posting index version {version} in {path}")
+
+        # Версии без счетчиков дрейфа считаются только что построенными
+        return cls(
+            terms, n_documents=meta['n_documents'], version=version,
+            idf_documents=meta.get('idf_documents'), changed_documents=meta.get('changed_documents', 0), **arrays
+        )
+
+    def __repr__(self):
+        return (
+            f'<PostingInvertedIndex {self.version} terms={len(self.terms)} docs={self.n_documents} '
+            f'idf_drift={self.idf_drift:.2f}>'
+        )
+
+
+# Сколько секунд воркер использует загруженную версию, прежде чем проверить указатель CURRENT
+RELOAD_CHECK_SECONDS = 30
+
+_index = None
+_index_path = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def init_posting_index(path):
+    """Задает каталог индекса процесса; сама загрузка - при первом обращении (get_posting_index)."""
+    global _index, _index_path, _checked_at
+    with _index_lock:
+        _index, _index_path, _checked_at = None, path, 0.0
+
+
+def get_posting_index():
+    """
+    Индекс процесса или None, если он еще не построен. Новая версия, сохраненная процессом
+    фоновой загрузки, подхватывается не позже чем через RELOAD_CHECK_SECONDS.
+    """
+    global _index, _checked_at
+    if _index_path is None:
+        return None
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _index
+    with _index_lock:
+        if _index is not None and now - _checked_at < RELOAD_CHECK_SECONDS:
+            return _index
+        _checked_at = now
+        pointer = os.path.join(_index_path, CURRENT_POINTER)
+        if not os.path.exists(pointer):
+            return _index
+        with open(pointer, encoding='utf8') as f:
+            version = f.read().strip()
+        if _index is None or _index.version != version:
+            try:
+                _index = PostingInvertedIndex.load(_index_path)
+                logger.info(f"Loaded posting index: {_index}")
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load posting index from {_index_path}: {e}")
+        return _index
@@ -0,0 +1,380 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+import functools
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+from http_client import get_http_client
+from provider_cache import get_provider_cache, make_cache_key
+from rate_limit import TokenBucket
+from singleflight import provider_single_flight
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+JOOBLE_API_KEY = os.getenv("JOOBLE_API_KEY")
+
+
+def mask_secrets(text):
+    """Заменяет API-ключ ресурса в тексте на *** (ключ Jooble - часть URL, а URL попадает в ошибки requests)."""
+    if JOOBLE_API_KEY and text:
+        return text.replace(JOOBLE_API_KEY, '***')
+    return text
+
+
+class SecretMaskFilter(logging.Filter):
+    """Фильтр обработчиков логов: API-ключи не попадают ни в сообщения, ни в трассировки исключений."""
+
+    def filter(self, record):
+        if not JOOBLE_API_KEY:
+            return True
+        message = record.getMessage()
+        if JOOBLE_API_KEY in message:
+            record.msg, record.args = mask_secrets(message), None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        if record.exc_text:
+            record.exc_text = mask_secrets(record.exc_text)
+        return True
+
+
+class ProviderError(Exception):
+    """Ошибка внешнего ресурса вакансий (конфигурация, HTTP, формат ответа)."""
+
+
+class ProviderRateLimited(ProviderError):
+    """Лимит запросов или одновременных вызовов ресурса исчерпан в пределах таймаута."""
+
+
+def resource_snapshot(resource):
+    """
+    Копия нужных полей JobResource в виде словаря: запросы к ресурсам выполняются
+    в фоновых потоках, где ORM-объекты текущей сессии использовать нельзя.
+    """
+    return {
+        'id': resource.id,
+        'name': resource.name,
+        'base_url': resource.base_url,
+        'adapter': resource.adapter,
+        'settings': resource.settings,
+    }
+
+
+def fetch_shared(cache_key, fetch, deadline=None):
+    """
+    Ответ ресурса из кэша (память процесса + общий SQLite); при промахе одинаковые
+    одновременные запросы объединяются: fetch() выполняет только первый поток,
+    остальные получают его результат, но ждут не дольше дедлайна (TimeoutError).
+    """
+    cache = get_provider_cache()
+    value = cache.get(cache_key) if cache.ttl > 0 else None
+    if value is None:
+        def fetch_and_put():
+            # Кэш уже проверен выше: повторный get лишь удвоил бы промах и чтение SQLite
+            result = fetch()
+            if cache.ttl > 0:
+                cache.put(cache_key, result)
+            return result
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        value = provider_single_flight.do(cache_key, fetch_and_put, timeout=timeout)
+    return value
+
+
+class JobProviderAdapter(ABC):
+    """
+    Базовый адаптер внешнего ресурса вакансий.
+
+    Каждый адаптер объявляет собственный лимит одновременных запросов и token bucket
+    (запросов в секунду), поэтому нагрузка на один ресурс не съедает квоту другого.
+    Значения по умолчанию можно переопределить в JobResource.settings (JSON):
+    max_concurrency, rate_per_second, burst, page_depth.
+    """
+
+    # Значение JobResource.adapter и ключ в PROVIDER_ADAPTERS; задается каждым адаптером
+    adapter_name = None
+    max_concurrency = 4
+    rate_per_second = 5.0
+    burst = 10
+    # Поддерживает ли ресурс постраничную выборку (страницы 1..page_depth запрашиваются параллельно)
+    paginated = False
+    # Можно ли кэшировать и объединять одинаковые ответы ресурса
+    cacheable = True
+
+    def __init__(self, resource, settings, key=None):
+        self.resource = resource
+        self.settings = settings
+        # Снимок (id, adapter, base_url, settings) ресурса: по нему get_adapter видит изменения
+        self.key = key
+        self.max_concurrency = int(settings.get('max_concurrency', self.max_concurrency))
+        self.rate_per_second = float(settings.get('rate_per_second', self.rate_per_second))
+        self.burst = int(settings.get('burst', self.burst))
+        self._concurrency = threading.BoundedSemaphore(self.max_concurrency)
+        self._bucket = TokenBucket(self.rate_per_second, self.burst)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.upstream_calls = 0
+
+    @property
+    def name(self):
+        return self.resource['name']
+
+    def page_depth(self, default_depth):
+        if not self.paginated:
+            return 1
+        return int(self.settings.get('page_depth', default_depth))
+
+    def search_page(self, term, location, level, timeout, page=1, since=None, cached=True, deadline=None):
+        """
+        Одна страница результатов ресурса в общем формате вакансий.
+        since - только вакансии, созданные не раньше этой даты (если ресурс это поддерживает);
+        cached=False - запрос мимо кэша ответов (фоновая загрузка вакансий);
+        deadline - момент time.monotonic(), после которого ожидание и повторы прекращаются.
+        """
+        keywords, request_data = self.build_request(term, location, level, page, since)
+        fetch = functools.partial(self._limited_fetch, request_data, timeout, deadline)
+        if cached and since is None and self.cacheable:
+            data = fetch_shared(make_cache_key(self.name, keywords, location, page), fetch, deadline)
+        else:
+            data = fetch()
+        return self.normalize_jobs(data)
+
+    def _limited_fetch(self, request_data, timeout, deadline=None):
+        """Вызов ресурса с учетом лимита одновременных запросов и token bucket."""
+        started = time.monotonic()
+        if deadline is not None:
+            # Очередь к лимитам тоже не дольше дедлайна
+            timeout = max(0, min(timeout, deadline - started))
+        if not self._concurrency.acquire(timeout=timeout):
+            raise ProviderRateLimited(f"{self.name}: concurrency limit of {self.max_concurrency} reached")
+        try:
+            if not self._bucket.acquire(timeout=max(0, timeout - (time.monotonic() - started))):
+                raise ProviderRateLimited(f"{self.name}: rate limit of {self.rate_per_second}/s reached")
+            with self._lock:
+                self.in_flight += 1
+                self.upstream_calls += 1
+            try:
+                return self.fetch(request_data, timeout, deadline)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+        finally:
+            self._concurrency.release()
+
+    @abstractmethod
+    def build_request(self, term, location, level, page, since=None):
+        """Возвращает (ключевые слова для ключа кэша, данные запроса к ресурсу)."""
+
+    @abstractmethod
+    def fetch(self, request_data, timeout, deadline=None):
+        """Сам вызов ресурса; возвращает сырой ответ (JSON-совместимый, он кэшируется)."""
+
+    @abstractmethod
+    def normalize_jobs(self, data):
+        """Приводит сырой ответ ресурса к списку вакансий общего формата."""
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'adapter': self.adapter_name,
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self.in_flight,
+                'upstream_calls': self.upstream_calls,
+            }
+        stats['rate_limit'] = self._bucket.stats()
+        return stats
+
+
+class JoobleAdapter(JobProviderAdapter):
+    adapter_name = 'jooble'
+    max_concurrency = 8
+    rate_per_second = 10.0
+    burst = 20
+    paginated = True
+
+    def build_request(self, term, location, level, page, since=None):
+        # У Jooble нет прямого поля для level (начальный/средний), поэтому мы добавим его к ключевым словам (keywords)
+        full_keywords = f"{term} {level}"
+        request_data = {
+            "keywords": full_keywords,
+            "location": location,
+            "page": page
+        }
+        if since is not None:
+            # Инкрементальная загрузка: только вакансии, созданные после прошлого прогона
+            request_data["datecreatedfrom"] = since.strftime('%Y-%m-%d')
+        return full_keywords, request_data
+
+    def fetch(self, request_data, timeout, deadline=None):
+        if not JOOBLE_API_KEY:
+            logger.error("JOOBLE_API_KEY is missing from environment variables.")
+            raise ProviderError('Server configuration error: API key missing')
+
+        jooble_url = f"{self.resource['base_url']}{JOOBLE_API_KEY}"
+        # Через общий пул keep-alive соединений, с таймаутами и повторами в пределах дедлайна
+        response = get_http_client().post(jooble_url, json=request_data, timeout=timeout, deadline=deadline)
+        response.raise_for_status() # Обработка ошибок HTTP
+        return response.json()
+
+    def normalize_jobs(self, data):
+        raw_jobs = []
+        for job in data.get('jobs') or []:
+            raw_jobs.append({
+                'id': f"jooble_{job.get('id')}",
+                'title': job.get('title'),
+                'company': job.get('company'),
+                'location': job.get('location'),
+                'salary': job.get('salary') or 'N/A',
+                'source': self.name,
+                'link': job.get('link'),
+                'description': job.get('snippet', '') # Описание для анализа!
+            })
+        return raw_jobs
+
+
+class MockProviderAdapter(JobProviderAdapter):
+    """
+    Локальный ресурс для нагрузочного тестирования: без сети, детерминированные вакансии
+    по (ключевые слова, локация, страница). Настройки в JobResource.settings:
+    latency_ms - имитация задержки, jobs_per_page, error_rate (0..1), cacheable.
+    """
+
+    adapter_name = 'mock'
+    max_concurrency = 64
+    rate_per_second = 1000.0
+    burst = 1000
+    paginated = True
+    cacheable = False
+
+    SAMPLE_SKILLS = (
+        'python', 'django', 'flask', 'sql', 'postgresql', 'docker', 'kubernetes', 'aws', 'react',
+        'javascript', 'java', 'spring', 'excel', 'sales', 'support', 'marketing', 'figma', 'linux',
+    )
+
+    def __init__(self, resource, settings, key=None):
+        super().__init__(resource, settings, key)
+        self.latency_ms = float(settings.get('latency_ms', 200))
+        self.jobs_per_page = int(settings.get('jobs_per_page', 20))
+        self.error_rate = float(settings.get('error_rate', 0))
+        # Только настоящий bool: строка "false" не должна включать кэширование
+        if isinstance(settings.get('cacheable'), bool):
+            self.cacheable = settings['cacheable']
+
+    def build_request(self, term, location, level, page, since=None):
+        keywords = f"{term} {level}"
+        return keywords, {'keywords': keywords, 'location': location, 'page': page}
+
+    def fetch(self, request_data, timeout, deadline=None):
+        time.sleep(min(self.latency_ms / 1000, timeout))
+        if self.error_rate and random.random() < self.error_rate:
+            raise ProviderError(f"{self.name}: simulated upstream error")
+
+        seed = hashlib.sha256(json.dumps(request_data, sort_keys=True).encode('utf-8')).hexdigest()
+        rng = random.Random(seed)
+        keywords = request_data['keywords']
+        jobs = []
+        for index in range(self.jobs_per_page):
+            skills = rng.sample(self.SAMPLE_SKILLS, 5)
+            jobs.append({
+                'id': f"{seed[:8]}-{request_data['page']}-{index}",
+                'title': f"{keywords} ({skills[0]})",
+                'company': f"Mock Company {rng.randint(1, 500)}",
+                'location': request_data['location'],
+                'snippet': f"We are looking for {keywords}. Skills: {', '.join(skills)}.",
+            })
+        return {'jobs': jobs}
+
+    def normalize_jobs(self, data):
+        return [{
+            'id': f"mock_{job['id']}",
+            'title': job['title'],
+            'company': job['company'],
+            'location': job['location'],
+            'salary': 'N/A',
+            'source': self.name,
+            'link': None,
+            'description': job['snippet'],
+        } for job in data.get('jobs') or []]
+
+
+# Реестр адаптеров: JobResource.adapter -> класс адаптера
+PROVIDER_ADAPTERS = {
+    JoobleAdapter.adapter_name: JoobleAdapter,
+    MockProviderAdapter.adapter_name: MockProviderAdapter,
+}
+
+# Типы настроек JobResource.settings, которые читают адаптеры
+SETTINGS_TYPES = {
+    'max_concurrency': int,
+    'burst': int,
+    'page_depth': int,
+    'jobs_per_page': int,
+    'rate_per_second': (int, float),
+    'latency_ms': (int, float),
+    'error_rate': (int, float),
+    'cacheable': bool,
+}
+
+
+def validate_settings(settings):
+    """
+    Текст ошибки для настроек ресурса или None. bool не считается числом,
+    а cacheable принимает только true/false, не строку.
+    """
+    for name, value in settings.items():
+        expected = SETTINGS_TYPES.get(name)
+        if expected is None:
+            continue
+        if expected is not bool and isinstance(value, bool) or not isinstance(value, expected):
+            return f"Setting {name} has invalid type"
+    return None
+
+
+_adapters = {}
+_adapters_lock = threading.Lock()
+
+
+def get_adapter(resource):
+    """
+    Адаптер для JobResource. Выбирается по полю adapter, для старых записей - по имени ресурса.
+    Экземпляры (вместе с лимитами) живут весь процесс и пересоздаются при изменении настроек.
+    Возвращает None для неизвестного адаптера.
+    """
+    adapter_name = (resource.adapter or resource.name or '').lower()
+    adapter_class = PROVIDER_ADAPTERS.get(adapter_name)
+    if adapter_class is None:
+        return None
+
+    key = (resource.id, adapter_name, resource.base_url, resource.settings)
+    with _adapters_lock:
+        adapter = _adapters.get(resource.id)
+        if adapter is None or adapter.key != key:
+            settings = json.loads(resource.settings) if resource.settings else {}
+            adapter = adapter_class(resource_snapshot(resource), settings, key)
+            _adapters[resource.id] = adapter
+        return adapter
+
+
+def adapters_stats():
+    with _adapters_lock:
+        adapters = list(_adapters.values())
+    return {adapter.name: adapter.stats() for adapter in adapters}
+
+
+def build_provider_tasks(resource, term, location, level, timeout, page_depth, deadline=None):
+    """
+    Задачи для iter_fan_out: по одной на каждую страницу 1..page_depth ресурса
+    (для ресурсов без пагинации - одна задача). deadline - дедлайн поиска (момент time.monotonic()).
+    Возвращает None для неизвестного ресурса.
+    """
+    adapter = get_adapter(resource)
+    if adapter is None:
+        return None
+    return [
+        (adapter.name, functools.partial(adapter.search_page, term, location, level, timeout, page=page, deadline=deadline))
+        for page in range(1, adapter.page_depth(page_depth) + 1)
+    ]
@@ -0,0 +1,82 @@
+"""
+Ленивая загрузка матчера для быстрого старта веб-процесса.
+
+ai_matcher и зависящие от него модули поиска (ingestion, percolator, dedup, inverted_index) тянут
+numpy/scipy, а модель IDF корпуса читается с диска. create_app их не импортирует: маршруты без
+матчинга (/, /login, профиль) доступны сразу. Матчер загружается один раз - при первом поиске
+(get_matcher) или заранее (warm_up, режим MATCHER_WARMUP).
+"""
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = ('eager', 'background', 'lazy')
+
+# Пакеты, которых не должно быть в импортах create_app (проверяет flask startup-report)
+LAZY_MODULES = ('ai_matcher', 'ingestion', 'percolator', 'sklearn', 'scipy', 'numpy', 'nltk')
+
+_idf_model_path = None
+_posting_index_path = None
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def init_matcher(config):
+    """Запоминает каталоги модели IDF и индекса вакансий; загрузка - при первом get_matcher."""
+    global _idf_model_path, _posting_index_path, _loaded
+    with _load_lock:
+        _idf_model_path = config['MATCHER_IDF_MODEL_PATH']
+        _posting_index_path = config['POSTING_INDEX_PATH']
+        _loaded = False
+
+
+def _load():
+    started = time.perf_counter()
+    import ai_matcher
+    from idf_model import CURRENT_POINTER
+    from inverted_index import init_posting_index
+
+    if _idf_model_path and os.path.exists(os.path.join(_idf_model_path, CURRENT_POINTER)):
+        idf_model = ai_matcher.load_idf_model(_idf_model_path)
+        logger.info(f"Loaded IDF model: {idf_model}")
+    # Инвертированный индекс вакансий загружается при первом запросе рекомендаций
+    init_posting_index(_posting_index_path)
+    logger.info(f"Matcher loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def get_matcher():
+    """Модуль ai_matcher с загруженной моделью IDF корпуса (если она построена)."""
+    global _loaded
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                _load()
+                _loaded = True
+    import ai_matcher
+    return ai_matcher
+
+
+def warm_up(mode='eager'):
+    """
+    Загружает матчер, модули поиска и индекс вакансий до первого запроса.
+    eager - синхронно; background - в фоновом потоке (возвращается поток); lazy - ничего не делает.
+    """
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown warm-up mode '{mode}', expected one of {WARMUP_MODES}")
+    if mode == 'lazy':
+        return None
+    if mode == 'background':
+        thread = threading.Thread(target=warm_up, name='matcher-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    started = time.perf_counter()
+    get_matcher()
+    import ingestion  # noqa: F401 - percolator, dedup и полнотекстовый поиск
+    from inverted_index import get_posting_index
+    get_posting_index()
+    logger.info(f"Matcher warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return None
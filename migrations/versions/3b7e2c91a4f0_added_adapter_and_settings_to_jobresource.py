@@ -0,0 +1,29 @@
+"""Added adapter and settings to JobResource
+
+Revision ID: 3b7e2c91a4f0
+Revises: d211fc5086ee
+Create Date: 2026-10-16 09:12:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2c91a4f0'
+down_revision = 'd211fc5086ee'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Обе колонки nullable: для существующих ресурсов адаптер выбирается по имени
+    with op.batch_alter_table('job_resource', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('adapter', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('settings', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('job_resource', schema=None) as batch_op:
+        batch_op.drop_column('settings')
+        batch_op.drop_column('adapter')
@@ -0,0 +1,70 @@
+"""Added full-text index for JobPosting
+
+Revision ID: 5e9a0b7c3d12
+Revises: 8c4f1d2e6a57
+Create Date: 2026-10-16 13:25:09.331870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9a0b7c3d12'
+down_revision = '8c4f1d2e6a57'
+branch_labels = None
+depends_on = None
+
+
+# SQL заморожен на момент ревизии: миграция не импортирует fulltext_index,
+# чтобы последующие изменения модуля не меняли уже примененную схему
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Генерируемая колонка tsvector (веса A/B/C) поддерживается Postgres при каждой вставке/обновлении
+        op.execute(
+            "ALTER TABLE job_posting ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(company, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C')) STORED"
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_job_posting_search_vector ON job_posting USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        # Внешняя таблица FTS5 и триггеры, которые держат ее в актуальном состоянии
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_posting_fts USING fts5("
+            "title, company, description, content='job_posting', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS job_posting_fts_insert AFTER INSERT ON job_posting BEGIN "
+            "INSERT INTO job_posting_fts (rowid, title, company, description) "
+            "VALUES (new.id, new.title, new.company, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS job_posting_fts_delete AFTER DELETE ON job_posting BEGIN "
+            "INSERT INTO job_posting_fts (job_posting_fts, rowid, title, company, description) "
+            "VALUES ('delete', old.id, old.title, old.company, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS job_posting_fts_update AFTER UPDATE OF title, company, description "
+            "ON job_posting BEGIN "
+            "INSERT INTO job_posting_fts (job_posting_fts, rowid, title, company, description) "
+            "VALUES ('delete', old.id, old.title, old.company, old.description); "
+            "INSERT INTO job_posting_fts (rowid, title, company, description) "
+            "VALUES (new.id, new.title, new.company, new.description); END"
+        )
+        # Вакансии, загруженные до миграции
+        op.execute("INSERT INTO job_posting_fts (job_posting_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_job_posting_search_vector")
+        op.execute("ALTER TABLE job_posting DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS job_posting_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS job_posting_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS job_posting_fts_insert")
+        op.execute("DROP TABLE IF EXISTS job_posting_fts")
@@ -0,0 +1,25 @@
+"""Added last_full_run_at to IngestionCursor
+
+Revision ID: b8e2f4a61c07
+Revises: e5a19c37b2d4
+Create Date: 2026-10-17 09:12:44.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2f4a61c07'
+down_revision = 'e5a19c37b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL - полного прогона еще не было: первый же прогон курсора будет полным
+    op.add_column('ingestion_cursor', sa.Column('last_full_run_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('ingestion_cursor', 'last_full_run_at')
@@ -0,0 +1,30 @@
+"""Added simhash and duplicate_of_id to JobPosting
+
+Revision ID: c4b81f6e2d93
+Revises: a7d3e5f19b80
+Create Date: 2026-10-16 17:05:31.481920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4b81f6e2d93'
+down_revision = 'a7d3e5f19b80'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Обе колонки nullable: подписи старых вакансий заполнятся при следующей загрузке (dedup.py).
+    # Без batch_alter_table: в SQLite пересоздание таблицы удалило бы триггеры полнотекстового индекса
+    op.add_column('job_posting', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    op.add_column('job_posting', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_job_posting_duplicate_of_id'), 'job_posting', ['duplicate_of_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_job_posting_duplicate_of_id'), table_name='job_posting')
+    op.drop_column('job_posting', 'duplicate_of_id')
+    op.drop_column('job_posting', 'simhash')
@@ -0,0 +1,29 @@
+"""Added case-insensitive unique indexes on user username and email
+
+Revision ID: e5a19c37b2d4
+Revises: c4b81f6e2d93
+Create Date: 2026-10-16 23:31:07.215604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a19c37b2d4'
+down_revision = 'c4b81f6e2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Функциональные индексы по lower(): регистрация - один INSERT с конфликтом на индексе,
+    # вход - поиск по индексу. Если в базе уже есть логины или email, различающиеся только
+    # регистром, создание индекса завершится ошибкой: такие записи нужно объединить заранее
+    op.create_index('ix_user_username_lower', 'user', [sa.text('lower(username)')], unique=True)
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_email_lower', table_name='user')
+    op.drop_index('ix_user_username_lower', table_name='user')
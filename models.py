@@ -1,4 +1,4 @@
-from app import db
+from extensions import db
 from datetime import datetime
 
 class User(db.Model):
@@ -9,6 +9,12 @@ class User(db.Model):
     date_started = db.Column(db.DateTime, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Логин и email уникальны без учета регистра; вход ищет пользователя по этим же выражениям
+    __table_args__ = (
+        db.Index('ix_user_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_user_email_lower', db.func.lower(email), unique=True),
+    )
+
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -85,6 +91,10 @@ class JobResource(db.Model):
     base_url = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     api_key_required = db.Column(db.Boolean, default=False)
+    # Имя адаптера из job_providers.PROVIDER_ADAPTERS (если пусто - по имени ресурса)
+    adapter = db.Column(db.String(50), nullable=True)
+    # JSON с настройками адаптера: max_concurrency, rate_per_second, burst, page_depth и т.д.
+    settings = db.Column(db.Text, nullable=True)
     date_started = db.Column(db.DateTime, default=datetime.utcnow)
     date_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -97,3 +107,110 @@ class JobResource(db.Model):
         }
 
 
+
+
+# Вакансия, загруженная фоновым процессом (ingestion.py) из внешнего ресурса
+class JobPosting(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('resource_id', 'external_id', name='uq_job_posting_resource_external'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey('job_resource.id'), nullable=False)
+    # ID вакансии в общем формате адаптера (например, 'jooble_123')
+    external_id = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=True)
+    company = db.Column(db.String(255), nullable=True)
+    location = db.Column(db.String(255), nullable=True)
+    salary = db.Column(db.String(100), nullable=True)
+    link = db.Column(db.Text, nullable=True)
+    description = db.Column(db.Text, nullable=True)
+    # Хэш содержимого: запись обновляется, только если вакансия изменилась
+    content_hash = db.Column(db.String(64), nullable=False)
+    # Когда вакансия последний раз встречалась в ответе ресурса (старые не показываются в поиске)
+    last_seen = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Подпись SimHash текста (dedup.py, знаковое 64-битное) и вакансия, копией которой эта является:
+    # копии не попадают в рекомендации и уведомления (в поиске их отсеивает JobMatchSession).
+    # Без внешнего ключа: вакансии не удаляются, а в SQLite его добавление пересоздало бы таблицу
+    simhash = db.Column(db.BigInteger, nullable=True)
+    duplicate_of_id = db.Column(db.Integer, nullable=True, index=True)
+    date_started = db.Column(db.DateTime, default=datetime.utcnow)
+    date_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    resource = db.relationship('JobResource', backref=db.backref('postings', lazy='dynamic'))
+
+    def to_job_dict(self, source):
+        # Тот же формат, что отдают адаптеры ресурсов (job_providers.py)
+        return {
+            'id': self.external_id,
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'salary': self.salary or 'N/A',
+            'source': source,
+            'link': self.link,
+            'description': self.description or ''
+        }
+
+    def __repr__(self):
+        return f'<JobPosting {self.external_id}>'
+
+
+# Состояние фоновой загрузки для комбинации (ресурс, роль, локация, уровень)
+class IngestionCursor(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('resource_id', 'search_term', 'location', 'level', name='uq_ingestion_cursor_query'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    resource_id = db.Column(db.Integer, db.ForeignKey('job_resource.id'), nullable=False)
+    # Нормализованные параметры запроса (нижний регистр, одиночные пробелы)
+    search_term = db.Column(db.String(100), nullable=False)
+    location = db.Column(db.String(100), nullable=False, default='')
+    level = db.Column(db.String(50), nullable=False, default='')
+    # Время начала последнего успешного прогона: следующий загружает вакансии начиная с него
+    last_run_at = db.Column(db.DateTime, nullable=True)
+    # Время начала последнего успешного полного прогона (без since): он обновляет last_seen живых вакансий
+    last_full_run_at = db.Column(db.DateTime, nullable=True)
+    last_status = db.Column(db.String(20), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    postings_seen = db.Column(db.Integer, default=0)
+
+    def __repr__(self):
+        return f'<IngestionCursor {self.search_term} @ {self.location}>'
+
+
+# Какие вакансии были получены по запросу IngestionCursor (для локального поиска по тем же параметрам)
+ingestion_cursor_postings = db.Table('ingestion_cursor_postings',
+    db.Column('cursor_id', db.Integer, db.ForeignKey('ingestion_cursor.id'), primary_key=True),
+    db.Column('posting_id', db.Integer, db.ForeignKey('job_posting.id'), primary_key=True)
+)
+
+
+# Уведомление: новая вакансия из фоновой загрузки подходит к навыкам пользователя (percolator.py)
+class JobNotification(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'posting_id', name='uq_job_notification_user_posting'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    posting_id = db.Column(db.Integer, db.ForeignKey('job_posting.id'), nullable=False)
+    relevance_score = db.Column(db.Float, nullable=False)
+    is_read = db.Column(db.Boolean, default=False, nullable=False)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow)
+
+    posting = db.relationship('JobPosting')
+
+    def to_dict(self):
+        job = self.posting.to_job_dict(self.posting.resource.name)
+        job['relevance_score'] = self.relevance_score
+        return {
+            'id': self.id,
+            'is_read': self.is_read,
+            'date_created': self.date_created.isoformat() if self.date_created else None,
+            'job': job
+        }
+
+    def __repr__(self):
+        return f'<JobNotification {self.user_id} -> {self.posting_id}>'
@@ -0,0 +1,53 @@
+"""
+Статическая спецификация OpenAPI вместо разбора YAML-докстрингов маршрутов во время работы.
+
+flasgger собирает спецификацию из докстрингов routes.py при первом запросе /apispec_1.json
+в каждом процессе. В продакшене она собирается один раз командой 'flask openapi build'
+в файл OPENAPI_SPEC_PATH и отдается с заголовками кэширования (ETag, Cache-Control);
+Swagger UI (/apidocs/) не меняется. В режиме debug спецификация по-прежнему строится
+из докстрингов, чтобы правки маршрутов были видны сразу.
+"""
+import os
+import json
+import logging
+from flask import current_app, jsonify, send_file
+from flasgger import Swagger
+
+logger = logging.getLogger(__name__)
+
+SPEC_ENDPOINT = Swagger.DEFAULT_ENDPOINT
+
+
+def build_openapi_spec(app, path):
+    """Собирает спецификацию из докстрингов маршрутов и сохраняет ее в path; возвращает число путей."""
+    spec = app.swag.get_apispecs(SPEC_ENDPOINT)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Запись во временный файл и замена: воркеры не увидят наполовину записанную спецификацию
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf8') as f:
+        json.dump(spec, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return len(spec.get('paths', {}))
+
+
+def openapi_spec():
+    """Спецификация OpenAPI: собранный файл, в режиме debug - разбор докстрингов."""
+    if current_app.debug:
+        return jsonify(current_app.swag.get_apispecs(SPEC_ENDPOINT))
+    path = current_app.config['OPENAPI_SPEC_PATH']
+    if not os.path.exists(path):
+        return jsonify({'error': 'OpenAPI spec is not built yet, run: flask openapi build'}), 503
+    return send_file(
+        os.path.abspath(path), mimetype='application/json',
+        max_age=current_app.config['OPENAPI_SPEC_MAX_AGE'], conditional=True, etag=True
+    )
+
+
+def init_openapi(app):
+    """Подменяет представление спецификации flasgger (вызывается после swagger.init_app)."""
+    endpoint = f"{app.swag.config.get('endpoint', 'flasgger')}.{SPEC_ENDPOINT}"
+    app.view_functions[endpoint] = openapi_spec
+    if not app.debug and not os.path.exists(app.config['OPENAPI_SPEC_PATH']):
+        logger.warning(f"OpenAPI spec {app.config['OPENAPI_SPEC_PATH']} is not built, /{SPEC_ENDPOINT}.json returns 503")
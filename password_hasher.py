@@ -0,0 +1,159 @@
+"""
+Хеширование паролей bcrypt в отдельном ограниченном пуле потоков.
+
+bcrypt намеренно дорог по CPU: при массовых входах (утро понедельника, рассылки) хеширование
+прямо в обработчиках /register и /login занимает все воркеры, и /api/search ждет.
+Здесь на хеширование отводится не больше PASSWORD_HASH_WORKERS потоков и очередь
+PASSWORD_HASH_MAX_QUEUE; сверх нее запрос сразу отклоняется (HasherBusy -> 503 с Retry-After),
+а не копится в воркерах. bcrypt отпускает GIL, поэтому потоки пула не блокируют остальные запросы;
+в кооперативном режиме (gevent) используется пул настоящих потоков ОС gevent.
+
+Стоимость хеша - BCRYPT_LOG_ROUNDS; хеши со старой стоимостью пересчитываются при входе.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from extensions import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+class HasherBusy(Exception):
+    """Пул хеширования переполнен или не уложился в таймаут - запрос нужно повторить позже."""
+
+
+def hash_rounds(password_hash):
+    """Стоимость (log rounds) из хеша вида $2b$12$...; None для нераспознанного хеша."""
+    parts = password_hash.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def _executor_class():
+    # После monkey.patch_all потоки threading - это greenlet'ы: хеширование заблокировало бы весь процесс
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+    if monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor
+    return ThreadPoolExecutor
+
+
+class PasswordHasher:
+    """Пул хеширования с допуском по длине очереди; пул создается при первом хешировании (после fork)."""
+
+    def __init__(self, log_rounds=12, workers=2, max_queue=32, timeout=5.0):
+        self.log_rounds = log_rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.rehashed = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            log_rounds=config['BCRYPT_LOG_ROUNDS'],
+            workers=config['PASSWORD_HASH_WORKERS'],
+            max_queue=config['PASSWORD_HASH_MAX_QUEUE'],
+            timeout=config['PASSWORD_HASH_TIMEOUT_SECONDS'],
+        )
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = _executor_class()(max_workers=self.workers, thread_name_prefix='password-hash')
+        return self._executor
+
+    def _run(self, func, args):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+
+    def _call(self, func, *args):
+        executor = self._get_executor()
+        with self._lock:
+            if self._queued + self._running >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusy(f"Password hashing queue is full ({self._queued} waiting)")
+            self._queued += 1
+        future = executor.submit(self._run, func, args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Задача, еще не взятая потоком, снимается; начатая доработает и освободит место сама
+            with self._lock:
+                self.timed_out += 1
+                if future.cancel():
+                    self._queued -= 1
+            raise HasherBusy(f"Password hashing did not finish in {self.timeout}s")
+
+    def hash(self, password):
+        """Хеш пароля с текущей стоимостью (строка для User.password_hash)."""
+        return self._call(bcrypt.generate_password_hash, password, self.log_rounds).decode('utf-8')
+
+    def check(self, password_hash, password):
+        return self._call(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Хеш создан с другой стоимостью (BCRYPT_LOG_ROUNDS изменился)."""
+        rounds = hash_rounds(password_hash)
+        return rounds is not None and rounds != self.log_rounds
+
+    def rehash(self, password):
+        """Новый хеш для входа со старой стоимостью; None, если пул занят (пересчет - при следующем входе)."""
+        try:
+            password_hash = self.hash(password)
+        except HasherBusy:
+            return None
+        with self._lock:
+            self.rehashed += 1
+        return password_hash
+
+    def stats(self):
+        with self._lock:
+            return {
+                'log_rounds': self.log_rounds,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'rehashed': self.rehashed,
+            }
+
+
+# Пул процесса; создается в app.py по настройкам приложения (init_password_hasher)
+password_hasher = None
+
+
+def init_password_hasher(config):
+    global password_hasher
+    password_hasher = PasswordHasher.from_config(config)
+    return password_hasher
+
+
+def get_password_hasher():
+    """Пул процесса (с настройками по умолчанию, если init_password_hasher еще не вызывался)."""
+    global password_hasher
+    if password_hasher is None:
+        password_hasher = PasswordHasher()
+    return password_hasher
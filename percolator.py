@@ -0,0 +1,122 @@
+import logging
+import threading
+import numpy as np
+from scipy import sparse
+from ai_matcher import EXCLUSION_PENALTY, build_profile_counts, build_profile_vector, score_profiles
+from exclusion_matcher import ExclusionAutomaton, excluded_skills_of
+from text_normalizer import normalize, normalize_many
+from extensions import db
+from models import ApplicantProfile, RoleFocus
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileMatrix:
+    """
+    Все профили соискателей в одной разреженной матрице для обратного матчинга
+    (вакансия -> профили, как percolator в поисковых движках).
+
+    Строка матрицы - частоты терминов навыков профиля; исключаемые навыки всех профилей
+    собраны в один автомат, а матрица "профиль x исключение" превращает найденные
+    в вакансиях исключения в штрафы тоже одним произведением.
+    """
+
+    def __init__(self, profiles):
+        """profiles - список (id профиля, id пользователя, навыки, исключаемые навыки)."""
+        self.profile_ids = np.array([profile[0] for profile in profiles], dtype=np.int64)
+        self.user_ids = np.array([profile[1] for profile in profiles], dtype=np.int64)
+        self.counts, self.vocabulary = build_profile_counts(
+            [build_profile_vector(skills).tokens for _, _, skills, _ in profiles]
+        )
+
+        # Исключения: одинаковые после нормализации навыки - один столбец
+        pattern_columns = {}
+        rows, columns = [], []
+        for row, (_, _, _, excluded_skills) in enumerate(profiles):
+            for skill in excluded_skills:
+                key = normalize(skill)
+                if not key:
+                    continue
+                column = pattern_columns.setdefault(key, len(pattern_columns))
+                rows.append(row)
+                columns.append(column)
+        self.pattern_columns = pattern_columns
+        self.exclusions = ExclusionAutomaton(list(pattern_columns))
+        self.profile_exclusions = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(len(profiles), len(pattern_columns))
+        )
+        # Повторы одного исключения у профиля дают один штраф, как в ExclusionAutomaton
+        self.profile_exclusions.data[:] = 1
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def match(self, jobs, min_score, mode=None):
+        """
+        Баллы пакета вакансий для всех профилей: список (индекс вакансии, id профиля, id пользователя, балл)
+        для пар с баллом не ниже min_score. Балл считается так же, как в ai_match_jobs
+        (включая штраф EXCLUSION_PENALTY за каждый найденный исключаемый навык; навыки,
+        одинаковые после нормализации, штрафуются один раз и там, и здесь).
+        """
+        if not jobs or not len(self):
+            return []
+        normalized_jobs = normalize_many([(job.get('title') or '') + ' ' + (job.get('description') or '') for job in jobs])
+        scores = score_profiles(self.counts, self.vocabulary, [tokens for _, tokens in normalized_jobs], mode=mode)
+
+        if self.pattern_columns:
+            rows, columns = [], []
+            for row, matches in enumerate(self.exclusions.find_many([text for text, _ in normalized_jobs])):
+                for pattern in matches:
+                    rows.append(row)
+                    columns.append(self.pattern_columns[pattern])
+            job_exclusions = sparse.csr_matrix(
+                (np.ones(len(rows)), (rows, columns)), shape=(len(jobs), len(self.pattern_columns))
+            )
+            job_exclusions.data[:] = 1
+            penalties = sparse.csr_matrix(job_exclusions @ self.profile_exclusions.T).multiply(scores > 0)
+            scores = sparse.csr_matrix(scores - EXCLUSION_PENALTY * penalties)
+            scores.data = np.round(np.maximum(scores.data, 0), 2)
+
+        scores = scores.tocoo()
+        selected = scores.data >= min_score
+        return [
+            (int(row), int(self.profile_ids[column]), int(self.user_ids[column]), float(score))
+            for row, column, score in zip(scores.row[selected], scores.col[selected], scores.data[selected])
+        ]
+
+
+def load_profiles():
+    """Профили с навыками и исключениями из последней записи RoleFocus (для ProfileMatrix)."""
+    latest_focus = {}
+    for focus in RoleFocus.query.order_by(RoleFocus.profile_id, RoleFocus.date):
+        latest_focus[focus.profile_id] = focus
+
+    profiles = []
+    for profile in ApplicantProfile.query.options(db.selectinload(ApplicantProfile.skills)):
+        skills = [skill.name for skill in profile.skills]
+        if skills:
+            profiles.append((profile.id, profile.user_id, skills, excluded_skills_of(latest_focus.get(profile.id))))
+    return profiles
+
+
+_matrix = None
+_matrix_key = None
+_matrix_lock = threading.Lock()
+
+
+def get_profile_matrix():
+    """
+    Матрица профилей процесса. Пересобирается, только если профили или их RoleFocus
+    изменились с прошлого раза (по числу записей и последним датам изменения).
+    """
+    global _matrix, _matrix_key
+    key = (
+        db.session.query(db.func.count(ApplicantProfile.id), db.func.max(ApplicantProfile.date_updated)).one(),
+        db.session.query(db.func.count(RoleFocus.id), db.func.max(RoleFocus.date)).one(),
+    )
+    with _matrix_lock:
+        if _matrix is None or _matrix_key != key:
+            _matrix = ProfileMatrix(load_profiles())
+            _matrix_key = key
+            logger.info(f"Profile matrix rebuilt: {len(_matrix)} profiles, {len(_matrix.vocabulary)} terms")
+        return _matrix
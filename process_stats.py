@@ -0,0 +1,28 @@
+import os
+import resource
+
+
+def process_memory(pid='self'):
+    """
+    Память процесса в КБ. rss - вся резидентная память, включая страницы, общие с мастером gunicorn
+    (copy-on-write) и другими воркерами; uss - только собственные страницы процесса
+    (во столько обходится еще один воркер); pss - rss с общими страницами, поделенными поровну
+    между процессами (сумма pss всех воркеров - реальный расход памяти).
+    На системах без /proc/<pid>/smaps_rollup - только пиковый rss текущего процесса.
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', encoding='ascii') as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        return {'pid': os.getpid(), 'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    return {
+        'pid': os.getpid() if pid == 'self' else pid,
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'uss_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
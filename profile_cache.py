@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+
+class ProfileVectorCache:
+    """
+    LRU-кэш подготовленных (очищенных и токенизированных) навыков профиля.
+
+    Ключ - ApplicantProfile.id и date_updated: если профиль изменился, запись считается устаревшей.
+    Изменение навыков (связь многие-ко-многим) само не обновляет date_updated, поэтому маршруты,
+    которые пишут навыки, обновляют его явно и вызывают invalidate().
+
+    Вектор, построенный по старым навыкам, не возвращается в кэш: put не заменяет запись с более
+    новым date_updated, а get_or_build не сохраняет вектор, если во время построения был invalidate().
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # profile_id -> (date_updated, vector)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Растет при каждом invalidate(): построение, начатое до него, не сохраняет результат
+        self._generation = 0
+        self.stale_puts = 0
+
+    def get(self, profile_id, date_updated):
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            if entry is None or entry[0] != date_updated:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(profile_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, profile_id, date_updated, vector, generation=None):
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            if (generation is not None and generation != self._generation) or (
+                entry is not None and date_updated is not None and entry[0] is not None and entry[0] > date_updated
+            ):
+                self.stale_puts += 1
+                return
+            self._entries[profile_id] = (date_updated, vector)
+            self._entries.move_to_end(profile_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, profile_id, date_updated, build):
+        """Возвращает вектор из кэша или строит его через build() и сохраняет."""
+        with self._lock:
+            generation = self._generation
+        vector = self.get(profile_id, date_updated)
+        if vector is None:
+            vector = build()
+            self.put(profile_id, date_updated, vector, generation)
+        return vector
+
+    def invalidate(self, profile_id):
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(profile_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'stale_puts': self.stale_puts,
+            }
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_part(value):
+    """Регистр и лишние пробелы не должны давать разные ключи кэша."""
+    return ' '.join(str(value or '').casefold().split())
+
+
+def make_cache_key(resource_name, keywords, location, page):
+    """Ключ ответа ресурса по нормализованному кортежу (ресурс, ключевые слова, локация, страница)."""
+    normalized = json.dumps([
+        _normalize_part(resource_name), _normalize_part(keywords), _normalize_part(location), int(page or 1)
+    ], ensure_ascii=False)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ProviderResponseCache:
+    """
+    Двухуровневый кэш сырых ответов внешних ресурсов с TTL.
+
+    1-й уровень - LRU в памяти процесса, 2-й - общий файл SQLite (WAL) на узле,
+    так что попадание одного WSGI-воркера видят все остальные. Запись на диске
+    вытесняется по TTL и по давности последнего обращения.
+    """
+
+    def __init__(self, ttl, memory_size=2048, disk_path=None, disk_max_entries=50000):
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts_since_eviction = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = self._connect()
+            try:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS provider_cache ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                connection.execute('CREATE INDEX IF NOT EXISTS ix_provider_cache_accessed ON provider_cache (accessed_at)')
+            finally:
+                connection.close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.disk_path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _connection(self):
+        # Соединение SQLite нельзя делить между потоками и процессами (после fork) - у каждого свое
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return connection
+
+    def _memory_put(self, key, expires_at, value):
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        if self.disk_path:
+            try:
+                connection = self._connection()
+                row = connection.execute(
+                    'SELECT value, expires_at FROM provider_cache WHERE key = ? AND expires_at > ?', (key, now)
+                ).fetchone()
+                if row is not None:
+                    connection.execute('UPDATE provider_cache SET accessed_at = ? WHERE key = ?', (now, key))
+                    value = json.loads(row[0])
+                    self._memory_put(key, row[1], value)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return value
+            except sqlite3.Error as e:
+                logger.warning(f"Provider cache disk read failed: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl
+        self._memory_put(key, expires_at, value)
+
+        if not self.disk_path:
+            return
+        try:
+            connection = self._connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO provider_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+            )
+            with self._lock:
+                self._puts_since_eviction += 1
+                evict = self._puts_since_eviction >= 100
+                if evict:
+                    self._puts_since_eviction = 0
+            if evict:
+                self._evict_disk(connection, now)
+        except sqlite3.Error as e:
+            logger.warning(f"Provider cache disk write failed: {e}")
+
+    def _evict_disk(self, connection, now):
+        connection.execute('DELETE FROM provider_cache WHERE expires_at <= ?', (now,))
+        connection.execute(
+            'DELETE FROM provider_cache WHERE key IN ('
+            'SELECT key FROM provider_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.disk_max_entries,)
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_size': len(self._memory),
+                'memory_max_size': self.memory_size,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'ttl_seconds': self.ttl,
+                'disk_enabled': bool(self.disk_path),
+            }
+
+
+# Кэш процесса; создается в app.py по настройкам приложения (init_provider_cache)
+provider_response_cache = None
+
+
+def init_provider_cache(config):
+    global provider_response_cache
+    provider_response_cache = ProviderResponseCache(
+        ttl=config['PROVIDER_CACHE_TTL_SECONDS'],
+        memory_size=config['PROVIDER_CACHE_MEMORY_SIZE'],
+        disk_path=config['PROVIDER_CACHE_PATH'] or None,
+        disk_max_entries=config['PROVIDER_CACHE_DISK_MAX_ENTRIES'],
+    )
+    return provider_response_cache
+
+
+def get_provider_cache():
+    """Кэш процесса (только в памяти, если init_provider_cache еще не вызывался)."""
+    global provider_response_cache
+    if provider_response_cache is None:
+        provider_response_cache = ProviderResponseCache(ttl=600)
+    return provider_response_cache
@@ -0,0 +1,49 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket: rate токенов в секунду, не больше capacity в запасе.
+    acquire() ждет токен не дольше timeout секунд и возвращает False, если не дождался.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.rejected = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=0):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.granted += 1
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else timeout
+                if now + wait > deadline:
+                    self.rejected += 1
+                    return False
+            time.sleep(wait)
+
+    def stats(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_second': self.rate,
+                'capacity': self.capacity,
+                'available_tokens': round(self._tokens, 2),
+                'granted': self.granted,
+                'rejected': self.rejected,
+            }
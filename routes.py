@@ -1,21 +1,55 @@
-import requests
-import os
-from dotenv import load_dotenv
-from flask import jsonify, request
-from app import app, db, bcrypt
-from models import User, JobResource, ApplicantProfile, Skill, RoleFocus
-from ai_matcher import ai_match_jobs
+from contextlib import closing
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from extensions import db
+from models import User, JobResource, ApplicantProfile, Skill, RoleFocus, JobPosting, JobNotification
+from profile_cache import ProfileVectorCache
+from user_cache import UserCache
+from text_normalizer import normalizer_cache
+from exclusion_matcher import get_focus_automaton, exclusion_automaton_cache
+from job_providers import PROVIDER_ADAPTERS, adapters_stats, validate_settings, build_provider_tasks
+from http_client import get_http_client
+from provider_cache import get_provider_cache
+from process_stats import process_memory
+from matcher_loader import get_matcher
+from password_hasher import HasherBusy, get_password_hasher
+from singleflight import provider_single_flight
+from search_fanout import FanOutReport, STATUS_OK, STATUS_FAILED, STATUS_SKIPPED, get_executor, iter_fan_out
 import json
+import time
 import logging
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-JOOBLE_API_KEY = os.getenv("JOOBLE_API_KEY")
+bp = Blueprint('api', __name__)
 
-@app.route('/')
+# Кэш подготовленных навыков профилей (сбрасывается при записи навыков); размер - из настроек приложения
+profile_vector_cache = ProfileVectorCache()
+# Снимки пользователей и профилей для защищенных маршрутов (сбрасываются при записи профиля)
+user_cache = UserCache()
+
+
+@bp.record_once
+def _configure_caches(state):
+    profile_vector_cache.max_size = state.app.config['PROFILE_VECTOR_CACHE_SIZE']
+    user_cache.max_size = state.app.config['USER_CACHE_SIZE']
+    user_cache.ttl = state.app.config['USER_CACHE_TTL_SECONDS']
+
+
+def _current_user():
+    """Снимок пользователя из токена (user_cache.py): из кэша воркера или БД; None, если пользователя нет."""
+    return user_cache.get_or_load(get_jwt_identity())
+
+
+def _profile_skill_names(profile_id):
+    """Навыки профиля для подготовки вектора (нужны только при промахе profile_vector_cache)."""
+    return [skill.name for skill in db.session.get(ApplicantProfile, profile_id).skills]
+
+
+@bp.route('/')
 def hello_world():
     """
     Проверка работоспособности API.
@@ -35,7 +69,53 @@ def hello_world():
     return jsonify({"message": "Hello, Xednix!"})
 
 
-@app.route('/register', methods=['POST'])
+def _is_int_list(value):
+    """Список целых чисел (идентификаторы из тела запроса; bool - не число)."""
+    return isinstance(value, list) and all(isinstance(item, int) and not isinstance(item, bool) for item in value)
+
+
+def _page_params(params):
+    """
+    limit (не больше SEARCH_MAX_LIMIT) и offset страницы из тела (JSON) или строки запроса:
+    (limit, offset) или None, если они некорректны. Значение по умолчанию подставляется
+    только для отсутствующего параметра: limit 0 - ошибка, а не страница по умолчанию.
+    """
+    values = []
+    for name, default in (('limit', current_app.config['SEARCH_DEFAULT_LIMIT']), ('offset', 0)):
+        value = params.get(name)
+        if value is None:
+            values.append(default)
+            continue
+        # bool в JSON - не число; дробные числа не округляются молча
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            return None
+        try:
+            values.append(int(value))
+        except ValueError:
+            return None
+    limit, offset = values
+    if limit < 1 or offset < 0:
+        return None
+    return min(limit, current_app.config['SEARCH_MAX_LIMIT']), offset
+
+
+def _hasher_busy_response(error):
+    """Ответ при переполненном пуле хеширования: клиент повторит запрос позже, воркер не ждет."""
+    logger.warning(f"Password hashing rejected: {error}")
+    headers = {'Retry-After': str(current_app.config['PASSWORD_HASH_RETRY_AFTER_SECONDS'])}
+    return jsonify({'error': 'Server is busy, please retry later'}), 503, headers
+
+
+def _user_exists(username, email):
+    """Логин или email уже заняты (без учета регистра, по функциональным индексам)."""
+    return db.session.query(
+        User.query.filter(db.or_(
+            db.func.lower(User.username) == db.func.lower(username), db.func.lower(User.email) == db.func.lower(email)
+        )).exists()
+    ).scalar()
+
+
+@bp.route('/register', methods=['POST'])
 def register():
     """
     Регистрация нового пользователя.
@@ -65,6 +145,8 @@ def register():
         description: Обязательные поля не заполнены.
       409:
         description: Пользователь с таким email или логином уже существует.
+      503:
+        description: Пул хеширования паролей перегружен, запрос нужно повторить (заголовок Retry-After).
     """
     data = request.get_json()
 
@@ -76,25 +158,34 @@ def register():
     email = data.get('email')
     password = data.get('password')
 
-    # Проверка, существует ли пользователь
-    if User.query.filter_by(username=username).first() or User.query.filter_by(email=email).first():
-        return jsonify({'error': 'Username or email already exists'}), 409
-
-    # Хеширование пароля
-    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    # Хеширование пароля (в пуле хеширования, см. password_hasher.py).
+    # Хеш считается до INSERT, поэтому повторная регистрация стоит полного хеша - как и неудачный вход;
+    # предварительный SELECT на каждую регистрацию ради этого не делается. Если пул занят,
+    # занятость логина/email проверяется отдельным запросом: на дубликат клиент получит 409, а не 503
+    try:
+        hashed_password = get_password_hasher().hash(password)
+    except HasherBusy as e:
+        if _user_exists(username, email):
+            return jsonify({'error': 'Username or email already exists'}), 409
+        return _hasher_busy_response(e)
 
     # Создание нового пользователя
     new_user = User(username=username, email=email, password_hash=hashed_password)
 
-    # Добавление пользователя в сессию и сохранение в базу данных
+    # Добавление пользователя одним INSERT: занятые логин или email (без учета регистра)
+    # отклоняет уникальный индекс, без предварительных проверок и гонки между ними и вставкой
     db.session.add(new_user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Username or email already exists'}), 409
 
     return jsonify({'message': 'User registered successfully!'}), 201
 
 
 # Маршрут для авторизации
-@app.route('/login', methods=['POST'])
+@bp.route('/login', methods=['POST'])
 def login():
     """
     Авторизация пользователя.
@@ -129,6 +220,8 @@ def login():
               type: string
       401:
         description: Неверные учетные данные.
+      503:
+        description: Пул хеширования паролей перегружен, запрос нужно повторить (заголовок Retry-After).
     """
     data = request.get_json()
 
@@ -138,17 +231,33 @@ def login():
     username_or_email = data.get('username_or_email')
     password = data.get('password')
 
-    # 1. Поиск пользователя по имени или email
-    user = User.query.filter(
-        (User.username == username_or_email) | (User.email == username_or_email)
+    # 1. Поиск пользователя по имени или email без учета регистра: один запрос, каждая ветка
+    # UNION ALL читает свой функциональный индекс (OR по двум колонкам планировщик не всегда сводит к индексам)
+    login_key = db.func.lower(username_or_email)
+    user = User.query.filter(db.func.lower(User.username) == login_key).union_all(
+        User.query.filter(db.func.lower(User.email) == login_key)
     ).first()
 
     # 2. Проверка существования пользователя и пароля
-    if user and bcrypt.check_password_hash(user.password_hash, password):
+    hasher = get_password_hasher()
+    try:
+        password_ok = user is not None and hasher.check(user.password_hash, password)
+    except HasherBusy as e:
+        return _hasher_busy_response(e)
+
+    if password_ok:
+        # Хеш со старой стоимостью (BCRYPT_LOG_ROUNDS изменился) пересчитывается, пока известен пароль
+        if hasher.needs_rehash(user.password_hash):
+            new_hash = hasher.rehash(password)
+            if new_hash:
+                user.password_hash = new_hash
+                db.session.commit()
 
         # 3. Генерация JWT-токена
         # Мы кодируем ID пользователя в токен !!! user.id преобразуется В СТРОКУ!
-        access_token = create_access_token(identity=str(user.id))
+        # Имя - в claims: /dashboard не нужна БД. Профиль в claims не кладется: он может появиться
+        # после входа, поэтому маршруты берут его из снимка пользователя (_current_user)
+        access_token = create_access_token(identity=str(user.id), additional_claims={'username': user.username})
 
         logger.info(f"User {user.username} successfully logged in.")
 
@@ -164,7 +273,7 @@ def login():
 
 
 # Защищенный маршрут (примитивная админка/дашборд)
-@app.route('/dashboard', methods=['GET'])
+@bp.route('/dashboard', methods=['GET'])
 @jwt_required() # <--- ЭТО ЗАЩИЩАЕТ МАРШРУТ
 def dashboard():
     """
@@ -182,11 +291,18 @@ def dashboard():
     """
     # Получаем ID пользователя из токена (помнить, что current_user_id это строка)
     current_user_id = get_jwt_identity()
-    user = User.query.get(int(current_user_id))
-
-    if user:
+    # Имя - из claims токена, без обращения к БД. Осознанный компромисс: удаленный или переименованный
+    # пользователь видит здесь старое имя (200) до истечения токена (JWT_ACCESS_TOKEN_EXPIRES);
+    # маршруты, которым нужен существующий пользователь, проверяют его через _current_user().
+    # У токенов, выданных до появления claims, имя - из кэша пользователей
+    username = get_jwt().get('username')
+    if username is None:
+        user = _current_user()
+        username = user.username if user else None
+
+    if username:
         return jsonify({
-            "message": f"Welcome to the Dashboard, {user.username}!",
+            "message": f"Welcome to the Dashboard, {username}!",
             "user_id": current_user_id,
             "access_level": "Standard" # Здесь может быть проверка ролей
         }), 200
@@ -195,7 +311,7 @@ def dashboard():
 
 
 # (Маршрут получения ресурсов, доступных для поиска вакансий)
-@app.route('/api/resources', methods=['GET'])
+@bp.route('/api/resources', methods=['GET'])
 @jwt_required()
 def get_job_resources():
     """
@@ -227,7 +343,7 @@ def get_job_resources():
     return jsonify(resources_list), 200
 
 # Маршрут добавления ресурсов для администратора/тестирования
-@app.route('/api/resource/add', methods=['POST'])
+@bp.route('/api/resource/add', methods=['POST'])
 @jwt_required() # Защищен токеном
 def add_job_resource():
     """
@@ -253,9 +369,19 @@ def add_job_resource():
             is_active:
               type: boolean
               example: true
+            adapter:
+              type: string
+              description: Адаптер ресурса (jooble, mock). По умолчанию - по имени ресурса.
+              example: jooble
+            settings:
+              type: object
+              description: Настройки адаптера (max_concurrency, rate_per_second, burst, page_depth; для mock - cacheable true/false).
+              example: {"max_concurrency": 8, "rate_per_second": 10}
     responses:
       201:
         description: Ресурс успешно добавлен.
+      400:
+        description: Не указаны имя и URL, неизвестный адаптер или некорректные настройки.
       409:
         description: Ресурс с таким именем уже существует.
     """
@@ -263,6 +389,18 @@ def add_job_resource():
     if not data or not data.get('name') or not data.get('base_url'):
         return jsonify({'error': 'Name and URL are required'}), 400
 
+    adapter = data.get('adapter')
+    if adapter is not None and not isinstance(adapter, str):
+        return jsonify({'error': 'Adapter must be a string'}), 400
+    if adapter is not None and adapter.lower() not in PROVIDER_ADAPTERS:
+        return jsonify({'error': f"Unknown adapter {adapter}. Available: {', '.join(sorted(PROVIDER_ADAPTERS))}"}), 400
+    settings = data.get('settings')
+    if settings is not None and not isinstance(settings, dict):
+        return jsonify({'error': 'Settings must be an object'}), 400
+    settings_error = validate_settings(settings) if settings else None
+    if settings_error:
+        return jsonify({'error': settings_error}), 400
+
     if JobResource.query.filter_by(name=data['name']).first():
         return jsonify({'error': f"Resource {data['name']} already exists"}), 409
 
@@ -270,7 +408,9 @@ def add_job_resource():
         name=data['name'],
         base_url=data['base_url'],
         is_active=data.get('is_active', True),
-        api_key_required=data.get('api_key_required', False)
+        api_key_required=data.get('api_key_required', False),
+        adapter=adapter.lower() if adapter else None,
+        settings=json.dumps(settings) if settings else None
     )
 
     try:
@@ -283,8 +423,8 @@ def add_job_resource():
         return jsonify({'error': 'Database error occurred'}), 500
 
 
-# обрабатывает поисковый запрос и список выбранных ресурсов, выполняя вызов к Jooble API
-@app.route('/api/search', methods=['POST'])
+# обрабатывает поисковый запрос и список выбранных ресурсов, параллельно опрашивая все выбранные ресурсы
+@bp.route('/api/search', methods=['POST'])
 @jwt_required()
 def search_jobs():
     """
@@ -318,9 +458,37 @@ def search_jobs():
               type: string
               description: Уровень соискателя (например, средний).
               example: средний
+            limit:
+              type: integer
+              description: Размер страницы (по умолчанию SEARCH_DEFAULT_LIMIT, не больше SEARCH_MAX_LIMIT).
+              example: 20
+            offset:
+              type: integer
+              description: Смещение страницы в списке, отсортированном по релевантности.
+              example: 0
+            stream:
+              type: string
+              enum: [ndjson, sse]
+              description: >
+                Потоковый ответ (или заголовок Accept application/x-ndjson / text/event-stream):
+                события 'jobs' с вакансиями каждой пачки по мере скоринга и итоговое 'done'
+                с полями total, jobs (страница), providers, local и error, если ни один ресурс не ответил.
     responses:
       200:
-        description: Успешный список найденных вакансий.
+        description: Страница найденных вакансий. Общее число подходящих вакансий - в заголовке X-Total-Count.
+        headers:
+          X-Total-Count:
+            type: integer
+            description: Общее число вакансий, прошедших матчинг.
+          X-Providers-Timed-Out:
+            type: string
+            description: Ресурсы (через запятую), не ответившие вовремя.
+          X-Providers-Failed:
+            type: string
+            description: Ресурсы (через запятую), вернувшие ошибку.
+          X-Providers-Local:
+            type: string
+            description: Ресурсы (через запятую), вакансии которых взяты из локальной таблицы JobPosting.
         schema:
           type: array
           items:
@@ -330,8 +498,17 @@ def search_jobs():
                 type: string
               company:
                 type: string
+              relevance_score:
+                type: number
+              excluded_matches:
+                type: array
+                items:
+                  type: string
+                description: Исключаемые навыки, найденные в вакансии (за каждый - штраф 10%).
       400:
-        description: Отсутствуют обязательные параметры поиска.
+        description: Отсутствуют обязательные параметры поиска, выбраны несуществующие ресурсы или некорректны limit/offset.
+      502:
+        description: Ни один из выбранных ресурсов не ответил.
     """
     data = request.get_json()
     term = data.get('searchTerm')
@@ -342,94 +519,218 @@ def search_jobs():
     # ... (проверка входных данных)
     if not term or not resource_ids:
         return jsonify({'error': 'Search term and at least one resource must be selected'}), 400
-
+    if not _is_int_list(resource_ids):
+        return jsonify({'error': 'resourceIds must be a list of integers'}), 400
+
+    # Пагинация: сортируем и сериализуем только одну страницу
+    page = _page_params(data)
+    if page is None:
+        return jsonify({'error': 'limit must be a positive integer and offset a non-negative integer'}), 400
+    limit, offset = page
+    try:
+        stream_format = _search_stream_format(data)
+    except ValueError:
+        return jsonify({'error': f"stream must be one of: {', '.join(SEARCH_STREAM_MIMETYPES)}"}), 400
 
     resources_to_search = JobResource.query.filter(JobResource.id.in_(resource_ids)).all()
+    unknown_ids = set(resource_ids) - {resource.id for resource in resources_to_search}
+    if unknown_ids:
+        return jsonify({'error': 'Unknown job resources', 'resourceIds': sorted(unknown_ids)}), 400
 
     # --- 1. ПОЛУЧЕНИЕ ДАННЫХ ПРОФИЛЯ ДЛЯ ИИ ---
-    user_id = get_jwt_identity()
-    profile = ApplicantProfile.query.filter_by(user_id=user_id).first()
-    role_focus = RoleFocus.query.filter_by(profile_id=profile.id).order_by(RoleFocus.date.desc()).first()
-
-    # Полный набор навыков (100% дата сет)
-    full_user_skills = [skill.name for skill in profile.skills] if profile else []
+    # Профиль и цель поиска - из кэша пользователей; навыки читаются только при промахе кэша векторов
+    user = _current_user()
+    profile_id = user.profile_id if user else None
+    role_focus = user.role_focus if user else None
+
+    # Полный набор навыков (100% дата сет), подготовленный для матчинга;
+    # матчер загружается здесь, если сервер не прогрел его при старте (matcher_loader.py)
+    matcher = get_matcher()
+    user_vector = None
+    if profile_id:
+        user_vector = profile_vector_cache.get_or_build(
+            profile_id, user.profile_updated,
+            lambda: matcher.build_profile_vector(_profile_skill_names(profile_id))
+        )
+    skills_count = user_vector.skills_count if user_vector else 0
 
-    # Исключаемые навыки
-    excluded_skills = []
-    if role_focus and role_focus.focused_skills_data:
-        focus_data = json.loads(role_focus.focused_skills_data)
-        excluded_skills = focus_data.get('excluded_skills', [])
+    # Исключаемые навыки (автомат компилируется один раз на запись RoleFocus)
+    exclusions = get_focus_automaton(role_focus)
 
-    logger.info(f"AI Input - Skills Count: {len(full_user_skills)}, Excl. Count: {len(excluded_skills)}")
+    logger.info(f"AI Input - Skills Count: {skills_count}, Excl. Count: {len(exclusions)}")
     logger.info(f"AI Input - Location: {location}, Level: {level}")
 
-    raw_jobs = [] # Массив для сырых вакансий, полученных от Jooble
+    report = FanOutReport([resource.name for resource in resources_to_search])
+    session = matcher.JobMatchSession(
+        user_vector, exclusions, logger,
+        strong_score=current_app.config['SEARCH_EARLY_STOP_SCORE'], deduplicate=current_app.config['SEARCH_DEDUP']
+    )
+    local_resources = []
+    batches = _search_batches(
+        session, report, local_resources, resources_to_search, term, location, level, offset + limit, skills_count
+    )
 
-    for resource in resources_to_search:
-        if resource.name == 'Jooble':
-            if not JOOBLE_API_KEY:
-                logger.error("JOOBLE_API_KEY is missing from environment variables.")
-                return jsonify({'error': 'Server configuration error: API key missing'}), 500
+    # Потоковый режим: вакансии отдаются пачками по мере скоринга, итоговая страница - последним событием
+    if stream_format:
+        return Response(
+            stream_with_context(_stream_search(stream_format, batches, session, report, local_resources, limit, offset)),
+            mimetype=SEARCH_STREAM_MIMETYPES[stream_format],
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
 
+    for _ in batches:
+        pass
+    _log_search_result(session, report, local_resources, limit, offset)
+    headers = report.headers()
+    headers['X-Providers-Local'] = ','.join(local_resources)
 
-            try:
-                # У Jooble нет прямого поля для level (начальный/средний), поэтому мы добавим его к ключевым словам (keywords)
-                full_keywords = f"{term} {level}"
+    if not report.any_ok:
+        return jsonify({'error': 'All selected job resources failed', 'providers': report.to_dict()}), 502, headers
 
-                # 1. Формирование запроса Jooble
-                json_data = {
-                    "keywords": full_keywords,
-                    "location": location,
-                    "page": 1
-                }
+    # Если профиль не настроен или нет вакансий, страница будет пустой
+    headers['X-Total-Count'] = str(session.total)
+    return jsonify(session.page(limit, offset)), 200, headers
 
-                jooble_url = f"{resource.base_url}{JOOBLE_API_KEY}"
 
-                # 2. Выполнение запроса
-                response = requests.post(jooble_url, json=json_data)
-                response.raise_for_status() # Обработка ошибок HTTP
-                jooble_data = response.json()
+def _search_batches(session, report, local_resources, resources_to_search, term, location, level, page_end, skills_count):
+    """
+    Генератор поиска: локальные данные и страницы внешних ресурсов скорятся по мере поступления.
+    Отдает (ресурс, вакансии пачки, прошедшие матчинг); статусы ресурсов пишутся в report,
+    ресурсы, обслуженные из локальной таблицы, - в local_resources.
+    """
+    from ingestion import find_fresh_cursor, local_postings, resource_ingested_since, fulltext_postings
+
+    # --- 2. ЛОКАЛЬНЫЕ ДАННЫЕ: ресурсы, для которых фоновая загрузка по этому запросу свежая ---
+    live_resources = resources_to_search
+    if current_app.config['SEARCH_LOCAL_FIRST']:
+        live_resources = []
+        for resource in resources_to_search:
+            cursor = find_fresh_cursor(resource.id, term, location, level, current_app.config['SEARCH_LOCAL_MAX_AGE_SECONDS'])
+            if cursor is not None:
+                local_jobs = local_postings(
+                    cursor, resource.name,
+                    current_app.config['SEARCH_LOCAL_POSTING_TTL_DAYS'], current_app.config['SEARCH_LOCAL_MAX_CANDIDATES']
+                )
+            elif resource_ingested_since(resource.id, current_app.config['SEARCH_LOCAL_MAX_AGE_SECONDS']):
+                # Запрос не загружался, но ресурс загружается: кандидаты из полнотекстового индекса
+                local_jobs = fulltext_postings(
+                    resource, term, location,
+                    current_app.config['SEARCH_LOCAL_POSTING_TTL_DAYS'], current_app.config['SEARCH_LOCAL_MAX_CANDIDATES']
+                )
+                # Слишком мало кандидатов - локальных данных по запросу нет, идем во внешний ресурс
+                if local_jobs is not None and len(local_jobs) < current_app.config['SEARCH_LOCAL_MIN_CANDIDATES']:
+                    local_jobs = None
+            else:
+                local_jobs = None
+            if local_jobs is None:
+                live_resources.append(resource)
+                continue
+            logger.info(f"Local Jobs from {resource.name}: {len(local_jobs)}")
+            report.mark(resource.name, STATUS_OK)
+            local_resources.append(resource.name)
+            if skills_count:
+                yield resource.name, session.add(local_jobs)
+
+    # --- 3. ПАРАЛЛЕЛЬНЫЙ ОПРОС ОСТАЛЬНЫХ РЕСУРСОВ (все страницы сразу) ---
+    # Повторы запросов к ресурсам не выходят за дедлайн поиска
+    deadline = time.monotonic() + current_app.config['SEARCH_DEADLINE_SECONDS']
+    tasks = []
+    for resource in live_resources:
+        provider_tasks = build_provider_tasks(
+            resource, term, location, level,
+            current_app.config['PROVIDER_TIMEOUT_SECONDS'], current_app.config['JOOBLE_PAGE_DEPTH'], deadline
+        )
+        if provider_tasks is None:
+            report.mark(resource.name, STATUS_FAILED, 'Unsupported job resource')
+            continue
+        tasks.extend(provider_tasks)
+
+    # Локальных сильных совпадений уже хватает на страницу - внешние ресурсы не нужны
+    if session.strong_matches >= page_end:
+        for name, _ in tasks:
+            report.mark(name, STATUS_SKIPPED)
+        tasks = []
+
+    # Соединение с БД возвращается в пул на время ожидания внешних ресурсов (поиск больше не читает БД)
+    db.session.close()
+
+    # --- 4. ПРИМЕНЕНИЕ ИИ-МАТЧИНГА: страницы скорятся по мере прихода ---
+    executor = get_executor(current_app.config['SEARCH_FANOUT_WORKERS'])
+    fan_out = iter_fan_out(
+        tasks, executor, current_app.config['SEARCH_DEADLINE_SECONDS'], report,
+        max_in_flight=current_app.config['SEARCH_PAGE_CONCURRENCY']
+    )
+    with closing(fan_out):
+        for provider_name, provider_jobs in fan_out:
+            # --- ЛОГИРОВАНИЕ СЫРЫХ РЕЗУЛЬТАТОВ ---
+            logger.info(f"Raw Jobs Received from {provider_name}: {len(provider_jobs)}")
+            if not skills_count:
+                continue
+            yield provider_name, session.add(provider_jobs)
+
+            # Досрочная остановка: сильных совпадений уже хватает на запрошенную страницу
+            if session.strong_matches >= page_end:
+                logger.info(f"Early stop: {session.strong_matches} strong matches after {session.jobs_seen} jobs")
+                break
+
+
+def _log_search_result(session, report, local_resources, limit, offset):
+    logger.info(f"Providers report: {report.to_dict()}, local: {local_resources}")
+    # --- ЛОГИРОВАНИЕ ФИНАЛЬНЫХ РЕЗУЛЬТАТОВ ---
+    logger.info(
+        f"Final Jobs after AI Match: {session.total} of {session.jobs_seen}, duplicates: {session.duplicates} "
+        f"(page offset={offset}, limit={limit})"
+    )
 
-                # 3. Обработка и форматирование результатов
-                if 'jobs' in jooble_data:
-                    for job in jooble_data['jobs']:
-                        # Вместо добавления в results, добавляем в raw_jobs для ИИ
-                        raw_jobs.append({
-                            'id': f"jooble_{job.get('id')}",
-                            'title': job.get('title'),
-                            'company': job.get('company'),
-                            'location': job.get('location'),
-                            'salary': job.get('salary') or 'N/A',
-                            'source': resource.name,
-                            'link': job.get('link'),
-                            'description': job.get('snippet', '') # Описание для анализа!
-                        })
 
-                    # --- 2. ЛОГИРОВАНИЕ СЫРЫХ РЕЗУЛЬТАТОВ ---
-                    logger.info(f"Raw Jobs Received from Jooble: {len(raw_jobs)}")
+# Форматы потокового ответа /api/search: поле stream в запросе или заголовок Accept
+SEARCH_STREAM_MIMETYPES = {'ndjson': 'application/x-ndjson', 'sse': 'text/event-stream'}
 
-                    # 3. ПРИМЕНЕНИЕ ИИ-МАТЧИНГА
-                    if raw_jobs and full_user_skills:
-                        final_results = ai_match_jobs(raw_jobs, full_user_skills, excluded_skills, logger)
 
-                        # --- 3. ЛОГИРОВАНИЕ ФИНАЛЬНЫХ РЕЗУЛЬТАТОВ ---
-                        logger.info(f"Final Jobs after AI Match: {len(final_results)}")
-                        # ---------------------------------------------
+def _search_stream_format(data):
+    """'ndjson', 'sse' или None (обычный JSON-ответ); ValueError при неизвестном значении stream."""
+    stream_format = data.get('stream')
+    if stream_format:
+        if stream_format not in SEARCH_STREAM_MIMETYPES:
+            raise ValueError(stream_format)
+        return stream_format
+    best = request.accept_mimetypes.best_match(['application/json'] + list(SEARCH_STREAM_MIMETYPES.values()))
+    for name, mimetype in SEARCH_STREAM_MIMETYPES.items():
+        if best == mimetype:
+            return name
+    return None
 
-                        return jsonify(final_results), 200
 
-                    # Если профиль не настроен или нет вакансий
-                    # return jsonify({'message': 'No relevant jobs found or profile incomplete'}), 200
-                    return jsonify([]), 200
+def _stream_event(stream_format, event, payload):
+    if stream_format == 'sse':
+        return f"event: {event}\ndata: {current_app.json.dumps(payload)}\n\n"
+    return current_app.json.dumps({'event': event, **payload}) + '\n'
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching data from Jooble: {e}")
-                results.append({'error': f'Jooble search failed: {e}'})
 
+def _stream_search(stream_format, batches, session, report, local_resources, limit, offset):
+    """
+    События потокового поиска: 'jobs' на каждую пачку ресурса (ее лучшие offset + limit вакансий -
+    остальные на страницу не попадут) и итоговое 'done' со страницей по всем ресурсам.
+    """
+    top_k_page = get_matcher().top_k_page
+    for source, matched in batches:
+        if matched:
+            yield _stream_event(stream_format, 'jobs', {'source': source, 'jobs': top_k_page(matched, offset + limit)})
+
+    _log_search_result(session, report, local_resources, limit, offset)
+    summary = {
+        'total': session.total,
+        'jobs': session.page(limit, offset),
+        'providers': report.to_dict(),
+        'local': local_resources,
+    }
+    if not report.any_ok:
+        summary['error'] = 'All selected job resources failed'
+    yield _stream_event(stream_format, 'done', summary)
 
 
 # Маршрут для получения или создания профиля соискателя
-@app.route('/api/profile', methods=['GET', 'POST'])
+@bp.route('/api/profile', methods=['GET', 'POST'])
 @jwt_required()
 def handle_applicant_profile():
     """
@@ -524,16 +825,20 @@ def handle_applicant_profile():
                     skill = Skill(name=skill_name)
                     db.session.add(skill)
                 profile.skills.append(skill)
+            # Изменение связи многие-ко-многим само не обновляет date_updated профиля
+            profile.date_updated = datetime.utcnow()
 
         try:
             db.session.commit()
+            profile_vector_cache.invalidate(profile.id)
+            user_cache.invalidate(user_id)
             return jsonify({'message': 'Profile updated successfully'}), 200
         except IntegrityError:
             db.session.rollback()
             return jsonify({'error': 'Error saving profile data'}), 500
 
 # Маршрут для сохранения профиля Слепого поиска
-@app.route('/api/profile/blind', methods=['POST'])
+@bp.route('/api/profile/blind', methods=['POST'])
 @jwt_required()
 def save_blind_profile():
     """
@@ -598,6 +903,7 @@ def save_blind_profile():
 
     try:
         db.session.commit()
+        user_cache.invalidate(user_id)
         return jsonify({'message': 'Blind profile saved successfully'}), 201
     except Exception as e:
         db.session.rollback()
@@ -606,7 +912,7 @@ def save_blind_profile():
 
 
 # Маршрут, который принимает список навыков для матчинга, для исключения и сохраняет их в таблицах Skill и ApplicantProfile.
-@app.route('/api/profile/skills/full', methods=['POST'])
+@bp.route('/api/profile/skills/full', methods=['POST'])
 @jwt_required()
 def save_full_skills():
     """
@@ -667,6 +973,7 @@ def save_full_skills():
                 db.session.add(skill)
 
             profile.skills.append(skill)
+        profile.date_updated = datetime.utcnow()
 
         # 3. Сохранение исключаемых навыков в RoleFocus
 
@@ -689,6 +996,8 @@ def save_full_skills():
         db.session.add(focus)
 
         db.session.commit()
+        profile_vector_cache.invalidate(profile.id)
+        user_cache.invalidate(user_id)
         return jsonify({'message': 'Full skill set and exclusions updated successfully'}), 200
 
     except Exception as e:
@@ -697,3 +1006,225 @@ def save_full_skills():
         return jsonify({'error': 'An internal error occurred'}), 500
 
 
+# Рекомендации из локальной базы вакансий без поискового запроса: профиль -> top-K по инвертированному индексу
+@bp.route('/api/recommendations', methods=['GET'])
+@jwt_required()
+def get_recommendations():
+    """
+    Вакансии из локальной базы, наиболее подходящие к навыкам профиля.
+    ---
+    tags:
+      - Поиск
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        description: Размер страницы (по умолчанию SEARCH_DEFAULT_LIMIT, не больше SEARCH_MAX_LIMIT).
+      - in: query
+        name: offset
+        type: integer
+        description: Смещение страницы в списке, отсортированном по релевантности.
+    responses:
+      200:
+        description: Страница рекомендованных вакансий (тот же формат, что у /api/search).
+        headers:
+          X-Total-Count:
+            type: integer
+            description: Число кандидатов из индекса, прошедших матчинг.
+      400:
+        description: Некорректные limit или offset.
+      404:
+        description: Профиль соискателя или его навыки не найдены.
+      503:
+        description: Индекс вакансий еще не построен.
+    """
+    page = _page_params(request.args)
+    if page is None:
+        return jsonify({'error': 'limit must be a positive integer and offset a non-negative integer'}), 400
+    limit, offset = page
+
+    user = _current_user()
+    if not user or not user.profile_id:
+        return jsonify({'message': 'Profile not found'}), 404
+    matcher = get_matcher()
+    from inverted_index import get_posting_index
+    user_vector = profile_vector_cache.get_or_build(
+        user.profile_id, user.profile_updated,
+        lambda: matcher.build_profile_vector(_profile_skill_names(user.profile_id))
+    )
+    if not user_vector.tokens:
+        return jsonify({'message': 'Profile has no skills'}), 404
+
+    index = get_posting_index()
+    if index is None:
+        return jsonify({'error': 'Recommendations index is not built yet'}), 503
+
+    # Кандидатов с запасом: часть отсеют исключения и устаревшие вакансии
+    candidates = index.top_k(user_vector.tokens, (offset + limit) * current_app.config['RECOMMENDATIONS_CANDIDATE_FACTOR'])
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config['SEARCH_LOCAL_POSTING_TTL_DAYS'])
+    postings = JobPosting.query.options(joinedload(JobPosting.resource)).filter(
+        JobPosting.id.in_([posting_id for posting_id, _ in candidates]), JobPosting.last_seen >= cutoff,
+        JobPosting.duplicate_of_id.is_(None)
+    ).all()
+    jobs = [posting.to_job_dict(posting.resource.name) for posting in postings]
+
+    session = matcher.JobMatchSession(user_vector, get_focus_automaton(user.role_focus), logger)
+    session.add(jobs)
+    logger.info(f"Recommendations: {session.total} of {len(candidates)} candidates from {index}")
+
+    return jsonify(session.page(limit, offset)), 200, {'X-Total-Count': str(session.total)}
+
+
+# Уведомления о новых вакансиях, подходящих к навыкам пользователя (создаются фоновой загрузкой)
+@bp.route('/api/notifications', methods=['GET'])
+@jwt_required()
+def get_notifications():
+    """
+    Уведомления о новых подходящих вакансиях, сначала самые свежие.
+    ---
+    tags:
+      - Уведомления
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: unread
+        type: boolean
+        description: Только непрочитанные.
+      - in: query
+        name: limit
+        type: integer
+        description: Максимальное число уведомлений (по умолчанию SEARCH_DEFAULT_LIMIT).
+    responses:
+      200:
+        description: Список уведомлений с данными вакансий. Число непрочитанных - в заголовке X-Unread-Count.
+      400:
+        description: limit - не положительное целое число.
+    """
+    user_id = get_jwt_identity()
+    limit = request.args.get('limit', current_app.config['SEARCH_DEFAULT_LIMIT'])
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, current_app.config['SEARCH_MAX_LIMIT'])
+
+    query = JobNotification.query.filter_by(user_id=user_id)
+    unread_count = query.filter_by(is_read=False).count()
+    if request.args.get('unread', '').lower() in ('1', 'true', 'yes'):
+        query = query.filter_by(is_read=False)
+    notifications = query.options(
+        joinedload(JobNotification.posting).joinedload(JobPosting.resource)
+    ).order_by(JobNotification.date_created.desc(), JobNotification.id.desc()).limit(limit).all()
+
+    return jsonify([notification.to_dict() for notification in notifications]), 200, {'X-Unread-Count': str(unread_count)}
+
+
+@bp.route('/api/notifications/read', methods=['POST'])
+@jwt_required()
+def mark_notifications_read():
+    """
+    Отметка уведомлений прочитанными.
+    ---
+    tags:
+      - Уведомления
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              description: ID уведомлений; если не указаны - отмечаются все.
+    responses:
+      200:
+        description: Число отмеченных уведомлений.
+      400:
+        description: Тело запроса - не объект или ids - не список целых чисел.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    ids = data.get('ids')
+    if ids is not None and not _is_int_list(ids):
+        return jsonify({'error': 'ids must be a list of integers'}), 400
+    query = JobNotification.query.filter_by(user_id=user_id, is_read=False)
+    if ids is not None:
+        # Пустой список ничего не отмечает: все уведомления - только без ids
+        query = query.filter(JobNotification.id.in_(ids))
+    updated = query.update({'is_read': True}, synchronize_session=False)
+    db.session.commit()
+    return jsonify({'updated': updated}), 200
+
+
+# Маршрут с внутренними метриками производительности (кэши матчинга и т.д.)
+@bp.route('/api/metrics', methods=['GET'])
+@jwt_required()
+def get_metrics():
+    """
+    Получение внутренних метрик производительности.
+    ---
+    tags:
+      - Общее
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Счетчики кэшей и других внутренних подсистем.
+        schema:
+          type: object
+          properties:
+            profile_vector_cache:
+              type: object
+              description: Размер кэша навыков профилей, попадания и промахи.
+            user_cache:
+              type: object
+              description: Кэш снимков пользователей и профилей (TTL) - попадания, промахи, истекшие и сброшенные записи.
+            text_normalizer_cache:
+              type: object
+              description: Кэш нормализованных текстов вакансий.
+            exclusion_automaton_cache:
+              type: object
+              description: Кэш скомпилированных автоматов исключаемых навыков.
+            provider_http:
+              type: object
+              description: Запросы, ошибки, повторы и загрузка пулов соединений по хостам ресурсов.
+            provider_cache:
+              type: object
+              description: Попадания в кэш ответов ресурсов (память процесса и общий диск) и промахи.
+            provider_single_flight:
+              type: object
+              description: Выполненные, объединенные (coalesced) и не дождавшиеся общего ответа до дедлайна (timed_out) одинаковые запросы к ресурсам.
+            provider_adapters:
+              type: object
+              description: Лимиты адаптеров ресурсов (одновременные запросы, token bucket) и число вызовов.
+            password_hasher:
+              type: object
+              description: Пул хеширования паролей - глубина очереди, выполняемые, отклоненные и пересчитанные хеши.
+            process:
+              type: object
+              description: Память обслужившего запрос процесса (воркера) - rss, pss и собственная uss, КБ.
+    """
+    return jsonify({
+        'profile_vector_cache': profile_vector_cache.stats(),
+        'user_cache': user_cache.stats(),
+        'text_normalizer_cache': normalizer_cache.stats(),
+        'exclusion_automaton_cache': exclusion_automaton_cache.stats(),
+        'provider_http': get_http_client().stats(),
+        'provider_cache': get_provider_cache().stats(),
+        'provider_single_flight': provider_single_flight.stats(),
+        'provider_adapters': adapters_stats(),
+        'password_hasher': get_password_hasher().stats(),
+        'process': process_memory()
+    }), 200
@@ -0,0 +1,147 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from job_providers import ProviderError
+
+logger = logging.getLogger(__name__)
+
+# Статусы ресурса в отчете о поиске
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_FAILED = 'failed'
+# Запросы не понадобились: поиск остановлен досрочно, результатов уже достаточно
+STATUS_SKIPPED = 'skipped'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def describe_error(error):
+    """
+    Безопасное описание ошибки ресурса для ответа клиенту, логов и IngestionCursor.last_error.
+    Текст исключений requests содержит URL запроса, а в URL Jooble - API-ключ, поэтому наружу
+    уходит только вид ошибки; сообщения ProviderError формирует сам код адаптеров.
+    """
+    if error is None or isinstance(error, str):
+        return error
+    if isinstance(error, ProviderError):
+        return str(error)
+    if isinstance(error, (requests.exceptions.Timeout, TimeoutError)):
+        # TimeoutError - не дождались общего запроса (singleflight) до дедлайна
+        return 'timeout'
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return 'connection error'
+    if isinstance(error, ValueError):
+        # в том числе requests.exceptions.JSONDecodeError
+        return 'invalid response'
+    if isinstance(error, requests.exceptions.RequestException):
+        return 'request error'
+    return 'internal error'
+
+
+def get_executor(max_workers):
+    """Общий пул потоков для запросов к внешним ресурсам (создается при первом поиске)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='provider-fetch')
+    return _executor
+
+
+class FanOutReport:
+    """Итог параллельного опроса ресурсов: какие ответили, не уложились во время или упали."""
+
+    def __init__(self, provider_names):
+        self.statuses = {name: None for name in provider_names}
+        self.errors = {}
+
+    def mark(self, name, status, error=None):
+        # Ресурс с несколькими задачами (страницами) считается успешным, если успешна хотя бы одна
+        current = self.statuses.get(name)
+        if current == STATUS_OK or (status == STATUS_SKIPPED and current is not None):
+            return
+        self.statuses[name] = status
+        if error is not None:
+            self.errors[name] = describe_error(error)
+
+    def names_with(self, status):
+        return [name for name, value in self.statuses.items() if value == status]
+
+    @property
+    def any_ok(self):
+        return STATUS_OK in self.statuses.values()
+
+    def to_dict(self):
+        return {
+            'ok': self.names_with(STATUS_OK),
+            'timed_out': self.names_with(STATUS_TIMEOUT),
+            'failed': self.names_with(STATUS_FAILED),
+            'skipped': self.names_with(STATUS_SKIPPED),
+            'errors': self.errors,
+        }
+
+    def headers(self):
+        """Заголовки ответа /api/search со списком проблемных ресурсов."""
+        return {
+            'X-Providers-Timed-Out': ','.join(self.names_with(STATUS_TIMEOUT)),
+            'X-Providers-Failed': ','.join(self.names_with(STATUS_FAILED)),
+        }
+
+
+def iter_fan_out(tasks, executor, deadline, report, max_in_flight=None):
+    """
+    Выполняет задачи [(имя ресурса, функция без аргументов), ...] параллельно, не более
+    max_in_flight одновременно, и отдает (имя ресурса, вакансии) по мере готовности.
+
+    Всё, что не завершилось за deadline секунд, отменяется и отмечается в report как timeout;
+    ошибки отдельных задач не прерывают поиск. Если потребитель закрывает генератор
+    досрочно (результатов уже достаточно), оставшиеся задачи отменяются как skipped.
+    """
+    queued = deque(tasks)
+    futures = {}
+    deadline_at = time.monotonic() + deadline
+    leftover_status = STATUS_TIMEOUT
+
+    def submit_queued():
+        while queued and (max_in_flight is None or len(futures) < max_in_flight):
+            name, fetch = queued.popleft()
+            futures[executor.submit(fetch)] = name
+
+    try:
+        submit_queued()
+        while futures:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Search deadline of {deadline}s exceeded")
+                break
+            done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    jobs = future.result()
+                except (requests.exceptions.Timeout, TimeoutError) as e:
+                    logger.warning(f"Provider {name} timed out: {describe_error(e)}")
+                    report.mark(name, STATUS_TIMEOUT, e)
+                except Exception as e:
+                    logger.error(f"Error fetching data from {name}: {describe_error(e)} ({e.__class__.__name__})")
+                    report.mark(name, STATUS_FAILED, e)
+                else:
+                    report.mark(name, STATUS_OK)
+                    yield name, jobs
+            submit_queued()
+    except GeneratorExit:
+        leftover_status = STATUS_SKIPPED
+        raise
+    finally:
+        # Сюда попадаем и при превышении дедлайна, и при досрочной остановке потребителем
+        for future, name in futures.items():
+            future.cancel()
+            report.mark(name, leftover_status, 'deadline exceeded' if leftover_status == STATUS_TIMEOUT else None)
+        for name, _ in queued:
+            report.mark(name, leftover_status, 'deadline exceeded' if leftover_status == STATUS_TIMEOUT else None)
@@ -0,0 +1,69 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных запросов (single-flight).
+
+    Первый поток с данным ключом выполняет функцию, остальные потоки с тем же ключом
+    ждут и получают тот же результат (или то же исключение) без собственного вызова.
+    Ожидание ограничено timeout: по его истечении ожидающий поток получает TimeoutError,
+    а первый поток продолжает работу и отдает результат тем, кто еще ждет.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        self.timed_out = 0
+
+    def do(self, key, fn, timeout=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self.timed_out += 1
+                raise TimeoutError(f"Shared call did not finish in {timeout:.2f}s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'timed_out': self.timed_out,
+                'in_flight': len(self._calls),
+            }
+
+
+# Общий для процесса single-flight перед вызовами внешних ресурсов
+provider_single_flight = SingleFlight()
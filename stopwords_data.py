@@ -0,0 +1,506 @@
+# Сгенерировано командой 'flask matcher build-stopwords' из NLTK (english) и stop-words (polish).
+# Не редактировать вручную: изменения вносятся в text_normalizer.load_source_stopwords.
+STOPWORDS = frozenset((
+    'a',
+    'about',
+    'above',
+    'aby',
+    'ach',
+    'acz',
+    'aczkolwiek',
+    'after',
+    'again',
+    'against',
+    'ain',
+    'aj',
+    'albo',
+    'ale',
+    'ależ',
+    'all',
+    'am',
+    'an',
+    'and',
+    'ani',
+    'any',
+    'are',
+    'aren',
+    "aren't",
+    'as',
+    'at',
+    'aż',
+    'bardziej',
+    'bardzo',
+    'be',
+    'because',
+    'been',
+    'before',
+    'being',
+    'below',
+    'between',
+    'bez',
+    'bo',
+    'both',
+    'bowiem',
+    'but',
+    'by',
+    'byli',
+    'bym',
+    'bynajmniej',
+    'być',
+    'był',
+    'była',
+    'było',
+    'były',
+    'będzie',
+    'będą',
+    'cali',
+    'can',
+    'cała',
+    'cały',
+    'chce',
+    'choć',
+    'ci',
+    'ciebie',
+    'cię',
+    'co',
+    'cokolwiek',
+    'coraz',
+    'couldn',
+    "couldn't",
+    'coś',
+    'czasami',
+    'czasem',
+    'czemu',
+    'czy',
+    'czyli',
+    'często',
+    'd',
+    'daleko',
+    'did',
+    'didn',
+    "didn't",
+    'dla',
+    'dlaczego',
+    'dlatego',
+    'do',
+    'dobrze',
+    'does',
+    'doesn',
+    "doesn't",
+    'doing',
+    'dokąd',
+    'don',
+    "don't",
+    'down',
+    'dość',
+    'dr',
+    'during',
+    'duå¼o',
+    'dużo',
+    'dwa',
+    'dwaj',
+    'dwie',
+    'dwoje',
+    'dzisiaj',
+    'dziś',
+    'each',
+    'few',
+    'for',
+    'from',
+    'further',
+    'gdy',
+    'gdyby',
+    'gdyż',
+    'gdzie',
+    'gdziekolwiek',
+    'gdzieś',
+    'go',
+    'godz',
+    'hab',
+    'had',
+    'hadn',
+    "hadn't",
+    'has',
+    'hasn',
+    "hasn't",
+    'have',
+    'haven',
+    "haven't",
+    'having',
+    'he',
+    'her',
+    'here',
+    'hers',
+    'herself',
+    'him',
+    'himself',
+    'his',
+    'how',
+    'i',
+    'ich',
+    'if',
+    'ii',
+    'iii',
+    'ile',
+    'im',
+    'in',
+    'inna',
+    'inne',
+    'inny',
+    'innych',
+    'into',
+    'inż',
+    'is',
+    'isn',
+    "isn't",
+    'it',
+    "it's",
+    'its',
+    'itself',
+    'iv',
+    'ix',
+    'iż',
+    'ja',
+    'jak',
+    'jakaś',
+    'jakby',
+    'jaki',
+    'jakichś',
+    'jakie',
+    'jakiś',
+    'jakiż',
+    'jakkolwiek',
+    'jako',
+    'jakoś',
+    'je',
+    'jeden',
+    'jedna',
+    'jednak',
+    'jednakże',
+    'jedno',
+    'jednym',
+    'jedynie',
+    'jego',
+    'jej',
+    'jemu',
+    'jest',
+    'jestem',
+    'jeszcze',
+    'jeå¼eli',
+    'jeå›li',
+    'jeśli',
+    'jeżeli',
+    'just',
+    'juå¼',
+    'już',
+    'jä…',
+    'ją',
+    'kaå¼dy',
+    'każdy',
+    'kiedy',
+    'kierunku',
+    'kilka',
+    'kilku',
+    'kimś',
+    'kto',
+    'ktokolwiek',
+    'ktoś',
+    'która',
+    'które',
+    'którego',
+    'której',
+    'który',
+    'których',
+    'którym',
+    'którzy',
+    'ku',
+    'lat',
+    'lecz',
+    'll',
+    'lub',
+    'm',
+    'ma',
+    'mają',
+    'mam',
+    'mamy',
+    'mało',
+    'me',
+    'mgr',
+    'mi',
+    'miał',
+    'mightn',
+    "mightn't",
+    'mimo',
+    'między',
+    'mnie',
+    'mną',
+    'mogą',
+    'moi',
+    'moim',
+    'moja',
+    'moje',
+    'more',
+    'most',
+    'może',
+    'możliwe',
+    'można',
+    'mu',
+    'musi',
+    'mustn',
+    "mustn't",
+    'my',
+    'myself',
+    'mój',
+    'na',
+    'nad',
+    'nam',
+    'nami',
+    'nas',
+    'nasi',
+    'nasz',
+    'nasza',
+    'nasze',
+    'naszego',
+    'naszych',
+    'natomiast',
+    'natychmiast',
+    'nawet',
+    'needn',
+    "needn't",
+    'nic',
+    'nich',
+    'nie',
+    'niech',
+    'niego',
+    'niej',
+    'niemu',
+    'nigdy',
+    'nim',
+    'nimi',
+    'nią',
+    'niż',
+    'no',
+    'nor',
+    'not',
+    'now',
+    'nowe',
+    'np',
+    'nr',
+    'o',
+    'o.o.',
+    'obok',
+    'od',
+    'of',
+    'off',
+    'ok',
+    'około',
+    'on',
+    'ona',
+    'once',
+    'one',
+    'oni',
+    'only',
+    'ono',
+    'or',
+    'oraz',
+    'other',
+    'oto',
+    'our',
+    'ours',
+    'ourselves',
+    'out',
+    'over',
+    'own',
+    'owszem',
+    'pan',
+    'pana',
+    'pani',
+    'pl',
+    'po',
+    'pod',
+    'podczas',
+    'pomimo',
+    'ponad',
+    'ponieważ',
+    'powinien',
+    'powinna',
+    'powinni',
+    'powinno',
+    'poza',
+    'prawie',
+    'prof',
+    'przecież',
+    'przed',
+    'przede',
+    'przedtem',
+    'przez',
+    'przy',
+    'raz',
+    'razie',
+    're',
+    'roku',
+    'również',
+    's',
+    'sam',
+    'sama',
+    'same',
+    'shan',
+    "shan't",
+    'she',
+    "she's",
+    'should',
+    "should've",
+    'shouldn',
+    "shouldn't",
+    'się',
+    'skąd',
+    'so',
+    'sobie',
+    'sobą',
+    'some',
+    'sposób',
+    'such',
+    'swoje',
+    'są',
+    't',
+    'ta',
+    'tak',
+    'taka',
+    'taki',
+    'takich',
+    'takie',
+    'także',
+    'tam',
+    'te',
+    'tego',
+    'tej',
+    'tel',
+    'temu',
+    'ten',
+    'teraz',
+    'też',
+    'than',
+    'that',
+    "that'll",
+    'the',
+    'their',
+    'theirs',
+    'them',
+    'themselves',
+    'then',
+    'there',
+    'these',
+    'they',
+    'this',
+    'those',
+    'through',
+    'to',
+    'tobie',
+    'tobą',
+    'too',
+    'toteż',
+    'totobą',
+    'trzeba',
+    'tu',
+    'tutaj',
+    'twoi',
+    'twoim',
+    'twoja',
+    'twoje',
+    'twym',
+    'twój',
+    'ty',
+    'tych',
+    'tylko',
+    'tym',
+    'tys',
+    'tzw',
+    'tę',
+    'u',
+    'ul',
+    'under',
+    'until',
+    'up',
+    've',
+    'very',
+    'vi',
+    'vii',
+    'viii',
+    'vol',
+    'w',
+    'wam',
+    'wami',
+    'was',
+    'wasi',
+    'wasn',
+    "wasn't",
+    'wasz',
+    'wasza',
+    'wasze',
+    'we',
+    'według',
+    'were',
+    'weren',
+    "weren't",
+    'what',
+    'when',
+    'where',
+    'which',
+    'while',
+    'who',
+    'whom',
+    'why',
+    'wie',
+    'wiele',
+    'wielu',
+    'will',
+    'with',
+    'więc',
+    'więcej',
+    'won',
+    "won't",
+    'wouldn',
+    "wouldn't",
+    'wszyscy',
+    'wszystkich',
+    'wszystkie',
+    'wszystkim',
+    'wszystko',
+    'wtedy',
+    'www',
+    'wy',
+    'właśnie',
+    'wśród',
+    'xi',
+    'xii',
+    'xiii',
+    'xiv',
+    'xv',
+    'y',
+    'you',
+    "you'd",
+    "you'll",
+    "you're",
+    "you've",
+    'your',
+    'yours',
+    'yourself',
+    'yourselves',
+    'z',
+    'za',
+    'zapewne',
+    'zawsze',
+    'zaś',
+    'ze',
+    'zeznowu',
+    'znowu',
+    'znów',
+    'został',
+    'zł',
+    'żaden',
+    'żadna',
+    'żadne',
+    'żadnych',
+    'że',
+    'żeby',
+))
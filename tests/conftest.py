@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+
+# Модули проекта лежат в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from config import Config
+from extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        JWT_SECRET_KEY = 'test-secret-key-for-jwt-signing-0123456789'
+        BCRYPT_LOG_ROUNDS = 4
+        PROVIDER_CACHE_PATH = str(tmp_path / 'provider_cache.sqlite3')
+        POSTING_INDEX_PATH = str(tmp_path / 'posting_index')
+        MATCHER_IDF_MODEL_PATH = str(tmp_path / 'idf_model')
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    """Список SQL-запросов, выполненных движком приложения, пока активна фикстура."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
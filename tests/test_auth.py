@@ -0,0 +1,80 @@
+import pytest
+
+import password_hasher
+from password_hasher import HasherBusy
+
+USER = {'username': 'Alice', 'email': 'Alice@Example.com', 'password': 'secret'}
+
+
+def register(client, **overrides):
+    return client.post('/register', json=dict(USER, **overrides))
+
+
+def test_register_single_statement(client, statements):
+    response = register(client)
+
+    assert response.status_code == 201
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith('INSERT')
+
+
+@pytest.mark.parametrize('overrides', [
+    {},
+    {'username': 'ALICE', 'email': 'other@example.com'},
+    {'username': 'other', 'email': 'alice@example.COM'},
+])
+def test_duplicate_register_single_statement(client, statements, overrides):
+    register(client)
+    statements.clear()
+
+    response = register(client, **overrides)
+
+    assert response.status_code == 409
+    assert len(statements) == 1
+
+
+def test_duplicate_register_conflict_when_hasher_busy(client, monkeypatch):
+    register(client)
+
+    def busy(password):
+        raise HasherBusy('queue is full')
+
+    monkeypatch.setattr(password_hasher.get_password_hasher(), 'hash', busy)
+
+    assert register(client, username='alice').status_code == 409
+    response = register(client, username='bob', email='bob@example.com')
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+
+
+@pytest.mark.parametrize('login', ['alice', 'ALICE@example.com'])
+def test_login_single_statement(client, statements, login):
+    register(client)
+    statements.clear()
+
+    response = client.post('/login', json={'username_or_email': login, 'password': 'secret'})
+
+    assert response.status_code == 200
+    assert response.json['username'] == 'Alice'
+    assert len(statements) == 1
+
+
+def test_login_wrong_password_single_statement(client, statements):
+    register(client)
+    statements.clear()
+
+    response = client.post('/login', json={'username_or_email': 'alice', 'password': 'wrong'})
+
+    assert response.status_code == 401
+    assert len(statements) == 1
+
+
+def test_login_token_claims(app, client):
+    from flask_jwt_extended import decode_token
+
+    register(client)
+    token = client.post('/login', json={'username_or_email': 'alice', 'password': 'secret'}).json['access_token']
+
+    claims = decode_token(token)
+    assert claims['username'] == 'Alice'
+    assert 'profile_id' not in claims
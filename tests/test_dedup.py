@@ -0,0 +1,51 @@
+import logging
+
+import ai_matcher
+from dedup import NearDuplicateFilter
+
+DESCRIPTION = (
+    'We are looking for an experienced Python developer to join our backend team. '
+    'You will build REST APIs with Flask and PostgreSQL, write tests and review code.'
+)
+
+
+def job(job_id, location, description=DESCRIPTION):
+    return {'id': job_id, 'title': 'Python developer', 'company': 'ACME', 'location': location, 'description': description}
+
+
+def test_same_posting_in_other_city_is_kept():
+    duplicates = NearDuplicateFilter()
+
+    unique = duplicates.filter([job('1', 'Berlin'), job('2', 'Munich'), job('3', ' berlin ')])
+
+    assert [item['id'] for item in unique] == ['1', '2']
+    assert duplicates.duplicates == 1
+
+
+def test_near_duplicate_text_is_merged():
+    duplicates = NearDuplicateFilter()
+
+    unique = duplicates.filter([job('1', 'Berlin'), job('2', 'Berlin', DESCRIPTION + ' Apply now')])
+
+    assert [item['id'] for item in unique] == ['1']
+
+
+def test_session_normalizes_batch_once(monkeypatch):
+    calls = []
+    normalize_many = ai_matcher.normalize_many
+
+    def counting_normalize_many(texts):
+        calls.append(len(texts))
+        return normalize_many(texts)
+
+    monkeypatch.setattr(ai_matcher, 'normalize_many', counting_normalize_many)
+    user_vector = ai_matcher.build_profile_vector(['Python', 'Flask'])
+    calls.clear()
+    exclusions = ai_matcher.ExclusionAutomaton([])
+    session = ai_matcher.JobMatchSession(user_vector, exclusions, logging.getLogger(__name__), deduplicate=True)
+
+    session.add([job('1', 'Berlin'), job('2', 'Berlin'), job('3', 'Munich')])
+
+    assert calls == [3]
+    assert session.duplicates == 1
+    assert sorted(item['id'] for item in session.matched_jobs) == ['1', '3']
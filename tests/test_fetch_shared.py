@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+import provider_cache
+from job_providers import fetch_shared
+from provider_cache import ProviderResponseCache
+from singleflight import SingleFlight
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ProviderResponseCache(ttl=60, disk_path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(provider_cache, 'provider_response_cache', cache)
+    return cache
+
+
+def test_fetch_shared_counts_single_miss(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'jobs': []}
+
+    assert fetch_shared('key', fetch) == {'jobs': []}
+    assert fetch_shared('key', fetch) == {'jobs': []}
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert stats['misses'] == 1
+    assert stats['memory_hits'] == 1
+
+
+def test_follower_stops_waiting_at_timeout():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    leader = threading.Thread(target=single_flight.do, args=('key', slow))
+    leader.start()
+    started.wait(5)
+
+    wait_started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        single_flight.do('key', slow, timeout=0.1)
+    assert time.monotonic() - wait_started < 1
+
+    release.set()
+    leader.join(5)
+    assert single_flight.stats() == {'executed': 1, 'coalesced': 1, 'timed_out': 1, 'in_flight': 0}
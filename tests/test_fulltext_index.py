@@ -0,0 +1,40 @@
+import pytest
+
+from extensions import db
+from fulltext_index import get_fulltext_index, like_contains
+from models import JobPosting, JobResource
+
+
+@pytest.fixture
+def index(app):
+    index = get_fulltext_index(db.engine)
+    index.ensure()
+    resource = JobResource(name='Load', base_url='local', adapter='mock')
+    db.session.add(resource)
+    db.session.flush()
+    for number, location in enumerate(['Kraków', 'KRAKÓW, Poland', 'Львів', 'Berlin', 'Remote 100%', 'Remote 1000']):
+        db.session.add(JobPosting(
+            resource_id=resource.id, external_id=f'job-{number}', title='Python developer',
+            location=location, content_hash=str(number)
+        ))
+    db.session.commit()
+    return index
+
+
+def locations(index, location):
+    ids = [posting_id for posting_id, _ in index.candidate_ids('python', 10, location=location)]
+    return sorted(db.session.get(JobPosting, posting_id).location for posting_id in ids)
+
+
+def test_like_contains_escapes_wildcards():
+    assert like_contains('100%_a\\b') == '%100\\%\\_a\\\\b%'
+
+
+def test_location_case_insensitive_non_ascii(index):
+    assert locations(index, 'kraków') == ['KRAKÓW, Poland', 'Kraków']
+    assert locations(index, 'ЛЬВІВ') == ['Львів']
+
+
+def test_location_wildcards_are_literal(index):
+    assert locations(index, '100%') == ['Remote 100%']
+    assert locations(index, '_') == []
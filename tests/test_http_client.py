@@ -0,0 +1,82 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_client import ProviderHttpClient
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    calls = 0
+    delay = 0.3
+    status = 200
+
+    def _respond(self):
+        type(self).calls += 1
+        time.sleep(self.delay)
+        self.send_response(self.status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    SlowHandler.calls = 0
+    SlowHandler.delay = 0.3
+    SlowHandler.status = 200
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_post_read_timeout_is_not_retried(server):
+    client = ProviderHttpClient(max_retries=2, backoff_base=0.01)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post(server, json={}, timeout=0.1)
+
+    assert SlowHandler.calls == 1
+
+
+def test_get_read_timeout_is_retried(server):
+    client = ProviderHttpClient(max_retries=2, backoff_base=0.01)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get(server, timeout=0.1)
+
+    assert SlowHandler.calls == 3
+
+
+def test_retries_stop_at_deadline(server):
+    SlowHandler.delay = 0
+    SlowHandler.status = 503
+    client = ProviderHttpClient(max_retries=100, backoff_base=0.2, backoff_max=0.2)
+
+    started = time.monotonic()
+    response = client.get(server, deadline=started + 0.5)
+
+    assert response.status_code == 503
+    assert time.monotonic() - started < 0.5
+    assert SlowHandler.calls < 100
+    assert client.stats()['hosts'][server.split('/')[2]]['deadline_exceeded'] == 1
+
+
+def test_attempt_timeout_capped_by_deadline(server):
+    client = ProviderHttpClient(max_retries=2, backoff_base=0.01)
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(server, timeout=5, deadline=started + 0.2)
+
+    assert time.monotonic() - started < 0.3
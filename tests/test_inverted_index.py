@@ -0,0 +1,62 @@
+import numpy as np
+
+from inverted_index import PostingInvertedIndex
+
+DOCUMENTS = {
+    1: ['python', 'django', 'sql'],
+    2: ['python', 'flask'],
+    3: ['java', 'spring', 'sql'],
+    4: ['excel', 'sales'],
+    5: ['python', 'python', 'sql', 'docker'],
+}
+
+
+def cosine_top_k(index, query, k):
+    """Эталон: косинус по плотным векторам всех вакансий индекса."""
+    query_vector = np.zeros(len(index.terms))
+    for weight, term in index._query_terms(query):
+        query_vector[term] = weight
+    scores = {}
+    for term in range(len(index.terms)):
+        start, end = index.offsets[term], index.offsets[term + 1]
+        for doc_id, weight in zip(index.doc_ids[start:end], index.weights[start:end]):
+            scores[int(doc_id)] = scores.get(int(doc_id), 0.0) + query_vector[term] * float(weight)
+    ranked = sorted(((doc_id, score) for doc_id, score in scores.items() if score > 0), key=lambda x: (-x[1], x[0]))
+    return [(doc_id, round(score * 100, 2)) for doc_id, score in ranked[:k]]
+
+
+def test_top_k_matches_cosine():
+    index = PostingInvertedIndex.build(DOCUMENTS)
+
+    for query in (['python', 'sql'], ['sql'], ['python', 'unknown'], ['java', 'excel', 'docker']):
+        for k in (1, 2, 10):
+            assert index.top_k(query, k) == cosine_top_k(index, query, k)
+
+
+def test_top_k_empty():
+    index = PostingInvertedIndex.build(DOCUMENTS)
+
+    assert index.top_k(['unknown'], 5) == []
+    assert index.top_k(['python'], 0) == []
+
+
+def test_idf_drift(tmp_path):
+    index = PostingInvertedIndex.build(DOCUMENTS)
+    assert index.idf_drift == 0
+
+    index = index.update({6: ['python', 'kotlin'], 4: None})
+    assert index.n_documents == 5
+    assert index.idf_drift == 2 / 5
+
+    index.save(str(tmp_path))
+    loaded = PostingInvertedIndex.load(str(tmp_path))
+    assert loaded.idf_drift == index.idf_drift
+    assert loaded.top_k(['kotlin'], 1)[0][0] == 6
+
+
+def test_top_k_sparse_doc_ids():
+    # Память top_k не зависит от наибольшего id вакансии
+    documents = {2 * 10 ** 9 + doc_id: tokens for doc_id, tokens in DOCUMENTS.items()}
+    index = PostingInvertedIndex.build(documents)
+
+    assert index.top_k(['python', 'sql'], 3) == cosine_top_k(index, ['python', 'sql'], 3)
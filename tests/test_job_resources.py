@@ -0,0 +1,46 @@
+import pytest
+
+from job_providers import JoobleAdapter, MockProviderAdapter, validate_settings
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post('/register', json={'username': 'admin', 'email': 'admin@example.com', 'password': 'secret'})
+    token = client.post('/login', json={'username_or_email': 'admin', 'password': 'secret'}).json['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.mark.parametrize('overrides', [
+    {'adapter': 3},
+    {'adapter': 'unknown'},
+    {'settings': ['cacheable']},
+    {'settings': {'cacheable': 'false'}},
+    {'settings': {'max_concurrency': 'many'}},
+])
+def test_add_resource_rejects_invalid_payload(client, auth_headers, overrides):
+    payload = dict({'name': 'Mock', 'base_url': 'mock://', 'adapter': 'mock'}, **overrides)
+    response = client.post('/api/resource/add', json=payload, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_add_resource_accepts_bool_cacheable(client, auth_headers):
+    payload = {'name': 'Mock', 'base_url': 'mock://', 'adapter': 'mock', 'settings': {'cacheable': True}}
+    response = client.post('/api/resource/add', json=payload, headers=auth_headers)
+    assert response.status_code == 201
+
+
+def test_validate_settings():
+    assert validate_settings({'cacheable': False, 'rate_per_second': 2, 'latency_ms': 0.5}) is None
+    assert validate_settings({'cacheable': 0}) is not None
+    assert validate_settings({'burst': True}) is not None
+
+
+def test_mock_adapter_ignores_non_bool_cacheable():
+    resource = {'id': 1, 'name': 'Mock', 'base_url': 'mock://', 'adapter': 'mock', 'settings': None}
+    assert MockProviderAdapter(resource, {'cacheable': 'false'}).cacheable is False
+    assert MockProviderAdapter(resource, {'cacheable': True}).cacheable is True
+
+
+def test_jooble_null_jobs():
+    resource = {'id': 1, 'name': 'Jooble', 'base_url': 'https://jooble.org/api/', 'adapter': 'jooble', 'settings': None}
+    assert JoobleAdapter(resource, {}).normalize_jobs({'jobs': None}) == []
@@ -0,0 +1,41 @@
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ai_matcher import build_profile_vector, normalize_job_texts, score_jobs
+
+PROFILES = [
+    ['Python', 'Django', 'SQL'],
+    ['Python', 'python', 'Docker', 'Kubernetes', 'AWS'],
+    ['Excel', 'Sales', 'CRM'],
+    ['Java', 'Spring Boot', 'Kraków'],
+]
+JOBS = [
+    {'title': 'Python developer', 'description': 'Python, Django and SQL. Docker is a plus; python again.'},
+    {'title': 'DevOps engineer', 'description': 'Kubernetes, Docker, AWS, Terraform. Python scripting.'},
+    {'title': 'Sales manager', 'description': 'B2B sales, CRM, Excel reports.'},
+    {'title': 'Java developer (Kraków)', 'description': 'Java 17, Spring Boot, SQL. Praca w Krakowie.'},
+    {'title': 'Designer', 'description': 'Figma'},
+    {'title': '', 'description': ''},
+]
+
+
+def two_document_cosine(user_skills_text, job_text):
+    """Исходный calculate_relevance: TF-IDF и косинус по паре "профиль + вакансия"."""
+    if not job_text:
+        return 0.0
+    vectors = TfidfVectorizer().fit_transform([user_skills_text, job_text])
+    return round(cosine_similarity(vectors[0], vectors[1])[0][0] * 100, 2)
+
+
+@pytest.mark.parametrize('skills', PROFILES)
+def test_legacy_scores_match_two_document_tfidf(skills):
+    profile = build_profile_vector(skills)
+    normalized_jobs = normalize_job_texts(JOBS)
+
+    scores, _ = score_jobs(profile.tokens, [tokens for _, tokens in normalized_jobs], mode='legacy')
+
+    expected = [two_document_cosine(profile.text, text) for text, _ in normalized_jobs]
+    # Допуск - только на округление до 2 знаков
+    assert list(scores) == pytest.approx(expected, abs=0.01)
+    assert any(expected)
@@ -0,0 +1,59 @@
+import pytest
+
+from extensions import db
+from models import JobNotification, JobPosting, JobResource
+
+
+@pytest.fixture
+def auth(client):
+    client.post('/register', json={'username': 'alice', 'email': 'alice@example.com', 'password': 'secret'})
+    token = client.post('/login', json={'username_or_email': 'alice', 'password': 'secret'}).json['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def notifications(app, auth):
+    resource = JobResource(name='Load', base_url='local', adapter='mock')
+    db.session.add(resource)
+    db.session.flush()
+    for number in range(3):
+        posting = JobPosting(
+            resource_id=resource.id, external_id=f'job-{number}', title=f'Python developer {number}',
+            content_hash=str(number)
+        )
+        db.session.add(posting)
+        db.session.flush()
+        db.session.add(JobNotification(user_id=1, posting_id=posting.id, relevance_score=50.0))
+    db.session.commit()
+    return JobNotification.query.order_by(JobNotification.id).all()
+
+
+@pytest.mark.parametrize('limit', ['0', '-1', 'abc', ''])
+def test_notifications_invalid_limit(client, auth, limit):
+    response = client.get(f'/api/notifications?limit={limit}', headers=auth)
+
+    assert response.status_code == 400
+
+
+def test_notifications_limit(client, auth, notifications):
+    response = client.get('/api/notifications?limit=2', headers=auth)
+
+    assert response.status_code == 200
+    assert len(response.json) == 2
+    assert response.headers['X-Unread-Count'] == '3'
+
+
+@pytest.mark.parametrize('body', [{'ids': 'abc'}, {'ids': [{'a': 1}]}, {'ids': [True]}, {'ids': 1}, [1, 2]])
+def test_mark_read_invalid_ids(client, auth, notifications, body):
+    response = client.post('/api/notifications/read', json=body, headers=auth)
+
+    assert response.status_code == 400
+    assert JobNotification.query.filter_by(is_read=False).count() == 3
+
+
+def test_mark_read_ids(client, auth, notifications):
+    response = client.post('/api/notifications/read', json={'ids': [notifications[0].id]}, headers=auth)
+
+    assert response.json == {'updated': 1}
+    assert client.post('/api/notifications/read', json={'ids': []}, headers=auth).json == {'updated': 0}
+    assert client.post('/api/notifications/read', headers=auth).json == {'updated': 2}
@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture
+def auth(client):
+    client.post('/register', json={'username': 'alice', 'email': 'alice@example.com', 'password': 'secret'})
+    token = client.post('/login', json={'username_or_email': 'alice', 'password': 'secret'}).json['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.mark.parametrize('page', [
+    {'limit': 0}, {'limit': -1}, {'limit': 'abc'}, {'limit': True}, {'limit': 2.5}, {'offset': -1}, {'offset': ''},
+])
+def test_search_invalid_page(client, auth, page):
+    body = dict({'searchTerm': 'python', 'resourceIds': [1]}, **page)
+
+    response = client.post('/api/search', json=body, headers=auth)
+
+    assert response.status_code == 400
+    assert 'limit' in response.json['error']
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=-5', 'limit=', 'offset=-1', 'offset=x'])
+def test_recommendations_invalid_page(client, auth, query):
+    response = client.get(f'/api/recommendations?{query}', headers=auth)
+
+    assert response.status_code == 400
@@ -0,0 +1,31 @@
+import logging
+
+import pytest
+
+from ai_matcher import ai_match_jobs
+from exclusion_matcher import ExclusionAutomaton
+from percolator import ProfileMatrix
+
+SKILLS = ['Python', 'Django', 'SQL', 'Docker']
+JOBS = [
+    {'id': 1, 'title': 'Python developer', 'description': 'Python, Django and SQL. Docker is a plus.'},
+    {'id': 2, 'title': 'Backend engineer', 'description': 'Django, SQL, Docker, Kubernetes.'},
+    {'id': 3, 'title': 'Java developer', 'description': 'Spring and SQL.'},
+]
+
+
+def test_duplicate_exclusions_form_one_pattern():
+    assert ExclusionAutomaton(['Python', 'python', ' PYTHON ']).find('python django') == ['Python']
+
+
+@pytest.mark.parametrize('excluded', [['Python'], ['Python', 'python'], []])
+def test_percolator_matches_ai_match_jobs(excluded):
+    expected = {
+        job['id']: job['relevance_score']
+        for job in ai_match_jobs([dict(job) for job in JOBS], SKILLS, excluded, logging.getLogger(__name__))
+    }
+    matrix = ProfileMatrix([(7, 70, SKILLS, excluded)])
+    actual = {JOBS[row]['id']: score for row, _, _, score in matrix.match(JOBS, min_score=0.01)}
+
+    assert actual == pytest.approx(expected)
+    assert expected
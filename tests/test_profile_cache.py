@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from profile_cache import ProfileVectorCache
+
+UPDATED = datetime(2026, 1, 1)
+
+
+def test_build_during_invalidate_is_not_cached():
+    cache = ProfileVectorCache()
+
+    def build():
+        # Навыки сохранены и кэш сброшен, пока строился вектор по старым навыкам
+        cache.invalidate(1)
+        return ['old']
+
+    assert cache.get_or_build(1, UPDATED, build) == ['old']
+    assert cache.get(1, UPDATED) is None
+    assert cache.stats()['stale_puts'] == 1
+
+
+def test_put_keeps_newer_version():
+    cache = ProfileVectorCache()
+    newer = UPDATED + timedelta(seconds=1)
+    cache.put(1, newer, ['new'])
+
+    cache.put(1, UPDATED, ['old'])
+
+    assert cache.get(1, newer) == ['new']
+
+
+def test_get_or_build_caches():
+    cache = ProfileVectorCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return ['python']
+
+    cache.get_or_build(1, UPDATED, build)
+    cache.get_or_build(1, UPDATED, build)
+
+    assert len(calls) == 1
+    assert cache.get_or_build(1, UPDATED + timedelta(seconds=1), build) == ['python']
+    assert len(calls) == 2
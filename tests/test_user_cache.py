@@ -0,0 +1,35 @@
+from user_cache import UserCache, UserSnapshot
+
+SNAPSHOT = UserSnapshot(1, 'alice', None, None, None)
+
+
+def test_load_during_invalidate_is_not_cached():
+    cache = UserCache()
+
+    def load(user_id):
+        # Профиль сохранен и кэш сброшен, пока читался старый снимок
+        cache.invalidate(user_id)
+        return SNAPSHOT
+
+    assert cache.get_or_load('1', load) == SNAPSHOT
+    assert cache.get(1) is None
+    assert cache.stats()['stale_puts'] == 1
+
+
+def test_get_or_load_caches():
+    cache = UserCache()
+    loads = []
+
+    def load(user_id):
+        loads.append(user_id)
+        return SNAPSHOT
+
+    assert cache.get_or_load('1', load) == SNAPSHOT
+    assert cache.get_or_load(1, load) == SNAPSHOT
+    assert len(loads) == 1
+
+
+def test_missing_user_is_not_cached():
+    cache = UserCache()
+    assert cache.get_or_load(1, lambda user_id: None) is None
+    assert cache.stats()['size'] == 0
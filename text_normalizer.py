@@ -0,0 +1,160 @@
+import os
+import re
+import hashlib
+import threading
+import py_compile
+from collections import OrderedDict
+
+
+def load_source_stopwords():
+    """
+    Стоп-слова для всех поддерживаемых языков из исходных пакетов (импорт nltk и чтение корпуса - медленно,
+    поэтому процесс берет их из собранного модуля stopwords_data.py).
+    """
+    from nltk.corpus import stopwords
+    from stop_words import get_stop_words
+    words = set()
+    # 1. Английский (из NLTK)
+    words.update(stopwords.words('english'))
+    # 2. Польский (из stop-words)
+    words.update(get_stop_words('polish'))
+    # 3. Украинский (поскольку встроенных нет, можно добавить слова-заглушки или использовать внешний список)
+    # Для простоты, пока используем только то, что есть.
+    # Если матчинг по UA будет плохой, добавим внешний список вручную.
+    return words
+
+
+STOPWORDS_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stopwords_data.py')
+
+
+def build_stopwords_module(path=STOPWORDS_MODULE):
+    """Собирает модуль stopwords_data.py (и его .pyc) из исходных пакетов; возвращает число слов."""
+    words = sorted(load_source_stopwords())
+    with open(path, 'w', encoding='utf8') as f:
+        f.write("# Сгенерировано командой 'flask matcher build-stopwords' из NLTK (english) и stop-words (polish).\n")
+        f.write("# Не редактировать вручную: изменения вносятся в text_normalizer.load_source_stopwords.\n")
+        f.write("STOPWORDS = frozenset((\n")
+        for word in words:
+            f.write(f"    {word!r},\n")
+        f.write("))\n")
+    py_compile.compile(path, doraise=True)
+    return len(words)
+
+
+# Настройка стоп-слов: собранный модуль импортируется из .pyc без nltk и корпуса на диске
+try:
+    from stopwords_data import STOPWORDS
+except ImportError:
+    STOPWORDS = load_source_stopwords()
+
+# Всё, что не буква/цифра Unicode (\w) и не пробел, удаляется одним проходом
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+# Токенизатор, совпадающий с token_pattern по умолчанию у TfidfVectorizer
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+_NON_TOKEN_CHAR = re.compile(r'[^\w ]')
+
+# Максимальное число нормализованных текстов в памяти процесса
+DEFAULT_CACHE_SIZE = 50000
+
+
+def _normalize_uncached(text):
+    """Очистка текста: удаление пунктуации, нижний регистр, удаление стоп-слов."""
+    stopword_set = STOPWORDS
+    words = [word for word in _PUNCTUATION.sub('', text).lower().split() if word not in stopword_set]
+    normalized = ' '.join(words)
+    # Обычно после очистки остаются только символы \w, и токены - это слова длиной от 2 символов.
+    # lower() изредка порождает не-\w символы (например, для 'İ') - тогда честный проход TOKEN_PATTERN.
+    if _NON_TOKEN_CHAR.search(normalized) is None:
+        tokens = tuple([word for word in words if len(word) > 1])
+    else:
+        tokens = tuple(TOKEN_PATTERN.findall(normalized))
+    return normalized, tokens
+
+
+class NormalizerCache:
+    """
+    LRU-кэш результатов нормализации, ключ - хэш содержимого текста.
+
+    Jooble возвращает одни и те же сниппеты в поисках разных пользователей,
+    поэтому повторные вакансии не нужно заново очищать и токенизировать.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+normalizer_cache = NormalizerCache()
+
+
+def normalize_tokens(text):
+    """Возвращает (нормализованный текст, кортеж токенов) с использованием кэша."""
+    if not text:
+        return '', ()
+    key = NormalizerCache.key(text)
+    value = normalizer_cache.get(key)
+    if value is None:
+        value = _normalize_uncached(text)
+        normalizer_cache.put(key, value)
+    return value
+
+def normalize(text):
+    """Нормализованный текст (эквивалент прежнего ai_matcher.preprocess_text)."""
+    return normalize_tokens(text)[0]
+
+def normalize_many(texts):
+    """
+    Пакетная нормализация: каждый уникальный текст пакета обрабатывается не более одного раза.
+    Возвращает список пар (нормализованный текст, кортеж токенов) в исходном порядке.
+    """
+    seen = {}
+    results = []
+    for text in texts:
+        value = seen.get(text)
+        if value is None:
+            value = seen[text] = normalize_tokens(text)
+        results.append(value)
+    return results
+
+def preprocess_many(texts):
+    """Пакетная версия preprocess_text: список нормализованных строк в исходном порядке."""
+    return [normalized for normalized, _ in normalize_many(texts)]
@@ -0,0 +1,125 @@
+"""
+Короткоживущий кэш пользователей и профилей в памяти процесса (воркера).
+
+Защищенные маршруты на каждый запрос читали User, ApplicantProfile и последнюю RoleFocus
+только ради стабильных полей. Здесь они хранятся неизменяемым снимком (UserSnapshot, не объект ORM:
+его можно отдавать между запросами и сессиями) не дольше USER_CACHE_TTL_SECONDS.
+Маршруты, которые меняют профиль или цель поиска, вызывают invalidate(user_id): в своем воркере
+запись исчезает сразу, в остальных - по истечении TTL.
+"""
+import time
+import threading
+from collections import OrderedDict, namedtuple
+from extensions import db
+from models import User, ApplicantProfile, RoleFocus
+
+# Поля RoleFocus, нужные матчингу (подходит для exclusion_matcher.get_focus_automaton)
+FocusSnapshot = namedtuple('FocusSnapshot', ['id', 'date', 'focused_skills_data'])
+# profile_id/profile_updated/role_focus - None, пока профиль или цель поиска не созданы
+UserSnapshot = namedtuple('UserSnapshot', ['user_id', 'username', 'profile_id', 'profile_updated', 'role_focus'])
+
+
+def load_user_snapshot(user_id):
+    """Снимок пользователя из БД (пользователь с профилем - один запрос, цель поиска - второй); None, если его нет."""
+    row = db.session.query(User.username, ApplicantProfile.id, ApplicantProfile.date_updated).outerjoin(
+        ApplicantProfile, ApplicantProfile.user_id == User.id
+    ).filter(User.id == int(user_id)).first()
+    if row is None:
+        return None
+    username, profile_id, profile_updated = row
+
+    role_focus = None
+    if profile_id is not None:
+        focus = db.session.query(RoleFocus.id, RoleFocus.date, RoleFocus.focused_skills_data).filter(
+            RoleFocus.profile_id == profile_id
+        ).order_by(RoleFocus.date.desc()).first()
+        if focus is not None:
+            role_focus = FocusSnapshot(*focus)
+    return UserSnapshot(int(user_id), username, profile_id, profile_updated, role_focus)
+
+
+class UserCache:
+    """LRU-кэш снимков пользователей с ограниченным временем жизни записи."""
+
+    def __init__(self, max_size=4096, ttl=30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (expires_at, snapshot)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Растет при каждом invalidate(): загрузка, начатая до него, не сохраняет результат
+        self._generation = 0
+        self.stale_puts = 0
+
+    @staticmethod
+    def key(user_id):
+        # Идентификатор из JWT - строка, в остальном коде - число
+        return int(user_id)
+
+    def get(self, user_id):
+        key = self.key(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, snapshot, generation=None):
+        if self.ttl <= 0:
+            return
+        key = self.key(user_id)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_puts += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, user_id, load=load_user_snapshot):
+        """Снимок из кэша или из БД через load(user_id); отсутствующий пользователь не кэшируется."""
+        with self._lock:
+            generation = self._generation
+        snapshot = self.get(user_id)
+        if snapshot is None:
+            snapshot = load(user_id)
+            if snapshot is not None:
+                self.put(user_id, snapshot, generation)
+        return snapshot
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(self.key(user_id), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale_puts': self.stale_puts,
+            }
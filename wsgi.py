@@ -0,0 +1,14 @@
+"""
+Продакшен-точка входа WSGI: gunicorn -c gunicorn.conf.py (wsgi_app = 'wsgi:app').
+
+При preload_app модуль выполняется в мастере gunicorn до fork воркеров, поэтому здесь же
+загружается общее состояние, которое иначе создавалось бы лениво в каждом воркере отдельно.
+"""
+from app import create_app
+from matcher_loader import warm_up
+
+app = create_app()
+
+# Матчер, модель IDF и инвертированный индекс вакансий (если уже построен) - общие для всех воркеров.
+# Фоновый поток мастера не переживает fork, поэтому background здесь выполняется синхронно.
+warm_up('lazy' if app.config['MATCHER_WARMUP'] == 'lazy' else 'eager')